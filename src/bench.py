@@ -0,0 +1,385 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from .config import (
+    ALPHA_MAX,
+    ALPHA_MIN,
+    BUTTERWORTH_CUTOFF_HZ,
+    CUTOFF_MAX_HZ,
+    CUTOFF_MIN_HZ,
+    DEFAULT_IIR_ALPHA,
+    DRIFT_CORRECTION_WINDOW_S,
+    DRIFT_DIRECTION_DEG,
+    DRIFT_PIXELS_PER_SECOND,
+    INPUT_SAMPLE_RATE_HZ,
+    MOVING_AVERAGE_MIN,
+    TREMOR_FREQUENCY,
+    TREMOR_INTENSITY,
+)
+from .filter_metadata import FILTERS
+from .input_device import InputSmoother
+from .tremor_simulator import DriftSimulator, TremorSimulator
+from .trace_layers import TraceLayerRenderer
+from .trajectories import TRAJECTORIES
+from .ui import HudTextCache, build_font, create_window, render_frame
+from .ui_state import (
+    MetricsTracker,
+    ParamChangeIndicator,
+    ViewTransform,
+    VisibilityState,
+)
+
+
+STAGES = ("tremor", "drift", "filter", "render")
+
+
+@dataclass
+class BenchCase:
+    trajectory: str
+    buffer_size: int
+    window_size: int
+    filter_count: int
+
+
+@dataclass
+class BenchResult:
+    trajectory: str
+    buffer_size: int
+    window_size: int
+    filter_count: int
+    samples: int
+    frames: int
+    samples_per_second: float
+    stage_p50_us: Dict[str, float]
+    stage_p99_us: Dict[str, float]
+    alloc_kib_per_frame: float
+    blocks_per_frame: float
+    drift_error_rms_px: float
+    drift_reference_rms_px: float
+    quality: Dict[str, Dict[str, float]]
+
+
+@dataclass
+class _PassResult:
+    timings: Dict[str, List[int]]
+    elapsed_ns: int
+    alloc_bytes: List[int]
+    alloc_blocks: List[int]
+    drift_errors: List[float]
+    drift_references: List[float]
+    quality: Dict[str, Dict[str, float]]
+
+
+def run_case(
+    case: BenchCase,
+    samples: int,
+    samples_per_frame: int,
+    screen: pygame.Surface,
+    font: pygame.font.Font,
+    seed: int,
+    alloc_frames: int,
+    sample_rate_hz: float,
+) -> BenchResult:
+    # tracemalloc deixa cada alocação bem mais cara: a memória é medida numa
+    # segunda passada idêntica, fora da que é cronometrada.
+    timed = _run_pass(case, samples, samples_per_frame, screen, font, seed, 0, sample_rate_hz)
+    traced = timed
+    if alloc_frames > 0:
+        traced = _run_pass(
+            case, samples, samples_per_frame, screen, font, seed, alloc_frames, sample_rate_hz
+        )
+
+    return BenchResult(
+        trajectory=case.trajectory,
+        buffer_size=case.buffer_size,
+        window_size=case.window_size,
+        filter_count=case.filter_count,
+        samples=samples,
+        frames=math.ceil(samples / samples_per_frame),
+        samples_per_second=samples / (timed.elapsed_ns / 1e9),
+        stage_p50_us={s: _percentile_us(timed.timings[s], 50) for s in STAGES},
+        stage_p99_us={s: _percentile_us(timed.timings[s], 99) for s in STAGES},
+        alloc_kib_per_frame=_mean(traced.alloc_bytes) / 1024.0,
+        blocks_per_frame=_mean(traced.alloc_blocks),
+        drift_error_rms_px=_rms(timed.drift_errors),
+        drift_reference_rms_px=_rms(timed.drift_references),
+        quality=timed.quality,
+    )
+
+
+def _run_pass(
+    case: BenchCase,
+    samples: int,
+    samples_per_frame: int,
+    screen: pygame.Surface,
+    font: pygame.font.Font,
+    seed: int,
+    alloc_frames: int,
+    sample_rate_hz: float,
+) -> _PassResult:
+    rng = np.random.default_rng(seed)
+    trajectory = TRAJECTORIES[case.trajectory](samples, rng)
+
+    filter_ids = [descriptor.id for descriptor in FILTERS[:case.filter_count]]
+    smoother = InputSmoother(
+        buffer_size=case.buffer_size,
+        window_size=case.window_size,
+        alpha=DEFAULT_IIR_ALPHA,
+        min_window=MOVING_AVERAGE_MIN,
+        min_alpha=ALPHA_MIN,
+        max_alpha=ALPHA_MAX,
+        drift_window_s=DRIFT_CORRECTION_WINDOW_S,
+        cutoff_hz=BUTTERWORTH_CUTOFF_HZ,
+        min_cutoff_hz=CUTOFF_MIN_HZ,
+        max_cutoff_hz=CUTOFF_MAX_HZ,
+        sample_rate_hz=sample_rate_hz,
+        filter_ids=filter_ids,
+    )
+    tremor_sim = TremorSimulator(
+        True, TREMOR_INTENSITY, TREMOR_FREQUENCY, seed=seed
+    )
+    drift_sim = DriftSimulator(True, DRIFT_PIXELS_PER_SECOND, DRIFT_DIRECTION_DEG)
+
+    visibility = VisibilityState()
+    for descriptor in FILTERS:
+        visibility.set_visible(descriptor.id, descriptor.id in filter_ids)
+
+    view_transform = ViewTransform()
+    metrics = MetricsTracker(sample_rate_hz=sample_rate_hz)
+    param_indicator = ParamChangeIndicator()
+    hud_cache = HudTextCache()
+    trace_layers = TraceLayerRenderer()
+
+    timings: Dict[str, List[int]] = {stage: [] for stage in STAGES}
+    frame_count = math.ceil(samples / samples_per_frame)
+    alloc_start = frame_count - alloc_frames if alloc_frames > 0 else frame_count
+    alloc_bytes: List[int] = []
+    alloc_blocks: List[int] = []
+    drift_errors: List[float] = []
+    drift_references: List[float] = []
+    drift_estimator = smoother.filters.get("drift")
+    sample_period_ns = round(1e9 / sample_rate_hz)
+    # Métricas de qualidade e erro do drift são do bench, não do pipeline:
+    # o tempo delas é medido à parte e descontado do total.
+    bookkeeping_ns = 0
+
+    bench_start = time.perf_counter_ns()
+    for frame in range(frame_count):
+        tracking = frame >= max(0, alloc_start)
+        if tracking:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+            blocks_before = sys.getallocatedblocks()
+
+        first = frame * samples_per_frame
+        for index, (clean_x, clean_y) in enumerate(
+            trajectory[first:first + samples_per_frame].tolist(), start=first
+        ):
+            sample_ns = bench_start + index * sample_period_ns
+            t0 = time.perf_counter_ns()
+            x, y = tremor_sim.apply_tremor(clean_x, clean_y, sample_ns)
+            t1 = time.perf_counter_ns()
+            x, y = drift_sim.apply_drift(x, y, sample_ns)
+            t2 = time.perf_counter_ns()
+            points = smoother.add_sample(x, y, timestamp_ns=sample_ns)
+            t3 = time.perf_counter_ns()
+            timings["tremor"].append(t1 - t0)
+            timings["drift"].append(t2 - t1)
+            timings["filter"].append(t3 - t2)
+            metrics.quality.update(sample_ns, (clean_x, clean_y), (x, y), points)
+
+            if drift_estimator is not None:
+                true_x, true_y = drift_sim.get_offset()
+                estimate_x, estimate_y = drift_estimator.offset
+                drift_errors.append(math.hypot(estimate_x - true_x, estimate_y - true_y))
+                drift_references.append(math.hypot(true_x, true_y))
+            bookkeeping_ns += time.perf_counter_ns() - t3
+
+        t0 = time.perf_counter_ns()
+        render_frame(
+            screen,
+            font,
+            smoother,
+            True,
+            points,
+            view_transform,
+            visibility,
+            metrics,
+            param_indicator,
+            False,
+            tremor_sim,
+            drift_sim,
+            hud_cache=hud_cache,
+            trace_layers=trace_layers,
+        )
+        timings["render"].append(time.perf_counter_ns() - t0)
+        pygame.event.pump()
+
+        if tracking:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            alloc_bytes.append(traced_peak - traced_before)
+            alloc_blocks.append(sys.getallocatedblocks() - blocks_before)
+
+    elapsed_ns = time.perf_counter_ns() - bench_start - bookkeeping_ns
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    return _PassResult(
+        timings=timings,
+        elapsed_ns=elapsed_ns,
+        alloc_bytes=alloc_bytes,
+        alloc_blocks=alloc_blocks,
+        drift_errors=drift_errors,
+        drift_references=drift_references,
+        quality={
+            filter_id: dict(values._asdict())
+            for filter_id, values in metrics.quality.summary().items()
+            if filter_id in smoother.filters
+        },
+    )
+
+
+def _percentile_us(values: Sequence[int], percentile: float) -> float:
+    if not values:
+        return 0.0
+    return float(np.percentile(values, percentile)) / 1000.0
+
+
+def _mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def _rms(values: Sequence[float]) -> float:
+    return math.sqrt(_mean([value * value for value in values]))
+
+
+def format_table(results: Sequence[BenchResult]) -> str:
+    header = (
+        f"{'trajectory':<12} {'buffer':>7} {'N':>4} {'filt':>4} {'samples/s':>10} "
+        + " ".join(f"{s + ' p50/p99 us':>22}" for s in STAGES)
+        + f" {'KiB/frame':>10} {'blocks/frame':>12} {'drift err/ref px':>17}"
+    )
+    rows = [header, "-" * len(header)]
+    for r in results:
+        stages = " ".join(
+            f"{f'{r.stage_p50_us[s]:.1f}/{r.stage_p99_us[s]:.1f}':>22}" for s in STAGES
+        )
+        rows.append(
+            f"{r.trajectory:<12} {r.buffer_size:>7} {r.window_size:>4} {r.filter_count:>4} "
+            f"{r.samples_per_second:>10.0f} {stages} "
+            f"{r.alloc_kib_per_frame:>10.1f} {r.blocks_per_frame:>12.1f} "
+            f"{_drift_column(r):>17}"
+        )
+    return "\n".join(rows)
+
+
+def _drift_column(result: BenchResult) -> str:
+    if result.drift_reference_rms_px == 0.0:
+        return "-"
+    return f"{result.drift_error_rms_px:.1f}/{result.drift_reference_rms_px:.1f}"
+
+
+def format_quality_table(results: Sequence[BenchResult]) -> str:
+    header = (
+        f"{'trajectory':<12} {'N':>4} {'filter':<12} {'jitter px':>10} "
+        f"{'lag ms':>8} {'overshoot px':>13} {'tremor dB':>10}"
+    )
+    rows = [header, "-" * len(header)]
+    widest: Dict[tuple, BenchResult] = {}
+    for r in results:
+        key = (r.trajectory, r.window_size)
+        if key not in widest or r.filter_count > widest[key].filter_count:
+            widest[key] = r
+    for r in widest.values():
+        for filter_id, q in r.quality.items():
+            rows.append(
+                f"{r.trajectory:<12} {r.window_size:>4} {filter_id:<12} "
+                f"{q['jitter_px']:>10.3f} {q['lag_ms']:>8.1f} "
+                f"{q['overshoot_px']:>13.2f} {q['tremor_db']:>10.1f}"
+            )
+    return "\n".join(rows)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _str_list(value: str) -> List[str]:
+    items = [item for item in value.split(",") if item]
+    unknown = [item for item in items if item not in TRAJECTORIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"trajetória desconhecida: {', '.join(unknown)}")
+    return items
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark headless do pipeline amostra -> filtro -> render.",
+    )
+    parser.add_argument("--trajectories", type=_str_list, default=list(TRAJECTORIES))
+    parser.add_argument("--buffers", type=_int_list, default=[500, 5000, 50000])
+    parser.add_argument("--windows", type=_int_list, default=[5, 50])
+    parser.add_argument("--filters", type=_int_list, default=[1, len(FILTERS)])
+    parser.add_argument("--samples", type=int, default=3000)
+    parser.add_argument("--samples-per-frame", type=int, default=1)
+    parser.add_argument("--sample-rate", type=float, default=INPUT_SAMPLE_RATE_HZ)
+    parser.add_argument("--alloc-frames", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    pygame.init()
+    screen, _ = create_window()
+    font = build_font()
+
+    results = []
+    for trajectory, buffer_size, window_size, filter_count in itertools.product(
+        args.trajectories, args.buffers, args.windows, args.filters
+    ):
+        case = BenchCase(trajectory, buffer_size, window_size, filter_count)
+        results.append(
+            run_case(
+                case,
+                args.samples,
+                max(1, args.samples_per_frame),
+                screen,
+                font,
+                args.seed,
+                args.alloc_frames,
+                args.sample_rate,
+            )
+        )
+
+    pygame.quit()
+
+    print(format_table(results))
+    print()
+    print(format_quality_table(results))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"Resultados salvos em: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
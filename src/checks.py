@@ -0,0 +1,197 @@
+import math
+import sys
+from typing import Callable, List, NamedTuple
+
+import numpy as np
+
+from .config import (
+    BUTTERWORTH_CUTOFF_HZ,
+    BUTTERWORTH_ORDER,
+    FPS,
+    NOTCH_BAND_HZ,
+    NOTCH_HOLD_SPEED,
+    NOTCH_MIN_PEAK_RATIO,
+    NOTCH_Q,
+    NOTCH_RESOLUTION_HZ,
+    NOTCH_UPDATE_HZ,
+)
+from .filters import (
+    AdaptiveNotchFilter,
+    ButterworthFilter,
+    Sample,
+    SampleBatch,
+    exp_smoothing,
+    exp_smoothing_batch,
+)
+from .tremor_simulator import TremorSimulator
+
+
+class CheckResult(NamedTuple):
+    name: str
+    passed: bool
+    detail: str
+
+
+def _rms(values: np.ndarray) -> float:
+    return math.sqrt(float(np.mean(values * values)))
+
+
+def check_notch_attenuation() -> CheckResult:
+    rate_hz = 1000.0
+    tremor_hz = 10.0
+    settle = 3000
+    t_ns = np.arange(6000, dtype=np.int64) * round(1e9 / rate_hz)
+    tremor = 5.0 * np.sin(2.0 * math.pi * tremor_hz * t_ns * 1e-9)
+    xy = np.column_stack((400.0 + tremor, np.full(len(t_ns), 300.0)))
+
+    notch = AdaptiveNotchFilter(
+        NOTCH_BAND_HZ, NOTCH_Q, float(FPS), NOTCH_RESOLUTION_HZ,
+        NOTCH_UPDATE_HZ, NOTCH_MIN_PEAK_RATIO, NOTCH_HOLD_SPEED,
+    )
+    streamed = np.array([
+        notch.process(Sample(x, y, t))
+        for (x, y), t in zip(xy.tolist(), t_ns.tolist())
+    ])
+    batched = notch.process_batch(SampleBatch(xy, t_ns))
+
+    raw_rms = _rms(tremor[settle:])
+    stream_db = 20.0 * math.log10(_rms(streamed[settle:, 0] - 400.0) / raw_rms)
+    batch_db = 20.0 * math.log10(_rms(batched[settle:, 0] - 400.0) / raw_rms)
+    estimate_hz = notch.estimate_hz[0]
+    passed = stream_db < -12.0 and batch_db < -12.0 and abs(estimate_hz - tremor_hz) < 0.5
+    return CheckResult(
+        "notch atenua senoide de 10 Hz a 1 kHz (projetado a FPS)",
+        passed,
+        f"stream {stream_db:.1f} dB, lote {batch_db:.1f} dB, estimativa {estimate_hz:.2f} Hz",
+    )
+
+
+def check_notch_batch_matches_stream() -> CheckResult:
+    rng = np.random.default_rng(1)
+    count = 20000
+    periods = rng.uniform(0.6e6, 1.4e6, size=count).round().astype(np.int64)
+    t_ns = np.cumsum(periods)
+    reach = np.cumsum(rng.normal(0.0, 0.5, size=(count, 2)), axis=0)
+    tremor = 3.0 * np.sin(2.0 * math.pi * 9.0 * t_ns * 1e-9)
+    xy = 400.0 + reach + tremor[:, None]
+
+    notch = AdaptiveNotchFilter(
+        NOTCH_BAND_HZ, NOTCH_Q, float(FPS), NOTCH_RESOLUTION_HZ,
+        NOTCH_UPDATE_HZ, NOTCH_MIN_PEAK_RATIO, NOTCH_HOLD_SPEED,
+    )
+    streamed = np.array([
+        notch.process(Sample(x, y, t))
+        for (x, y), t in zip(xy.tolist(), t_ns.tolist())
+    ])
+    batched = notch.process_batch(SampleBatch(xy, t_ns))
+    return CheckResult(
+        "notch em lote igual ao streaming (timestamps irregulares, ~1 kHz)",
+        bool(np.array_equal(streamed, batched)),
+        f"maior diferença {float(np.abs(streamed - batched).max()):.2e} px",
+    )
+
+
+def check_butterworth_batch_matches_stream() -> CheckResult:
+    rng = np.random.default_rng(4)
+    count = 20000
+    periods = rng.uniform(0.6e6, 1.4e6, size=count).round().astype(np.int64)
+    t_ns = np.cumsum(periods)
+    xy = 400.0 + np.cumsum(rng.normal(0.0, 3.0, size=(count, 2)), axis=0)
+
+    # Projetado a FPS e alimentado a ~1 kHz: o streaming se reprojeta várias
+    # vezes no começo, e o lote tem de passar pelos mesmos reprojetos.
+    butterworth = ButterworthFilter(BUTTERWORTH_ORDER, BUTTERWORTH_CUTOFF_HZ, float(FPS))
+    streamed = np.array([
+        butterworth.process(Sample(x, y, t))
+        for (x, y), t in zip(xy.tolist(), t_ns.tolist())
+    ])
+    batched = butterworth.process_batch(SampleBatch(xy, t_ns))
+    return CheckResult(
+        "Butterworth em lote igual ao streaming (timestamps irregulares, ~1 kHz)",
+        bool(np.array_equal(streamed, batched)),
+        f"maior diferença {float(np.abs(streamed - batched).max()):.2e} px, "
+        f"taxa de projeto final {butterworth.design_rate_hz:.0f} Hz",
+    )
+
+
+def check_exp_batch_matches_stream() -> CheckResult:
+    rng = np.random.default_rng(0)
+    xy = 400.0 + np.cumsum(rng.normal(0.0, 4.0, size=(5000, 2)), axis=0)
+    equal = True
+    worst = 0.0
+    for alpha in (0.01, 0.3, 1.0):
+        batched = exp_smoothing_batch(xy, alpha)
+        streamed = np.empty_like(xy)
+        for column in range(2):
+            previous = None
+            for i, x in enumerate(xy[:, column].tolist()):
+                previous = exp_smoothing(x, previous, alpha)
+                streamed[i, column] = previous
+        equal = equal and np.array_equal(batched, streamed)
+        worst = max(worst, float(np.abs(batched - streamed).max()))
+    return CheckResult(
+        "exp em lote igual ao exp amostra a amostra",
+        equal,
+        f"maior diferença {worst:.2e} px (exige igualdade exata)",
+    )
+
+
+def check_tremor_array_matches_scalar() -> CheckResult:
+    rng = np.random.default_rng(2)
+    count = 10000
+    xs = 400.0 + np.cumsum(rng.normal(0.0, 2.0, count))
+    ys = 300.0 + np.cumsum(rng.normal(0.0, 2.0, count))
+    ts = 5_000_000_000 + np.cumsum(rng.integers(500_000, 1_500_000, count))
+
+    scalar = TremorSimulator(True, 5.0, 10.0, seed=3, noise_block_size=700)
+    expected = np.array([
+        scalar.apply_tremor(x, y, int(t))
+        for x, y, t in zip(xs.tolist(), ys.tolist(), ts.tolist())
+    ])
+
+    # Blocos de tamanhos variados alternando os dois caminhos no mesmo simulador.
+    mixed = TremorSimulator(True, 5.0, 10.0, seed=3, noise_block_size=700)
+    parts = []
+    start = 0
+    use_array = True
+    while start < count:
+        stop = min(count, start + int(rng.integers(1, 1500)))
+        if use_array:
+            parts.append(np.column_stack(
+                mixed.apply_tremor_array(xs[start:stop], ys[start:stop], ts[start:stop])
+            ))
+        else:
+            chunk = zip(xs[start:stop].tolist(), ys[start:stop].tolist(), ts[start:stop].tolist())
+            parts.append(np.array([mixed.apply_tremor(x, y, int(t)) for x, y, t in chunk]))
+        use_array = not use_array
+        start = stop
+    got = np.concatenate(parts)
+    return CheckResult(
+        "tremor em vetor igual ao tremor amostra a amostra",
+        np.array_equal(got, expected),
+        f"maior diferença {float(np.abs(got - expected).max()):.2e} px (exige igualdade exata)",
+    )
+
+
+CHECKS: List[Callable[[], CheckResult]] = [
+    check_notch_attenuation,
+    check_notch_batch_matches_stream,
+    check_butterworth_batch_matches_stream,
+    check_exp_batch_matches_stream,
+    check_tremor_array_matches_scalar,
+]
+
+
+def main() -> None:
+    failed = 0
+    for check in CHECKS:
+        result = check()
+        status = "ok" if result.passed else "FALHOU"
+        print(f"[{status}] {result.name}: {result.detail}")
+        failed += not result.passed
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
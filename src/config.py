@@ -2,10 +2,31 @@ WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 60
 
+INPUT_MODE = "frame"
+INPUT_SAMPLE_RATE_HZ = 1000.0
+INPUT_QUEUE_MAX = 8192
+
 MAX_BUFFER = 500
 
 DEFAULT_MOVING_AVERAGE_WINDOW = 5
 DEFAULT_IIR_ALPHA = 0.4
+ONE_EURO_MIN_CUTOFF = 1.0
+ONE_EURO_BETA = 0.007
+ONE_EURO_D_CUTOFF = 1.0
+KALMAN_PROCESS_NOISE = 1.0e6
+KALMAN_MEASUREMENT_NOISE = 25.0
+KALMAN_PREDICTION_MS = 16.0
+BUTTERWORTH_ORDER = 2
+BUTTERWORTH_CUTOFF_HZ = 4.0
+SAVGOL_WINDOW = 15
+SAVGOL_POLYORDER = 2
+NOTCH_BAND_HZ = (6.0, 14.0)
+NOTCH_Q = 2.0
+NOTCH_RESOLUTION_HZ = 1.0
+NOTCH_UPDATE_HZ = 20.0
+NOTCH_MIN_PEAK_RATIO = 2.0
+NOTCH_HOLD_SPEED = 100.0
+FILTER_BANK_SAMPLE_RATE_HZ = float(FPS)
 DEFAULT_HISTORY_ENABLED = True
 
 HUD_FONT = "consolas"
@@ -13,11 +34,15 @@ HUD_FONT_SIZE = 20
 HUD_MARGIN_X = 10
 HUD_MARGIN_Y = 10
 HUD_LINE_HEIGHT = 22
+HUD_VISIBILITY_PER_LINE = 3
 
 ALPHA_STEP = 0.05
 ALPHA_MIN = 0.05
 ALPHA_MAX = 1.0
 MOVING_AVERAGE_MIN = 1
+CUTOFF_STEP_HZ = 0.5
+CUTOFF_MIN_HZ = 0.5
+CUTOFF_MAX_HZ = 20.0
 
 TITLE = "Realtime Input Smoothing - PDS"
 
@@ -30,10 +55,22 @@ CURSOR_MA_COLOR = (50, 200, 50)
 CURSOR_EXP_COLOR = (50, 100, 220)
 DRIFT_CORRECTED_COLOR = (200, 200, 50)
 CURSOR_DRIFT_COLOR = (240, 240, 80)
+ONE_EURO_COLOR = (150, 60, 190)
+CURSOR_ONE_EURO_COLOR = (200, 100, 240)
+KALMAN_COLOR = (40, 170, 170)
+CURSOR_KALMAN_COLOR = (80, 230, 230)
+BUTTERWORTH_COLOR = (210, 120, 40)
+CURSOR_BUTTERWORTH_COLOR = (250, 160, 70)
+SAVGOL_COLOR = (200, 70, 130)
+CURSOR_SAVGOL_COLOR = (240, 110, 170)
+NOTCH_COLOR = (120, 190, 70)
+CURSOR_NOTCH_COLOR = (160, 235, 110)
 HUD_TEXT_COLOR = (230, 230, 230)
 RAW_LINE_WIDTH = 1
 SMOOTH_LINE_WIDTH = 2
 MARKER_RADIUS = 6
+TRACE_REBUILD_EVICTED_FRACTION = 0.1
+TRACE_LOD_ENABLED = True
 
 ZOOM_MIN = 0.1
 ZOOM_MAX = 10.0
@@ -53,17 +90,47 @@ METRICS_GRAPH_Y = 10
 PARAM_CHANGE_INDICATOR_DURATION = 1000
 PARAM_CHANGE_COLOR = (255, 255, 0)
 
+EXPORT_OUTPUT_DIR = "output"
+EXPORT_MAX_WORKERS = 2
+EXPORT_STATUS_DURATION = 4000
+
+SESSION_OUTPUT_DIR = "sessions"
+SESSION_BUFFER_RECORDS = 4096
+
+QUALITY_WINDOW_S = 2.0
+QUALITY_JITTER_HIGHPASS_HZ = 2.0
+QUALITY_TREMOR_BAND_HZ = (4.0, 12.0)
+QUALITY_SUMMARY_INTERVAL_MS = 250.0
+DEFAULT_QUALITY_VISIBLE = False
+
+PROFILE_OUTPUT_DIR = "profiles"
+PROFILE_STATUS_INTERVAL_MS = 250.0
+DEFAULT_PROFILER_ENABLED = False
+
+DENSITY_GRID_SIZE = 30
+DENSITY_BANDWIDTH = "range"
+DENSITY_BINS_PER_SIGMA = 4
+DENSITY_MAX_BINS = 1024
+
 DEFAULT_RAW_VISIBLE = True
 DEFAULT_MA_VISIBLE = True
 DEFAULT_EXP_VISIBLE = True
 DEFAULT_DRIFT_VISIBLE = True
+DEFAULT_ONE_EURO_VISIBLE = True
+DEFAULT_KALMAN_VISIBLE = True
+DEFAULT_BUTTERWORTH_VISIBLE = True
+DEFAULT_SAVGOL_VISIBLE = True
+DEFAULT_NOTCH_VISIBLE = True
 
 TREMOR_ENABLED = True
 TREMOR_INTENSITY = 5.0
 TREMOR_FREQUENCY = 10.0
+TREMOR_SEED = None
+TREMOR_NOISE_BLOCK_SIZE = 4096
 
 DRIFT_ENABLED = True
 DRIFT_PIXELS_PER_SECOND = 20.0
 DRIFT_DIRECTION_DEG = 0.0
 
-DRIFT_CORRECTION_WINDOW = 5
+DRIFT_CORRECTION_WINDOW_S = 5.0
+DRIFT_REST_SPEED = 100.0
@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+
+
+BUTTERWORTH_ORDERS = (2, 3, 4)
+
+
+def butterworth_sos(order: int, cutoff_hz: float, sample_rate_hz: float) -> np.ndarray:
+    if order not in BUTTERWORTH_ORDERS:
+        raise ValueError(f"order deve ser um de {BUTTERWORTH_ORDERS}")
+    if not (0.0 < cutoff_hz < sample_rate_hz / 2.0):
+        raise ValueError("cutoff_hz deve estar em (0, sample_rate_hz / 2)")
+
+    k = math.tan(math.pi * cutoff_hz / sample_rate_hz)
+    k2 = k * k
+    sections = []
+
+    for index in range(order // 2):
+        theta = math.pi * (2 * index + 1) / (2 * order)
+        damping = 2.0 * math.sin(theta)
+        norm = 1.0 / (1.0 + damping * k + k2)
+        b0 = k2 * norm
+        sections.append((
+            b0,
+            2.0 * b0,
+            b0,
+            1.0,
+            2.0 * (k2 - 1.0) * norm,
+            (1.0 - damping * k + k2) * norm,
+        ))
+
+    if order % 2:
+        norm = 1.0 / (1.0 + k)
+        sections.append((k * norm, k * norm, 0.0, 1.0, (k - 1.0) * norm, 0.0))
+
+    return np.array(sections)
+
+
+def butterworth_highpass_sos(cutoff_hz: float, sample_rate_hz: float) -> np.ndarray:
+    if not (0.0 < cutoff_hz < sample_rate_hz / 2.0):
+        raise ValueError("cutoff_hz deve estar em (0, sample_rate_hz / 2)")
+
+    k = math.tan(math.pi * cutoff_hz / sample_rate_hz)
+    k2 = k * k
+    damping = math.sqrt(2.0)
+    norm = 1.0 / (1.0 + damping * k + k2)
+    return np.array([[
+        norm,
+        -2.0 * norm,
+        norm,
+        1.0,
+        2.0 * (k2 - 1.0) * norm,
+        (1.0 - damping * k + k2) * norm,
+    ]])
+
+
+def sos_steady_state(sos: np.ndarray) -> np.ndarray:
+    b1, b2, a1, a2 = sos[:, 1], sos[:, 2], sos[:, 4], sos[:, 5]
+    z2 = b2 - a2
+    z1 = b1 - a1 + z2
+    return np.column_stack((z1, z2))
+
+
+def savgol_coefficients(window_length: int, polyorder: int) -> np.ndarray:
+    if window_length < 1:
+        raise ValueError("window_length deve ser >= 1")
+    if not (0 <= polyorder < window_length):
+        raise ValueError("polyorder deve estar em [0, window_length)")
+
+    positions = np.arange(-(window_length - 1), 1, dtype=np.float64)
+    vandermonde = positions[:, None] ** np.arange(polyorder + 1)
+    return np.linalg.pinv(vandermonde)[0]
+
+
+def notch_sos(center_hz: float, q: float, sample_rate_hz: float) -> np.ndarray:
+    if not (0.0 < center_hz < sample_rate_hz / 2.0):
+        raise ValueError("center_hz deve estar em (0, sample_rate_hz / 2)")
+    if q <= 0.0:
+        raise ValueError("q deve ser > 0")
+
+    w0 = 2.0 * math.pi * center_hz / sample_rate_hz
+    cos_w0 = math.cos(w0)
+    alpha = math.sin(w0) / (2.0 * q)
+    norm = 1.0 / (1.0 + alpha)
+    return np.array([[
+        norm,
+        -2.0 * cos_w0 * norm,
+        norm,
+        1.0,
+        -2.0 * cos_w0 * norm,
+        (1.0 - alpha) * norm,
+    ]])
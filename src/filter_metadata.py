@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pygame
 
-from config import (
+from .config import (
     RAW_COLOR,
     MOVING_AVERAGE_COLOR,
     EXP_COLOR,
@@ -18,7 +18,23 @@ from config import (
     DEFAULT_MA_VISIBLE,
     DEFAULT_EXP_VISIBLE,
     DEFAULT_DRIFT_VISIBLE,
+    ONE_EURO_COLOR,
+    CURSOR_ONE_EURO_COLOR,
+    DEFAULT_ONE_EURO_VISIBLE,
+    KALMAN_COLOR,
+    CURSOR_KALMAN_COLOR,
+    DEFAULT_KALMAN_VISIBLE,
+    BUTTERWORTH_COLOR,
+    CURSOR_BUTTERWORTH_COLOR,
+    DEFAULT_BUTTERWORTH_VISIBLE,
+    SAVGOL_COLOR,
+    CURSOR_SAVGOL_COLOR,
+    DEFAULT_SAVGOL_VISIBLE,
+    NOTCH_COLOR,
+    CURSOR_NOTCH_COLOR,
+    DEFAULT_NOTCH_VISIBLE,
 )
+from .filter_registry import FILTER_SPECS_BY_ID, FilterSpec, register_filter_spec
 
 
 Color = Tuple[int, int, int]
@@ -26,9 +42,7 @@ Color = Tuple[int, int, int]
 
 @dataclass(frozen=True)
 class FilterDescriptor:
-    id: str
-    name: str
-    trace_attr: str
+    spec: FilterSpec
     key: int
     key_hint: str
     visibility_default: bool
@@ -38,12 +52,18 @@ class FilterDescriptor:
     mpl_color: str
     density_cmap: str
 
+    @property
+    def id(self) -> str:
+        return self.spec.id
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
 
 FILTERS: List[FilterDescriptor] = [
     FilterDescriptor(
-        id="raw",
-        name="Raw",
-        trace_attr="raw_trace",
+        spec=FILTER_SPECS_BY_ID["raw"],
         key=pygame.K_1,
         key_hint="1",
         visibility_default=DEFAULT_RAW_VISIBLE,
@@ -54,9 +74,7 @@ FILTERS: List[FilterDescriptor] = [
         density_cmap="Reds",
     ),
     FilterDescriptor(
-        id="ma",
-        name="MA",
-        trace_attr="moving_average_trace",
+        spec=FILTER_SPECS_BY_ID["ma"],
         key=pygame.K_2,
         key_hint="2",
         visibility_default=DEFAULT_MA_VISIBLE,
@@ -67,9 +85,7 @@ FILTERS: List[FilterDescriptor] = [
         density_cmap="Greens",
     ),
     FilterDescriptor(
-        id="exp",
-        name="Exp",
-        trace_attr="exp_trace",
+        spec=FILTER_SPECS_BY_ID["exp"],
         key=pygame.K_3,
         key_hint="3",
         visibility_default=DEFAULT_EXP_VISIBLE,
@@ -80,9 +96,7 @@ FILTERS: List[FilterDescriptor] = [
         density_cmap="Blues",
     ),
     FilterDescriptor(
-        id="drift",
-        name="Drift corr.",
-        trace_attr="drift_corrected_trace",
+        spec=FILTER_SPECS_BY_ID["drift"],
         key=pygame.K_4,
         key_hint="4",
         visibility_default=DEFAULT_DRIFT_VISIBLE,
@@ -92,8 +106,76 @@ FILTERS: List[FilterDescriptor] = [
         mpl_color="gold",
         density_cmap="YlOrBr",
     ),
+    FilterDescriptor(
+        spec=FILTER_SPECS_BY_ID["one_euro"],
+        key=pygame.K_5,
+        key_hint="5",
+        visibility_default=DEFAULT_ONE_EURO_VISIBLE,
+        color=ONE_EURO_COLOR,
+        cursor_color=CURSOR_ONE_EURO_COLOR,
+        line_width=SMOOTH_LINE_WIDTH,
+        mpl_color="purple",
+        density_cmap="Purples",
+    ),
+    FilterDescriptor(
+        spec=FILTER_SPECS_BY_ID["kalman"],
+        key=pygame.K_6,
+        key_hint="6",
+        visibility_default=DEFAULT_KALMAN_VISIBLE,
+        color=KALMAN_COLOR,
+        cursor_color=CURSOR_KALMAN_COLOR,
+        line_width=SMOOTH_LINE_WIDTH,
+        mpl_color="teal",
+        density_cmap="BuGn",
+    ),
+    FilterDescriptor(
+        spec=FILTER_SPECS_BY_ID["butterworth"],
+        key=pygame.K_7,
+        key_hint="7",
+        visibility_default=DEFAULT_BUTTERWORTH_VISIBLE,
+        color=BUTTERWORTH_COLOR,
+        cursor_color=CURSOR_BUTTERWORTH_COLOR,
+        line_width=SMOOTH_LINE_WIDTH,
+        mpl_color="darkorange",
+        density_cmap="Oranges",
+    ),
+    FilterDescriptor(
+        spec=FILTER_SPECS_BY_ID["savgol"],
+        key=pygame.K_8,
+        key_hint="8",
+        visibility_default=DEFAULT_SAVGOL_VISIBLE,
+        color=SAVGOL_COLOR,
+        cursor_color=CURSOR_SAVGOL_COLOR,
+        line_width=SMOOTH_LINE_WIDTH,
+        mpl_color="deeppink",
+        density_cmap="RdPu",
+    ),
+    FilterDescriptor(
+        spec=FILTER_SPECS_BY_ID["notch"],
+        key=pygame.K_9,
+        key_hint="9",
+        visibility_default=DEFAULT_NOTCH_VISIBLE,
+        color=NOTCH_COLOR,
+        cursor_color=CURSOR_NOTCH_COLOR,
+        line_width=SMOOTH_LINE_WIDTH,
+        mpl_color="yellowgreen",
+        density_cmap="YlGn",
+    ),
 ]
 
 
-KEY_TO_FILTER_ID = {f.key: f.id for f in FILTERS}
+FILTERS_BY_ID: Dict[str, FilterDescriptor] = {f.id: f for f in FILTERS}
+KEY_TO_FILTER_ID: Dict[int, str] = {f.key: f.id for f in FILTERS}
+
+
+def register_filter(descriptor: FilterDescriptor) -> None:
+    if descriptor.id in FILTERS_BY_ID:
+        raise ValueError(f"filtro já registrado: {descriptor.id}")
+    if descriptor.key in KEY_TO_FILTER_ID:
+        raise ValueError(f"tecla já usada pelo filtro: {KEY_TO_FILTER_ID[descriptor.key]}")
+    if descriptor.id not in FILTER_SPECS_BY_ID:
+        register_filter_spec(descriptor.spec)
+    FILTERS.append(descriptor)
+    FILTERS_BY_ID[descriptor.id] = descriptor
+    KEY_TO_FILTER_ID[descriptor.key] = descriptor.id
 
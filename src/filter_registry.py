@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from .config import (
+    ONE_EURO_MIN_CUTOFF,
+    ONE_EURO_BETA,
+    ONE_EURO_D_CUTOFF,
+    KALMAN_PROCESS_NOISE,
+    KALMAN_MEASUREMENT_NOISE,
+    KALMAN_PREDICTION_MS,
+    BUTTERWORTH_ORDER,
+    SAVGOL_WINDOW,
+    SAVGOL_POLYORDER,
+    NOTCH_BAND_HZ,
+    NOTCH_Q,
+    NOTCH_RESOLUTION_HZ,
+    NOTCH_UPDATE_HZ,
+    NOTCH_MIN_PEAK_RATIO,
+    NOTCH_HOLD_SPEED,
+    DRIFT_REST_SPEED,
+)
+from .filters import (
+    AdaptiveNotchFilter,
+    ButterworthFilter,
+    DriftCorrectedFilter,
+    ExponentialFilter,
+    Filter,
+    FilterSettings,
+    KalmanFilter,
+    MovingAverageFilter,
+    OneEuroFilter,
+    RawFilter,
+    SavitzkyGolayFilter,
+)
+
+
+def _raw_filter(settings: FilterSettings) -> Filter:
+    return RawFilter()
+
+
+def _moving_average_filter(settings: FilterSettings) -> Filter:
+    return MovingAverageFilter(settings.buffer_size, settings.window_size)
+
+
+def _exponential_filter(settings: FilterSettings) -> Filter:
+    return ExponentialFilter(settings.alpha)
+
+
+def _drift_corrected_filter(settings: FilterSettings) -> Filter:
+    return DriftCorrectedFilter(
+        settings.drift_window_s, DRIFT_REST_SPEED, settings.sample_rate_hz
+    )
+
+
+def _one_euro_filter(settings: FilterSettings) -> Filter:
+    return OneEuroFilter(
+        ONE_EURO_MIN_CUTOFF,
+        ONE_EURO_BETA,
+        ONE_EURO_D_CUTOFF,
+        settings.sample_rate_hz,
+    )
+
+
+def _kalman_filter(settings: FilterSettings) -> Filter:
+    return KalmanFilter(
+        KALMAN_PROCESS_NOISE,
+        KALMAN_MEASUREMENT_NOISE,
+        KALMAN_PREDICTION_MS,
+        settings.sample_rate_hz,
+    )
+
+
+def _butterworth_filter(settings: FilterSettings) -> Filter:
+    return ButterworthFilter(
+        BUTTERWORTH_ORDER, settings.cutoff_hz, settings.sample_rate_hz
+    )
+
+
+def _savgol_filter(settings: FilterSettings) -> Filter:
+    return SavitzkyGolayFilter(SAVGOL_WINDOW, SAVGOL_POLYORDER)
+
+
+def _notch_filter(settings: FilterSettings) -> Filter:
+    return AdaptiveNotchFilter(
+        NOTCH_BAND_HZ,
+        NOTCH_Q,
+        settings.sample_rate_hz,
+        NOTCH_RESOLUTION_HZ,
+        NOTCH_UPDATE_HZ,
+        NOTCH_MIN_PEAK_RATIO,
+        NOTCH_HOLD_SPEED,
+    )
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    id: str
+    name: str
+    factory: Callable[[FilterSettings], Filter]
+
+
+FILTER_SPECS: List[FilterSpec] = [
+    FilterSpec("raw", "Raw", _raw_filter),
+    FilterSpec("ma", "MA", _moving_average_filter),
+    FilterSpec("exp", "Exp", _exponential_filter),
+    FilterSpec("drift", "Drift corr.", _drift_corrected_filter),
+    FilterSpec("one_euro", "One Euro", _one_euro_filter),
+    FilterSpec("kalman", "Kalman", _kalman_filter),
+    FilterSpec("butterworth", "Butterworth", _butterworth_filter),
+    FilterSpec("savgol", "Savitzky-Golay", _savgol_filter),
+    FilterSpec("notch", "Notch adapt.", _notch_filter),
+]
+
+
+FILTER_SPECS_BY_ID: Dict[str, FilterSpec] = {spec.id: spec for spec in FILTER_SPECS}
+
+
+def register_filter_spec(spec: FilterSpec) -> None:
+    if spec.id in FILTER_SPECS_BY_ID:
+        raise ValueError(f"filtro já registrado: {spec.id}")
+    FILTER_SPECS.append(spec)
+    FILTER_SPECS_BY_ID[spec.id] = spec
@@ -1,4 +1,17 @@
-from typing import Optional
+import cmath
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, NamedTuple, Optional, Protocol, Union
+
+import numpy as np
+
+from .filter_design import (
+    butterworth_sos,
+    notch_sos,
+    savgol_coefficients,
+    sos_steady_state,
+)
 
 
 def moving_average(buffer: list[float], window_size: int) -> Optional[float]:
@@ -23,3 +36,1378 @@ def exp_smoothing(x: float,
         return x
 
     return alpha * x + (1.0 - alpha) * prev_y
+
+
+def moving_average_batch(samples: np.ndarray,
+                         window_size: int,
+                         capacity: int) -> np.ndarray:
+    if window_size <= 0:
+        raise ValueError("window_size deve ser > 0")
+    if capacity <= 0:
+        raise ValueError("capacity deve ser > 0")
+
+    values = _as_sample_array(samples)
+    count = len(values)
+    if count == 0:
+        return np.empty_like(values)
+
+    blocks = -(-count // capacity)
+    padded = np.zeros((blocks * capacity, values.shape[1]))
+    padded[:count] = values
+    local = np.cumsum(padded.reshape(blocks, capacity, -1), axis=1)
+    block_end = local[:, -1, :]
+    local = local.reshape(blocks * capacity, -1)[:count]
+
+    k = np.arange(count)
+    n = np.minimum(k + 1, min(capacity, window_size))
+    j = k - n
+
+    sums = local.copy()
+    has_prev = j >= 0
+    same_block = has_prev & (j // capacity == k // capacity)
+    prev_block = has_prev & ~same_block
+
+    sums[same_block] = local[same_block] - local[j[same_block]]
+    sums[prev_block] = (
+        block_end[k[prev_block] // capacity - 1] - local[j[prev_block]]
+    ) + local[prev_block]
+
+    return sums / n[:, None]
+
+
+def exp_smoothing_batch(samples: np.ndarray, alpha: float) -> np.ndarray:
+    if not (0.0 < alpha <= 1.0):
+        raise ValueError("alpha deve estar em (0, 1].")
+
+    values = _as_sample_array(samples)
+    result = np.empty_like(values)
+    if len(values) == 0:
+        return result
+
+    # Mesma recorrência e mesma ordem de operações de exp_smoothing: o lote
+    # sai bit a bit igual ao caminho amostra a amostra.
+    beta = 1.0 - alpha
+    for column in range(values.shape[1]):
+        xs = values[:, column].tolist()
+        ys = [0.0] * len(xs)
+        prev = xs[0]
+        ys[0] = prev
+        for i in range(1, len(xs)):
+            prev = alpha * xs[i] + beta * prev
+            ys[i] = prev
+        result[:, column] = ys
+
+    return result
+
+
+def one_euro_batch(samples: np.ndarray,
+                   timestamps_ns: Optional[np.ndarray],
+                   min_cutoff: float,
+                   beta: float,
+                   d_cutoff: float,
+                   fallback_rate_hz: float) -> np.ndarray:
+    values = _as_sample_array(samples)
+    result = np.empty_like(values)
+    count = len(values)
+    if count == 0:
+        return result
+
+    dts = _sample_intervals(timestamps_ns, count, 1.0 / fallback_rate_hz)
+    d_alphas = _smoothing_factor(d_cutoff, dts).tolist()
+    dts = dts.tolist()
+
+    for column in range(values.shape[1]):
+        xs = values[:, column].tolist()
+        ys = [0.0] * count
+        x_hat = xs[0]
+        dx_hat = 0.0
+        ys[0] = x_hat
+        for i in range(1, count):
+            x_hat, dx_hat = _one_euro_step(
+                xs[i], x_hat, dx_hat, dts[i], d_alphas[i], min_cutoff, beta
+            )
+            ys[i] = x_hat
+        result[:, column] = ys
+
+    return result
+
+
+def _smoothing_factor(cutoff: float,
+                      dt: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+
+def _one_euro_step(x: float,
+                   x_hat: float,
+                   dx_hat: float,
+                   dt: float,
+                   d_alpha: float,
+                   min_cutoff: float,
+                   beta: float) -> tuple[float, float]:
+    dx = (x - x_hat) / dt
+    dx_hat = d_alpha * dx + (1.0 - d_alpha) * dx_hat
+    alpha = _smoothing_factor(min_cutoff + beta * abs(dx_hat), dt)
+    return alpha * x + (1.0 - alpha) * x_hat, dx_hat
+
+
+def kalman_batch(samples: np.ndarray,
+                 timestamps_ns: Optional[np.ndarray],
+                 process_noise: float,
+                 measurement_noise: float,
+                 horizon_ms: float,
+                 fallback_rate_hz: float) -> np.ndarray:
+    values = _as_sample_array(samples)
+    result = np.empty_like(values)
+    count = len(values)
+    if count == 0:
+        return result
+
+    dts = _sample_intervals(timestamps_ns, count, 1.0 / fallback_rate_hz).tolist()
+    gains = [(0.0, 0.0)] * count
+    covariance = _kalman_initial_covariance(measurement_noise)
+    for i in range(1, count):
+        covariance, gains[i] = _kalman_covariance_step(
+            covariance, dts[i], process_noise, measurement_noise
+        )
+
+    horizon_s = horizon_ms * 1e-3
+    for column in range(values.shape[1]):
+        zs = values[:, column].tolist()
+        ys = [0.0] * count
+        position = zs[0]
+        velocity = 0.0
+        ys[0] = position
+        for i in range(1, count):
+            position, velocity = _kalman_state_step(
+                zs[i], position, velocity, dts[i], gains[i]
+            )
+            ys[i] = position + velocity * horizon_s
+        result[:, column] = ys
+
+    return result
+
+
+def _sample_intervals(timestamps_ns: Optional[np.ndarray],
+                      count: int,
+                      fallback_dt: float) -> np.ndarray:
+    dts = np.full(count, fallback_dt)
+    if timestamps_ns is not None:
+        stamps = np.asarray(timestamps_ns, dtype=np.int64)
+        if stamps.shape != (count,):
+            raise ValueError("timestamps_ns deve ter formato (N,)")
+        elapsed = np.diff(stamps) * 1e-9
+        dts[1:] = np.where(elapsed > 0.0, elapsed, fallback_dt)
+    return dts
+
+
+def _kalman_initial_covariance(measurement_noise: float) -> tuple[float, float, float]:
+    return measurement_noise, 0.0, KalmanFilter.INITIAL_VELOCITY_VARIANCE
+
+
+def _kalman_covariance_step(covariance: tuple[float, float, float],
+                            dt: float,
+                            process_noise: float,
+                            measurement_noise: float,
+                            ) -> tuple[tuple[float, float, float], tuple[float, float]]:
+    p00, p01, p11 = covariance
+    dt2 = dt * dt
+    p00 = p00 + 2.0 * dt * p01 + dt2 * p11 + process_noise * dt2 * dt / 3.0
+    p01 = p01 + dt * p11 + process_noise * dt2 / 2.0
+    p11 = p11 + process_noise * dt
+
+    innovation_var = p00 + measurement_noise
+    k0 = p00 / innovation_var
+    k1 = p01 / innovation_var
+    covariance = ((1.0 - k0) * p00, (1.0 - k0) * p01, p11 - k1 * p01)
+    return covariance, (k0, k1)
+
+
+def _kalman_state_step(z: float,
+                       position: float,
+                       velocity: float,
+                       dt: float,
+                       gain: tuple[float, float]) -> tuple[float, float]:
+    position += velocity * dt
+    residual = z - position
+    return position + gain[0] * residual, velocity + gain[1] * residual
+
+
+def sos_filter_batch(samples: np.ndarray, sos: np.ndarray) -> np.ndarray:
+    values = _as_sample_array(samples)
+    result = np.empty_like(values)
+    if len(values) == 0:
+        return result
+
+    sections = [tuple(section) for section in np.asarray(sos).tolist()]
+    steady = sos_steady_state(np.asarray(sos)).tolist()
+    for column in range(values.shape[1]):
+        ys = values[:, column].tolist()
+        x0 = ys[0]
+        for (b0, b1, b2, _, a1, a2), (s1, s2) in zip(sections, steady):
+            z1 = s1 * x0
+            z2 = s2 * x0
+            for i, x in enumerate(ys):
+                y = b0 * x + z1
+                z1 = b1 * x - a1 * y + z2
+                z2 = b2 * x - a2 * y
+                ys[i] = y
+        result[:, column] = ys
+
+    return result
+
+
+def savgol_batch(samples: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+    values = _as_sample_array(samples)
+    if len(values) == 0:
+        return np.empty_like(values)
+
+    window_length = len(coefficients)
+    padded = np.concatenate((np.repeat(values[:1], window_length - 1, axis=0), values))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window_length, axis=0)
+    return windows @ coefficients
+
+
+def _as_sample_array(samples: np.ndarray) -> np.ndarray:
+    values = np.asarray(samples, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] != 2:
+        raise ValueError("samples deve ter formato (N, 2)")
+    return values
+
+
+class RunningMovingAverage:
+    def __init__(self, capacity: int, window_size: int):
+        if capacity <= 0:
+            raise ValueError("capacity deve ser > 0")
+        if window_size <= 0:
+            raise ValueError("window_size deve ser > 0")
+
+        self._capacity = capacity
+        self._window_size = window_size
+        self._slots = capacity + 1
+        self._prefix_x = [0.0] * self._slots
+        self._prefix_y = [0.0] * self._slots
+        self._count = 0
+        self._acc_x = 0.0
+        self._acc_y = 0.0
+        self._block_end_x = 0.0
+        self._block_end_y = 0.0
+
+    def update(self, x: float, y: float) -> tuple[float, float]:
+        k = self._count
+        capacity = self._capacity
+
+        if k % capacity == 0:
+            self._block_end_x = self._acc_x
+            self._block_end_y = self._acc_y
+            self._acc_x = x
+            self._acc_y = y
+        else:
+            self._acc_x += x
+            self._acc_y += y
+
+        self._prefix_x[k % self._slots] = self._acc_x
+        self._prefix_y[k % self._slots] = self._acc_y
+        self._count = k + 1
+
+        n = min(self._count, capacity, self._window_size)
+        j = k - n
+        if j < 0:
+            sum_x = self._acc_x
+            sum_y = self._acc_y
+        elif j // capacity == k // capacity:
+            sum_x = self._acc_x - self._prefix_x[j % self._slots]
+            sum_y = self._acc_y - self._prefix_y[j % self._slots]
+        else:
+            sum_x = (self._block_end_x - self._prefix_x[j % self._slots]) + self._acc_x
+            sum_y = (self._block_end_y - self._prefix_y[j % self._slots]) + self._acc_y
+
+        return sum_x / n, sum_y / n
+
+    def set_window(self, window_size: int) -> None:
+        if window_size <= 0:
+            raise ValueError("window_size deve ser > 0")
+        self._window_size = window_size
+
+    def clear(self) -> None:
+        self._count = 0
+        self._acc_x = 0.0
+        self._acc_y = 0.0
+        self._block_end_x = 0.0
+        self._block_end_y = 0.0
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+
+class Sample(NamedTuple):
+    x: float
+    y: float
+    t_ns: int
+
+
+class SampleBatch(NamedTuple):
+    xy: np.ndarray
+    t_ns: Optional[np.ndarray] = None
+
+
+@dataclass(frozen=True)
+class FilterSettings:
+    buffer_size: int
+    window_size: int
+    alpha: float
+    drift_window_s: float
+    cutoff_hz: float
+    sample_rate_hz: float
+
+
+class SampleRateEstimator:
+    TIME_CONSTANT_S = 0.5
+    MAX_GAP_S = 0.25
+    RETUNE_TOLERANCE = 0.05
+
+    def __init__(self, nominal_rate_hz: float):
+        if nominal_rate_hz <= 0.0:
+            raise ValueError("nominal_rate_hz deve ser > 0")
+        self._rate_hz = nominal_rate_hz
+        self._design_hz = nominal_rate_hz
+        self._last_t_ns: Optional[int] = None
+
+    def update(self, t_ns: int) -> bool:
+        last_t_ns = self._last_t_ns
+        self._last_t_ns = t_ns
+        if last_t_ns is None or t_ns <= last_t_ns:
+            return False
+        dt = (t_ns - last_t_ns) * 1e-9
+        if dt > self.MAX_GAP_S:
+            return False
+
+        self._rate_hz += dt / (self.TIME_CONSTANT_S + dt) * (1.0 / dt - self._rate_hz)
+        if abs(self._rate_hz - self._design_hz) <= self.RETUNE_TOLERANCE * self._design_hz:
+            return False
+        self._design_hz = self._rate_hz
+        return True
+
+    def reset(self) -> None:
+        self._last_t_ns = None
+
+    @property
+    def rate_hz(self) -> float:
+        return self._rate_hz
+
+    @property
+    def design_hz(self) -> float:
+        return self._design_hz
+
+
+class Filter(Protocol):
+    def process(self, sample: Sample) -> Optional[tuple[float, float]]:
+        ...
+
+    def process_batch(self, batch: SampleBatch) -> Optional[np.ndarray]:
+        ...
+
+    def reset(self) -> None:
+        ...
+
+    @property
+    def params(self) -> Dict[str, float]:
+        ...
+
+    def set_param(self, name: str, value: float) -> None:
+        ...
+
+
+class _ParamsMixin:
+    _param_names: tuple[str, ...] = ()
+
+    @property
+    def params(self) -> Dict[str, float]:
+        return {name: getattr(self, f"_{name}") for name in self._param_names}
+
+    def set_param(self, name: str, value: float) -> None:
+        if name not in self._param_names:
+            raise KeyError(f"parâmetro desconhecido: {name}")
+        setattr(self, f"_{name}", value)
+
+
+class RawFilter(_ParamsMixin):
+    def process(self, sample: Sample) -> tuple[float, float]:
+        return sample.x, sample.y
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return _as_sample_array(batch.xy).copy()
+
+    def reset(self) -> None:
+        pass
+
+
+class MovingAverageFilter(_ParamsMixin):
+    _param_names = ("window_size",)
+
+    def __init__(self, capacity: int, window_size: int):
+        self._running = RunningMovingAverage(capacity, window_size)
+        self._window_size = window_size
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        return self._running.update(sample.x, sample.y)
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return moving_average_batch(batch.xy, self._window_size, self._running.capacity)
+
+    def reset(self) -> None:
+        self._running.clear()
+
+    def set_param(self, name: str, value: float) -> None:
+        super().set_param(name, int(value))
+        self._running.set_window(self._window_size)
+
+
+class ExponentialFilter(_ParamsMixin):
+    _param_names = ("alpha",)
+
+    def __init__(self, alpha: float):
+        self._alpha = alpha
+        self._prev: Optional[tuple[float, float]] = None
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        prev_x, prev_y = self._prev if self._prev is not None else (None, None)
+        self._prev = (
+            exp_smoothing(sample.x, prev_x, self._alpha),
+            exp_smoothing(sample.y, prev_y, self._alpha),
+        )
+        return self._prev
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return exp_smoothing_batch(batch.xy, self._alpha)
+
+    def reset(self) -> None:
+        self._prev = None
+
+
+class _LinearFit:
+    __slots__ = ("origin_ns", "n", "st", "stt", "sx", "sy", "sxx", "syy", "stx", "sty")
+
+    def __init__(self, origin_ns: int):
+        self.origin_ns = origin_ns
+        self.n = 0
+        self.st = 0.0
+        self.stt = 0.0
+        self.sx = 0.0
+        self.sy = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.stx = 0.0
+        self.sty = 0.0
+
+    def add(self, t_ns: int, x: float, y: float, sign: float) -> None:
+        t = (t_ns - self.origin_ns) * 1e-9
+        self.n += int(sign)
+        self.st += sign * t
+        self.stt += sign * t * t
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.syy += sign * y * y
+        self.stx += sign * t * x
+        self.sty += sign * t * y
+
+    def shift_origin(self, now_ns: int) -> None:
+        d = (now_ns - self.origin_ns) * 1e-9
+        self.origin_ns = now_ns
+        self.stt += -2.0 * d * self.st + self.n * d * d
+        self.st -= self.n * d
+        self.stx -= d * self.sx
+        self.sty -= d * self.sy
+
+    def contribution(self) -> tuple[float, float, float]:
+        if self.n < 2:
+            return 0.0, 0.0, 0.0
+        mean_t = self.st / self.n
+        return (
+            self.stx - mean_t * self.sx,
+            self.sty - mean_t * self.sy,
+            self.stt - mean_t * self.st,
+        )
+
+    def position_variance(self) -> float:
+        if self.n < 2:
+            return 0.0
+        mean_x = self.sx / self.n
+        mean_y = self.sy / self.n
+        return max(0.0, (self.sxx + self.syy) / self.n - mean_x * mean_x - mean_y * mean_y)
+
+
+class _RestFit(_LinearFit):
+    # Trecho em repouso: além da reta, guarda os momentos de ordem 3 e 4 do
+    # tempo para testar se um termo quadrático explica a trajetória.
+    __slots__ = ("sttt", "stttt", "sttx", "stty", "seconds", "accepted")
+
+    def __init__(self, origin_ns: int):
+        super().__init__(origin_ns)
+        self.sttt = 0.0
+        self.stttt = 0.0
+        self.sttx = 0.0
+        self.stty = 0.0
+        self.seconds = 0.0
+        self.accepted = False
+
+    def add_rest(self, t_ns: int, x: float, y: float, dt: float, sign: float) -> None:
+        self.add(t_ns, x, y, sign)
+        t = (t_ns - self.origin_ns) * 1e-9
+        tt = t * t
+        self.sttt += sign * tt * t
+        self.stttt += sign * tt * tt
+        self.sttx += sign * tt * x
+        self.stty += sign * tt * y
+        self.seconds += sign * dt
+
+    def shift_origin(self, now_ns: int) -> None:
+        d = (now_ns - self.origin_ns) * 1e-9
+        n, st, stt, sttt = self.n, self.st, self.stt, self.sttt
+        self.stttt += -4.0 * d * sttt + 6.0 * d * d * stt - 4.0 * d ** 3 * st + n * d ** 4
+        self.sttt += -3.0 * d * stt + 3.0 * d * d * st - n * d ** 3
+        self.sttx += -2.0 * d * self.stx + d * d * self.sx
+        self.stty += -2.0 * d * self.sty + d * d * self.sy
+        super().shift_origin(now_ns)
+
+    def is_curved(self, ratio: float) -> bool:
+        # Resíduo da reta contra o ganho do termo quadrático, pela base
+        # ortogonal 1, (t - média), (t - média)² - a (t - média) - b.
+        n = self.n
+        if n < 4:
+            return False
+        mean_t = self.st / n
+        m2 = self.stt - n * mean_t * mean_t
+        if m2 <= 0.0:
+            return False
+        m3 = self.sttt - 3.0 * mean_t * self.stt + 2.0 * n * mean_t ** 3
+        m4 = (
+            self.stttt - 4.0 * mean_t * self.sttt
+            + 6.0 * mean_t * mean_t * self.stt - 3.0 * n * mean_t ** 4
+        )
+        a = m3 / m2
+        b = m2 / n
+        norm = m4 - a * m3 - b * m2
+        if norm <= 0.0:
+            return False
+
+        linear = 0.0
+        quadratic = 0.0
+        for s, sxx, stx, sttx in (
+            (self.sx, self.sxx, self.stx, self.sttx),
+            (self.sy, self.syy, self.sty, self.stty),
+        ):
+            c1 = stx - mean_t * s
+            c2 = sttx - 2.0 * mean_t * stx + mean_t * mean_t * s
+            projection = c2 - a * c1 - b * s
+            linear += sxx - s * s / n - c1 * c1 / m2
+            quadratic += projection * projection / norm
+        return quadratic > ratio * max(0.0, linear - quadratic)
+
+
+_EMPTY_REST_TERMS = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def _rest_terms(segment: _RestFit) -> tuple[float, ...]:
+    # Somas da regressão com inclinação comum: numeradores, denominador,
+    # duração, amostras, ganho da inclinação própria e resíduo da reta própria.
+    cx, cy, cd = segment.contribution()
+    n = segment.n
+    if cd <= 0.0:
+        return (0.0, 0.0, 0.0, segment.seconds, float(n), 0.0, 0.0)
+    slope_gain = (cx * cx + cy * cy) / cd
+    spread = segment.sxx + segment.syy - (segment.sx * segment.sx + segment.sy * segment.sy) / n
+    return (cx, cy, cd, segment.seconds, float(n), slope_gain, spread - slope_gain)
+
+
+class DriftCorrectedFilter(_ParamsMixin):
+    MIN_REST_FRACTION = 0.25
+    CONFIRM_REST_FRACTION = 0.75
+    MIN_REST_SAMPLES = 30
+    MIN_SEGMENT_S = 1.0
+    REST_SETTLE_S = 0.3
+    CURVATURE_RATIO = 0.2
+    SPEED_TIME_CONSTANT_S = 0.1
+    REBASE_INTERVAL_S = 60.0
+    MOTION_WINDOW_FACTOR = 4.0
+    PRIOR_SPEED_FRACTION = 0.25
+
+    _param_names = ("window_s", "rest_speed")
+
+    def __init__(self, window_s: float, rest_speed: float, fallback_rate_hz: float):
+        if window_s <= 0.0:
+            raise ValueError("window_s deve ser > 0")
+        if fallback_rate_hz <= 0.0:
+            raise ValueError("fallback_rate_hz deve ser > 0")
+
+        self._window_s = window_s
+        self._rest_speed = rest_speed
+        self._fallback_rate_hz = fallback_rate_hz
+        self.reset()
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        return self._step(sample.x, sample.y, sample.t_ns)
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        values = _as_sample_array(batch.xy)
+        if batch.t_ns is None:
+            period_ns = 1e9 / self._fallback_rate_hz
+            stamps = [round(i * period_ns) for i in range(len(values))]
+        else:
+            stamps = np.asarray(batch.t_ns, dtype=np.int64).tolist()
+
+        replica = DriftCorrectedFilter(
+            self._window_s, self._rest_speed, self._fallback_rate_hz
+        )
+        step = replica._step
+        return np.array(
+            [step(x, y, t_ns) for (x, y), t_ns in zip(values.tolist(), stamps)],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+    def reset(self) -> None:
+        self._rest_samples: deque[tuple[int, _RestFit, float, float, float]] = deque()
+        self._motion_samples: deque[tuple[int, float, float]] = deque()
+        self._pending: deque[tuple[int, float, float, float]] = deque()
+        self._rest_start_ns: Optional[int] = None
+        self._segments: deque[_RestFit] = deque()
+        self._current: Optional[_RestFit] = None
+        self._closed = _EMPTY_REST_TERMS
+        self._motion = _LinearFit(0)
+        self._rest_velocity = (0.0, 0.0)
+        self._last_x = 0.0
+        self._last_y = 0.0
+        self._last_t_ns: Optional[int] = None
+        self._speed_x = 0.0
+        self._speed_y = 0.0
+        self._offset_x = 0.0
+        self._offset_y = 0.0
+        self._velocity_x = 0.0
+        self._velocity_y = 0.0
+
+    @property
+    def offset(self) -> tuple[float, float]:
+        return self._offset_x, self._offset_y
+
+    @property
+    def velocity(self) -> tuple[float, float]:
+        return self._velocity_x, self._velocity_y
+
+    def _step(self, x: float, y: float, t_ns: int) -> tuple[float, float]:
+        last_t_ns = self._last_t_ns
+        self._last_t_ns = t_ns
+        if last_t_ns is None:
+            self._motion = _LinearFit(t_ns)
+            self._last_x, self._last_y = x, y
+            return x - self._offset_x, y - self._offset_y
+
+        dt = (t_ns - last_t_ns) * 1e-9
+        if dt <= 0.0:
+            dt = 1.0 / self._fallback_rate_hz
+
+        gain = dt / (self.SPEED_TIME_CONSTANT_S + dt)
+        self._speed_x += gain * ((x - self._last_x) / dt - self._speed_x)
+        self._speed_y += gain * ((y - self._last_y) / dt - self._speed_y)
+        self._last_x, self._last_y = x, y
+
+        if math.hypot(self._speed_x, self._speed_y) < self._rest_speed:
+            # Só entra no ajuste o miolo do repouso: as amostras do primeiro
+            # REST_SETTLE_S ainda são fim de gesto, e cada amostra espera
+            # REST_SETTLE_S antes de entrar, para o começo do próximo gesto
+            # (que a velocidade suavizada só acusa depois) ficar de fora.
+            settle_ns = round(self.REST_SETTLE_S * 1e9)
+            if self._rest_start_ns is None:
+                self._rest_start_ns = t_ns
+            pending = self._pending
+            pending.append((t_ns, x, y, dt))
+            while pending and pending[0][0] <= t_ns - settle_ns:
+                rest_sample = pending.popleft()
+                if rest_sample[0] >= self._rest_start_ns + settle_ns:
+                    self._add_rest(*rest_sample)
+        else:
+            self._pending.clear()
+            self._rest_start_ns = None
+            self._close_current()
+
+        motion = self._motion
+        if (t_ns - motion.origin_ns) * 1e-9 > self.REBASE_INTERVAL_S:
+            motion.shift_origin(t_ns)
+        motion.add(t_ns, x, y, 1.0)
+        self._motion_samples.append((t_ns, x, y))
+
+        self._evict(t_ns)
+        self._update_velocity()
+
+        self._offset_x += self._velocity_x * dt
+        self._offset_y += self._velocity_y * dt
+        return x - self._offset_x, y - self._offset_y
+
+    def _add_rest(self, t_ns: int, x: float, y: float, dt: float) -> None:
+        segment = self._current
+        if segment is None:
+            segment = self._current = _RestFit(t_ns)
+            self._segments.append(segment)
+        elif (t_ns - segment.origin_ns) * 1e-9 > self._window_s:
+            # Origem perto da janela: os momentos de ordem 4 não perdem precisão.
+            segment.shift_origin(t_ns)
+        segment.add_rest(t_ns, x, y, dt, 1.0)
+        self._rest_samples.append((t_ns, segment, x, y, dt))
+
+    def _close_current(self) -> None:
+        if self._current is not None:
+            if self._current is not self._segments[0]:
+                self._current.accepted = self._accepts(self._current)
+                if self._current.accepted:
+                    self._add_closed(self._current, 1.0)
+            self._current = None
+
+    def _accepts(self, segment: _RestFit) -> bool:
+        # Repouso curto ou curvo é movimento lento, não drift: uma reta ajustada
+        # nele confundiria a velocidade do gesto com a do drift.
+        return (
+            segment.n >= self.MIN_REST_SAMPLES
+            and segment.seconds >= self.MIN_SEGMENT_S
+            and not segment.is_curved(self.CURVATURE_RATIO)
+        )
+
+    def _add_closed(self, segment: _RestFit, sign: float) -> None:
+        self._closed = tuple(
+            total + sign * term for total, term in zip(self._closed, _rest_terms(segment))
+        )
+
+    def _evict(self, now_ns: int) -> None:
+        horizon_ns = now_ns - round(self._window_s * 1e9)
+        samples = self._rest_samples
+        segments = self._segments
+        while samples and samples[0][0] <= horizon_ns:
+            t_ns, segment, x, y, dt = samples.popleft()
+            segment.add_rest(t_ns, x, y, dt, -1.0)
+            if segment.n == 0:
+                segments.popleft()
+                if segment is self._current:
+                    self._current = None
+                elif segments and segments[0] is not self._current and segments[0].accepted:
+                    # O novo primeiro trecho vira borda e sai da soma fixa.
+                    self._add_closed(segments[0], -1.0)
+        if not samples:
+            self._closed = _EMPTY_REST_TERMS
+
+        horizon_ns = now_ns - round(self.MOTION_WINDOW_FACTOR * self._window_s * 1e9)
+        samples = self._motion_samples
+        motion = self._motion
+        while samples and samples[0][0] <= horizon_ns:
+            t_ns, x, y = samples.popleft()
+            motion.add(t_ns, x, y, -1.0)
+
+    def _update_velocity(self) -> None:
+        totals = self._closed
+        if self._segments:
+            head = self._segments[0]
+            edges = (head,) if self._current in (None, head) else (head, self._current)
+            for segment in edges:
+                if self._accepts(segment):
+                    totals = tuple(
+                        total + term for total, term in zip(totals, _rest_terms(segment))
+                    )
+
+        num_x, num_y, den, seconds, n, slope_gain, residual = totals
+        # Os trechos compartilham uma só inclinação (a do drift); trechos retos
+        # com inclinações diferentes são pedaços de um gesto lento.
+        consistent = den > 0.0 and (
+            slope_gain - (num_x * num_x + num_y * num_y) / den
+            <= self.CURVATURE_RATIO * max(0.0, residual)
+        )
+        if (
+            consistent
+            and seconds >= self.MIN_REST_FRACTION * self._window_s
+            and n >= self.MIN_REST_SAMPLES
+        ):
+            self._velocity_x = num_x / den
+            self._velocity_y = num_y / den
+            # Um arco lento parece reto por pouco tempo: a estimativa só vira
+            # referência para o movimento depois de mais repouso na janela.
+            if seconds >= self.CONFIRM_REST_FRACTION * self._window_s:
+                self._rest_velocity = (self._velocity_x, self._velocity_y)
+            return
+
+        # Sem repouso suficiente, a inclinação da posição no tempo numa janela
+        # longa mistura drift e movimento; como o movimento é limitado à tela,
+        # o viés dela é da ordem de dispersão / duração. A estimativa entra
+        # ponderada pela variância inversa contra a última estimativa em repouso.
+        num_x, num_y, den = self._motion.contribution()
+        if den <= 0.0:
+            return
+        bias_variance = self._motion.position_variance() * self._motion.n / den
+        prior_variance = (self.PRIOR_SPEED_FRACTION * self._rest_speed) ** 2
+        weight = prior_variance / (prior_variance + bias_variance)
+        rest_x, rest_y = self._rest_velocity
+        self._velocity_x = rest_x + weight * (num_x / den - rest_x)
+        self._velocity_y = rest_y + weight * (num_y / den - rest_y)
+
+
+class OneEuroFilter(_ParamsMixin):
+    _param_names = ("min_cutoff", "beta", "d_cutoff")
+
+    def __init__(self,
+                 min_cutoff: float,
+                 beta: float,
+                 d_cutoff: float,
+                 fallback_rate_hz: float):
+        if min_cutoff <= 0.0 or d_cutoff <= 0.0:
+            raise ValueError("frequências de corte devem ser > 0")
+        if fallback_rate_hz <= 0.0:
+            raise ValueError("fallback_rate_hz deve ser > 0")
+
+        self._min_cutoff = min_cutoff
+        self._beta = beta
+        self._d_cutoff = d_cutoff
+        self._fallback_dt = 1.0 / fallback_rate_hz
+        self._last_t_ns: Optional[int] = None
+        self._x_hat = 0.0
+        self._y_hat = 0.0
+        self._dx_hat = 0.0
+        self._dy_hat = 0.0
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        if self._last_t_ns is None:
+            self._last_t_ns = sample.t_ns
+            self._x_hat = sample.x
+            self._y_hat = sample.y
+            return sample.x, sample.y
+
+        dt = (sample.t_ns - self._last_t_ns) * 1e-9
+        if dt <= 0.0:
+            dt = self._fallback_dt
+        self._last_t_ns = sample.t_ns
+
+        d_alpha = _smoothing_factor(self._d_cutoff, dt)
+        self._x_hat, self._dx_hat = _one_euro_step(
+            sample.x, self._x_hat, self._dx_hat, dt, d_alpha,
+            self._min_cutoff, self._beta,
+        )
+        self._y_hat, self._dy_hat = _one_euro_step(
+            sample.y, self._y_hat, self._dy_hat, dt, d_alpha,
+            self._min_cutoff, self._beta,
+        )
+        return self._x_hat, self._y_hat
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return one_euro_batch(
+            batch.xy,
+            batch.t_ns,
+            self._min_cutoff,
+            self._beta,
+            self._d_cutoff,
+            1.0 / self._fallback_dt,
+        )
+
+    def reset(self) -> None:
+        self._last_t_ns = None
+        self._dx_hat = 0.0
+        self._dy_hat = 0.0
+
+
+class KalmanFilter(_ParamsMixin):
+    INITIAL_VELOCITY_VARIANCE = 1.0e4
+
+    _param_names = ("process_noise", "measurement_noise", "horizon_ms")
+
+    def __init__(self,
+                 process_noise: float,
+                 measurement_noise: float,
+                 horizon_ms: float,
+                 fallback_rate_hz: float):
+        if process_noise <= 0.0 or measurement_noise <= 0.0:
+            raise ValueError("ruídos do Kalman devem ser > 0")
+        if fallback_rate_hz <= 0.0:
+            raise ValueError("fallback_rate_hz deve ser > 0")
+
+        self._process_noise = process_noise
+        self._measurement_noise = measurement_noise
+        self._horizon_ms = horizon_ms
+        self._fallback_dt = 1.0 / fallback_rate_hz
+        self._last_t_ns: Optional[int] = None
+        self._covariance = _kalman_initial_covariance(measurement_noise)
+        self._x = 0.0
+        self._vx = 0.0
+        self._y = 0.0
+        self._vy = 0.0
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        if self._last_t_ns is None:
+            self._last_t_ns = sample.t_ns
+            self._covariance = _kalman_initial_covariance(self._measurement_noise)
+            self._x, self._vx = sample.x, 0.0
+            self._y, self._vy = sample.y, 0.0
+            return sample.x, sample.y
+
+        dt = (sample.t_ns - self._last_t_ns) * 1e-9
+        if dt <= 0.0:
+            dt = self._fallback_dt
+        self._last_t_ns = sample.t_ns
+
+        self._covariance, gain = _kalman_covariance_step(
+            self._covariance, dt, self._process_noise, self._measurement_noise
+        )
+        self._x, self._vx = _kalman_state_step(sample.x, self._x, self._vx, dt, gain)
+        self._y, self._vy = _kalman_state_step(sample.y, self._y, self._vy, dt, gain)
+
+        horizon_s = self._horizon_ms * 1e-3
+        return self._x + self._vx * horizon_s, self._y + self._vy * horizon_s
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return kalman_batch(
+            batch.xy,
+            batch.t_ns,
+            self._process_noise,
+            self._measurement_noise,
+            self._horizon_ms,
+            1.0 / self._fallback_dt,
+        )
+
+    def reset(self) -> None:
+        self._last_t_ns = None
+
+
+class ButterworthFilter(_ParamsMixin):
+    MAX_CUTOFF_FRACTION = 0.45
+
+    _param_names = ("cutoff_hz", "order")
+
+    def __init__(self, order: int, cutoff_hz: float, sample_rate_hz: float):
+        self._order = order
+        self._cutoff_hz = cutoff_hz
+        self._sample_rate_hz = sample_rate_hz
+        self._rate = SampleRateEstimator(sample_rate_hz)
+        self._sos = self._design(order, cutoff_hz, sample_rate_hz)
+        self._sections: list[tuple[float, ...]] = []
+        self._state_x: list[list[float]] = []
+        self._state_y: list[list[float]] = []
+        self._history_x: Optional[list[list[float]]] = None
+        self._history_y: Optional[list[list[float]]] = None
+        self._load_coefficients()
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        if self._rate.update(sample.t_ns):
+            self._redesign(self._order, self._cutoff_hz)
+        if self._history_x is None:
+            # Regime permanente na primeira amostra: entradas e saídas de cada
+            # seção iguais a ela (ganho DC unitário por seção).
+            self._history_x = [[sample.x] * 4 for _ in self._sections]
+            self._history_y = [[sample.y] * 4 for _ in self._sections]
+            self._transfer()
+        return (
+            self._run_sections(sample.x, self._state_x, self._history_x),
+            self._run_sections(sample.y, self._state_y, self._history_y),
+        )
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        values = _as_sample_array(batch.xy)
+        if batch.t_ns is None:
+            period_ns = 1e9 / self._sample_rate_hz
+            stamps = [round(i * period_ns) for i in range(len(values))]
+        else:
+            stamps = np.asarray(batch.t_ns, dtype=np.int64).tolist()
+
+        # Mesmo estimador de taxa e mesmos reprojetos do caminho amostra a
+        # amostra: o lote é um filtro novo processando as mesmas amostras.
+        replica = ButterworthFilter(self._order, self._cutoff_hz, self._sample_rate_hz)
+        return np.array(
+            [replica.process(Sample(x, y, t_ns)) for (x, y), t_ns in zip(values.tolist(), stamps)],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+    def reset(self) -> None:
+        self._rate.reset()
+        self._history_x = None
+        self._history_y = None
+
+    def set_param(self, name: str, value: float) -> None:
+        value = int(value) if name == "order" else float(value)
+        order = value if name == "order" else self._order
+        cutoff_hz = value if name == "cutoff_hz" else self._cutoff_hz
+        self._redesign(order, cutoff_hz)
+        super().set_param(name, value)
+
+    @property
+    def design_rate_hz(self) -> float:
+        return self._rate.design_hz
+
+    def _design(self, order: int, cutoff_hz: float, sample_rate_hz: float) -> np.ndarray:
+        cutoff_hz = min(cutoff_hz, self.MAX_CUTOFF_FRACTION * sample_rate_hz)
+        return butterworth_sos(order, cutoff_hz, sample_rate_hz)
+
+    def _redesign(self, order: int, cutoff_hz: float) -> None:
+        self._sos = self._design(order, cutoff_hz, self._rate.design_hz)
+        self._load_coefficients()
+        if self._history_x is None:
+            return
+        if len(self._history_x) != len(self._sections):
+            # Outra ordem, outras seções: sem sinais intermediários para
+            # aproveitar, parte do regime permanente na última saída.
+            last_x = self._history_x[-1][3]
+            last_y = self._history_y[-1][3]
+            self._history_x = [[last_x] * 4 for _ in self._sections]
+            self._history_y = [[last_y] * 4 for _ in self._sections]
+        self._transfer()
+
+    def _load_coefficients(self) -> None:
+        self._sections = [tuple(section) for section in self._sos.tolist()]
+
+    def _transfer(self) -> None:
+        # Como no notch: o estado de cada seção sai das duas últimas entradas e
+        # saídas dela, então reprojetar não gera salto nem transitório.
+        self._state_x = [
+            _transfer_state(section, history)
+            for section, history in zip(self._sections, self._history_x)
+        ]
+        self._state_y = [
+            _transfer_state(section, history)
+            for section, history in zip(self._sections, self._history_y)
+        ]
+
+    def _run_sections(
+        self,
+        x: float,
+        states: list[list[float]],
+        histories: list[list[float]],
+    ) -> float:
+        for (b0, b1, b2, _, a1, a2), state, history in zip(self._sections, states, histories):
+            y = b0 * x + state[0]
+            state[0] = b1 * x - a1 * y + state[1]
+            state[1] = b2 * x - a2 * y
+            _push_history(history, x, y)
+            x = y
+        return x
+
+
+class SavitzkyGolayFilter(_ParamsMixin):
+    _param_names = ("window_length", "polyorder")
+
+    def __init__(self, window_length: int, polyorder: int):
+        self._window_length = window_length
+        self._polyorder = polyorder
+        self._coefficients = savgol_coefficients(window_length, polyorder)
+        self._ring = np.zeros((2 * window_length, 2))
+        self._index = 0
+        self._primed = False
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        length = self._window_length
+        if not self._primed:
+            self._ring[:] = (sample.x, sample.y)
+            self._primed = True
+
+        self._index = (self._index + 1) % length
+        self._ring[self._index] = (sample.x, sample.y)
+        self._ring[self._index + length] = (sample.x, sample.y)
+        window = self._ring[self._index + 1:self._index + 1 + length]
+        x, y = (self._coefficients @ window).tolist()
+        return x, y
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        return savgol_batch(batch.xy, self._coefficients)
+
+    def reset(self) -> None:
+        self._primed = False
+
+    def set_param(self, name: str, value: float) -> None:
+        value = int(value)
+        window_length = value if name == "window_length" else self._window_length
+        polyorder = value if name == "polyorder" else self._polyorder
+        self._coefficients = savgol_coefficients(window_length, polyorder)
+        super().set_param(name, value)
+        self._ring = np.zeros((2 * window_length, 2))
+        self._index = 0
+        self._primed = False
+
+
+class SlidingDft:
+    DAMPING = 0.99999
+
+    def __init__(self, length: int, bins: range):
+        if length <= 0:
+            raise ValueError("length deve ser > 0")
+        if bins.start < 1 or bins.stop > length // 2:
+            raise ValueError("bins devem estar em [1, length // 2)")
+
+        self._length = length
+        self._bins = bins
+        self._twiddles = [cmath.exp(2j * math.pi * k / length) for k in bins]
+        self._damping_n = self.DAMPING ** length
+        self._history = [0.0] * length
+        self._index = 0
+        self._spectrum = [0j] * len(bins)
+
+    def update(self, x: float) -> None:
+        oldest = self._history[self._index]
+        self._history[self._index] = x
+        self._index = (self._index + 1) % self._length
+
+        delta = x - self._damping_n * oldest
+        damping = self.DAMPING
+        self._spectrum = [
+            twiddle * (damping * value + delta)
+            for twiddle, value in zip(self._twiddles, self._spectrum)
+        ]
+
+    def hann_magnitudes(self) -> list[float]:
+        spectrum = self._spectrum
+        return [
+            abs(0.5 * spectrum[i] - 0.25 * (spectrum[i - 1] + spectrum[i + 1]))
+            for i in range(1, len(spectrum) - 1)
+        ]
+
+    def clear(self) -> None:
+        self._history = [0.0] * self._length
+        self._index = 0
+        self._spectrum = [0j] * len(self._bins)
+
+    @property
+    def bins(self) -> range:
+        return self._bins
+
+
+def dominant_frequency(magnitudes: list[float],
+                       first_bin: int,
+                       resolution_hz: float,
+                       min_peak_ratio: float) -> Optional[float]:
+    if len(magnitudes) < 3:
+        return None
+
+    peak = max(range(len(magnitudes)), key=magnitudes.__getitem__)
+    ordered = sorted(magnitudes)
+    median = ordered[len(ordered) // 2]
+    if magnitudes[peak] <= min_peak_ratio * median:
+        return None
+
+    offset = 0.0
+    if 0 < peak < len(magnitudes) - 1 and min(magnitudes[peak - 1:peak + 2]) > 0.0:
+        left, center, right = (math.log(m) for m in magnitudes[peak - 1:peak + 2])
+        curvature = left - 2.0 * center + right
+        if curvature < 0.0:
+            offset = 0.5 * (left - right) / curvature
+    return (first_bin + peak + offset) * resolution_hz
+
+
+class AdaptiveNotchFilter(_ParamsMixin):
+    ESTIMATE_SMOOTHING = 0.5
+    RETUNE_THRESHOLD_HZ = 0.25
+    SPEED_TIME_CONSTANT_S = 0.1
+
+    _param_names = ("q",)
+
+    def __init__(self,
+                 band_hz: tuple[float, float],
+                 q: float,
+                 sample_rate_hz: float,
+                 resolution_hz: float,
+                 update_hz: float,
+                 min_peak_ratio: float,
+                 hold_speed: float):
+        low_hz, high_hz = band_hz
+        if not (0.0 < low_hz < high_hz):
+            raise ValueError("banda do notch deve ter 0 < low_hz < high_hz")
+
+        self._band_hz = band_hz
+        self._q = q
+        self._nominal_rate_hz = sample_rate_hz
+        self._resolution_hz = resolution_hz
+        self._update_hz = update_hz
+        self._min_peak_ratio = min_peak_ratio
+        self._hold_speed = hold_speed
+        self._rate = SampleRateEstimator(sample_rate_hz)
+
+        self._center_hz = 0.5 * (low_hz + high_hz)
+        self._estimate_hz = [self._center_hz, self._center_hz]
+        self._tuned_hz = [self._center_hz, self._center_hz]
+        self._state = [[0.0, 0.0], [0.0, 0.0]]
+        self._history: Optional[list[list[float]]] = None
+        self._speed_x = 0.0
+        self._speed_y = 0.0
+        self._still = 0
+        self._count = 0
+        self._configure(sample_rate_hz)
+
+    def process(self, sample: Sample) -> tuple[float, float]:
+        x, y = sample.x, sample.y
+        if self._rate.update(sample.t_ns):
+            self._configure(self._rate.design_hz)
+            self._transfer(0)
+            self._transfer(1)
+
+        history = self._history
+        if history is None:
+            history = self._history = [[x, x, x, x], [y, y, y, y]]
+            self._transfer(0)
+            self._transfer(1)
+        last_x = history[0][1]
+        last_y = history[1][1]
+        if not self._active:
+            _push_history(history[0], x, x)
+            _push_history(history[1], y, y)
+            return x, y
+
+        self._dft_x.update(x - last_x)
+        self._dft_y.update(y - last_y)
+
+        # A estimativa só anda com o cursor parado pela janela inteira da DFT:
+        # em movimento o espectro das diferenças é dominado pelo gesto.
+        rate_hz = self._sample_rate_hz
+        gain = 1.0 / (1.0 + self.SPEED_TIME_CONSTANT_S * rate_hz)
+        self._speed_x += gain * ((x - last_x) * rate_hz - self._speed_x)
+        self._speed_y += gain * ((y - last_y) * rate_hz - self._speed_y)
+        if math.hypot(self._speed_x, self._speed_y) < self._hold_speed:
+            self._still += 1
+        else:
+            self._still = 0
+
+        self._count += 1
+        if self._count % self._update_interval == 0 and self._still >= self._dft_length:
+            self._estimate(0, self._dft_x)
+            self._estimate(1, self._dft_y)
+
+        return self._run_notch(0, x), self._run_notch(1, y)
+
+    def process_batch(self, batch: SampleBatch) -> np.ndarray:
+        values = _as_sample_array(batch.xy)
+        if batch.t_ns is None:
+            period_ns = 1e9 / self._nominal_rate_hz
+            stamps = [round(i * period_ns) for i in range(len(values))]
+        else:
+            stamps = np.asarray(batch.t_ns, dtype=np.int64).tolist()
+
+        # Mesmo estimador de taxa e mesma agenda de reajuste do caminho amostra
+        # a amostra: o lote é um filtro novo processando as mesmas amostras.
+        replica = AdaptiveNotchFilter(
+            self._band_hz,
+            self._q,
+            self._nominal_rate_hz,
+            self._resolution_hz,
+            self._update_hz,
+            self._min_peak_ratio,
+            self._hold_speed,
+        )
+        return np.array(
+            [replica.process(Sample(x, y, t_ns)) for (x, y), t_ns in zip(values.tolist(), stamps)],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+    def reset(self) -> None:
+        self._rate.reset()
+        if self._active:
+            self._dft_x.clear()
+            self._dft_y.clear()
+        self._history = None
+        self._estimate_hz = [self._center_hz, self._center_hz]
+        self._retune(0, self._center_hz)
+        self._retune(1, self._center_hz)
+        self._speed_x = 0.0
+        self._speed_y = 0.0
+        self._still = 0
+        self._count = 0
+
+    def set_param(self, name: str, value: float) -> None:
+        super().set_param(name, float(value))
+        self._retune(0, self._tuned_hz[0])
+        self._retune(1, self._tuned_hz[1])
+
+    @property
+    def estimate_hz(self) -> tuple[float, float]:
+        return self._estimate_hz[0], self._estimate_hz[1]
+
+    @property
+    def design_rate_hz(self) -> float:
+        return self._sample_rate_hz
+
+    def _configure(self, sample_rate_hz: float) -> None:
+        low_hz, high_hz = self._band_hz
+        self._sample_rate_hz = sample_rate_hz
+        self._active = high_hz < sample_rate_hz / 2.0
+        if not self._active:
+            return
+
+        length = max(1, round(sample_rate_hz / self._resolution_hz))
+        self._dft_length = length
+        self._bin_hz = sample_rate_hz / length
+        first_bin = max(1, math.floor(low_hz / self._bin_hz) - 1)
+        last_bin = min(length // 2 - 1, math.ceil(high_hz / self._bin_hz) + 1)
+        bins = range(first_bin, last_bin + 1)
+        self._first_bin = first_bin + 1
+        self._gain_correction = [
+            1.0 / (2.0 * math.sin(math.pi * k / length))
+            for k in range(first_bin + 1, last_bin)
+        ]
+        self._dft_x = SlidingDft(length, bins)
+        self._dft_y = SlidingDft(length, bins)
+        self._still = 0
+        self._update_interval = max(1, round(sample_rate_hz / self._update_hz))
+        self._coefficients = [self._design(self._tuned_hz[0]), self._design(self._tuned_hz[1])]
+
+    def _estimate(self, axis: int, dft: SlidingDft) -> None:
+        magnitudes = [
+            magnitude * correction
+            for magnitude, correction in zip(dft.hann_magnitudes(), self._gain_correction)
+        ]
+        found = dominant_frequency(
+            magnitudes, self._first_bin, self._bin_hz, self._min_peak_ratio
+        )
+        if found is None:
+            return
+
+        low_hz, high_hz = self._band_hz
+        found = min(max(found, low_hz), high_hz)
+        estimate = self._estimate_hz[axis]
+        estimate += self.ESTIMATE_SMOOTHING * (found - estimate)
+        self._estimate_hz[axis] = estimate
+        if abs(estimate - self._tuned_hz[axis]) > self.RETUNE_THRESHOLD_HZ:
+            self._retune(axis, estimate)
+
+    def _retune(self, axis: int, center_hz: float) -> None:
+        self._tuned_hz[axis] = center_hz
+        if self._active:
+            self._coefficients[axis] = self._design(center_hz)
+            self._transfer(axis)
+
+    def _design(self, center_hz: float) -> tuple[float, ...]:
+        return tuple(notch_sos(center_hz, self._q, self._sample_rate_hz)[0].tolist())
+
+    def _transfer(self, axis: int) -> None:
+        # Troca de coeficientes como na forma direta I: o estado novo sai das
+        # duas últimas entradas e saídas reais, então a saída continua sem salto.
+        if not self._active or self._history is None:
+            return
+        self._state[axis] = _transfer_state(self._coefficients[axis], self._history[axis])
+
+    def _run_notch(self, axis: int, x: float) -> float:
+        b0, b1, b2, _, a1, a2 = self._coefficients[axis]
+        state = self._state[axis]
+        y = b0 * x + state[0]
+        state[0] = b1 * x - a1 * y + state[1]
+        state[1] = b2 * x - a2 * y
+        _push_history(self._history[axis], x, y)
+        return y
+
+
+def _transfer_state(section: tuple[float, ...], history: list[float]) -> list[float]:
+    _, b1, b2, _, a1, a2 = section
+    x_prev, x_last, y_prev, y_last = history
+    return [
+        b1 * x_last - a1 * y_last + b2 * x_prev - a2 * y_prev,
+        b2 * x_last - a2 * y_last,
+    ]
+
+
+def _push_history(history: list[float], x: float, y: float) -> None:
+    history[0] = history[1]
+    history[1] = x
+    history[2] = history[3]
+    history[3] = y
@@ -1,8 +1,12 @@
-from collections import deque
+import time
 from dataclasses import dataclass
-from typing import Deque, Optional
+from typing import Dict, Iterator, Optional, Sequence
 
-from filters import exp_smoothing, moving_average
+import numpy as np
+
+from .filter_registry import FILTER_SPECS
+from .filters import Filter, FilterSettings, Sample, SampleBatch
+from .profiler import Profiler
 
 
 @dataclass(frozen=True)
@@ -16,25 +20,103 @@ class Point:
 
 class TraceBuffer:
     def __init__(self, max_size: int):
-        self._points: Deque[Point] = deque(maxlen=max_size)
+        if max_size <= 0:
+            raise ValueError("max_size deve ser > 0")
+        self._capacity = max_size
+        self._xs = np.zeros(2 * max_size, dtype=np.float64)
+        self._ys = np.zeros(2 * max_size, dtype=np.float64)
+        self._ts = np.zeros(2 * max_size, dtype=np.int64)
+        self._head = 0
+        self._length = 0
+        self._appended = 0
+        self._generation = 0
+
+    def append(self, x: float, y: float, timestamp_ns: int = 0) -> None:
+        capacity = self._capacity
+        if self._length < capacity:
+            index = self._head + self._length
+            self._length += 1
+        else:
+            index = self._head
+            self._head = (self._head + 1) % capacity
+
+        index %= capacity
+        self._xs[index] = x
+        self._xs[index + capacity] = x
+        self._ys[index] = y
+        self._ys[index + capacity] = y
+        self._ts[index] = timestamp_ns
+        self._ts[index + capacity] = timestamp_ns
+        self._appended += 1
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self._view(self._xs)
 
-    def append(self, point: Point) -> None:
-        self._points.append(point)
+    @property
+    def ys(self) -> np.ndarray:
+        return self._view(self._ys)
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self._view(self._ts)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def appended(self) -> int:
+        return self._appended
+
+    @property
+    def first_index(self) -> int:
+        return self._appended - self._length
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def as_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.xs, self.ys
+
+    def arrays_since(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        skip = min(max(0, index - self.first_index), self._length)
+        start = self._head + skip
+        end = self._head + self._length
+        xs = self._xs[start:end]
+        ys = self._ys[start:end]
+        xs.flags.writeable = False
+        ys.flags.writeable = False
+        return xs, ys
 
     def as_int_tuples(self) -> list[tuple[int, int]]:
-        return [point.as_int_tuple() for point in self._points]
+        points = np.column_stack((self.xs, self.ys)).astype(np.int64)
+        return [tuple(point) for point in points.tolist()]
 
     def latest(self) -> Optional[Point]:
-        return self._points[-1] if self._points else None
+        if not self._length:
+            return None
+        index = (self._head + self._length - 1) % self._capacity
+        return Point(float(self._xs[index]), float(self._ys[index]))
 
     def clear(self) -> None:
-        self._points.clear()
+        self._head = 0
+        self._length = 0
+        self._appended = 0
+        self._generation += 1
+
+    def _view(self, data: np.ndarray) -> np.ndarray:
+        view = data[self._head:self._head + self._length]
+        view.flags.writeable = False
+        return view
 
     def __len__(self) -> int:
-        return len(self._points)
+        return self._length
 
-    def __iter__(self):
-        return iter(self._points)
+    def __iter__(self) -> Iterator[Point]:
+        for x, y in zip(self.xs.tolist(), self.ys.tolist()):
+            yield Point(x, y)
 
 
 class InputSmoother:
@@ -46,109 +128,142 @@ class InputSmoother:
         min_window: int,
         min_alpha: float,
         max_alpha: float,
-        drift_window: int,
+        drift_window_s: float,
+        cutoff_hz: float,
+        min_cutoff_hz: float,
+        max_cutoff_hz: float,
+        sample_rate_hz: float,
+        profiler: Optional[Profiler] = None,
+        filter_ids: Optional[Sequence[str]] = None,
     ):
         initial_window_size = max(min_window, window_size)
         initial_alpha = self._clamp(alpha, min_alpha, max_alpha)
+        initial_cutoff_hz = self._clamp(cutoff_hz, min_cutoff_hz, max_cutoff_hz)
 
         self._window_size = initial_window_size
         self._alpha = initial_alpha
         self._min_window = min_window
         self._min_alpha = min_alpha
         self._max_alpha = max_alpha
-        self._drift_window = max(1, drift_window)
+        self._drift_window_s = drift_window_s
+        self._cutoff_hz = initial_cutoff_hz
+        self._min_cutoff_hz = min_cutoff_hz
+        self._max_cutoff_hz = max_cutoff_hz
+        self._sample_rate_hz = sample_rate_hz
 
         self._default_window_size = initial_window_size
         self._default_alpha = initial_alpha
-
-        self._sample_buffer: Deque[Point] = deque(maxlen=buffer_size)
-        self.raw_trace = TraceBuffer(buffer_size)
-        self.moving_average_trace = TraceBuffer(buffer_size)
-        self.exp_trace = TraceBuffer(buffer_size)
-        self.drift_corrected_trace = TraceBuffer(buffer_size)
-
-        self._exp_point: Optional[Point] = None
+        self._default_cutoff_hz = initial_cutoff_hz
+
+        settings = FilterSettings(
+            buffer_size,
+            initial_window_size,
+            initial_alpha,
+            self._drift_window_s,
+            initial_cutoff_hz,
+            sample_rate_hz,
+        )
+        self._filters: Dict[str, Filter] = {
+            spec.id: spec.factory(settings)
+            for spec in FILTER_SPECS
+            if filter_ids is None or spec.id in filter_ids
+        }
+        self._traces: Dict[str, TraceBuffer] = {
+            filter_id: TraceBuffer(buffer_size) for filter_id in self._filters
+        }
+        self._profiler = profiler
+        self._span_names = {filter_id: f"filter.{filter_id}" for filter_id in self._filters}
+
+        self._last_timestamp_ns: Optional[int] = None
 
     def add_sample(
         self,
         x: float,
         y: float,
         store_history: bool = True,
-        drift_offset: Optional[tuple[float, float]] = None,
-    ) -> tuple[Point, Optional[Point], Point, Optional[Point]]:
-        point = Point(x, y)
-        self._sample_buffer.append(point)
-
-        ma_point = self._compute_moving_average()
-        exp_point = self._compute_exponential(point)
-        drift_point = self._compute_drift_corrected(point, drift_offset)
-
-        if store_history:
-            self.raw_trace.append(point)
-            if ma_point is not None:
-                self.moving_average_trace.append(ma_point)
-            self.exp_trace.append(exp_point)
-            if drift_point is not None:
-                self.drift_corrected_trace.append(drift_point)
-
-        return point, ma_point, exp_point, drift_point
-
-    def _compute_moving_average(self) -> Optional[Point]:
-        if not self._sample_buffer:
-            return None
-
-        sample_x = [p.x for p in self._sample_buffer]
-        sample_y = [p.y for p in self._sample_buffer]
-        ma_x = moving_average(sample_x, self._window_size)
-        ma_y = moving_average(sample_y, self._window_size)
-
-        if ma_x is None or ma_y is None:
-            return None
-
-        ma_point = Point(ma_x, ma_y)
-        return ma_point
-
-    def _compute_exponential(self, point: Point) -> Point:
-        prev_x = self._exp_point.x if self._exp_point else None
-        prev_y = self._exp_point.y if self._exp_point else None
-
-        self._exp_point = Point(
-            exp_smoothing(point.x, prev_x, self._alpha),
-            exp_smoothing(point.y, prev_y, self._alpha),
-        )
-
-        return self._exp_point
-
-    def _compute_drift_corrected(
+        timestamp_ns: Optional[int] = None,
+    ) -> Dict[str, Optional[Point]]:
+        if timestamp_ns is None:
+            timestamp_ns = time.perf_counter_ns()
+        self._last_timestamp_ns = timestamp_ns
+        sample = Sample(x, y, timestamp_ns)
+
+        profiler = self._profiler
+        timing = profiler is not None and profiler.enabled
+        points: Dict[str, Optional[Point]] = {}
+        for filter_id, stream in self._filters.items():
+            if timing:
+                start_ns = time.perf_counter_ns()
+                output = stream.process(sample)
+                profiler.record(self._span_names[filter_id], time.perf_counter_ns() - start_ns)
+            else:
+                output = stream.process(sample)
+            if output is None:
+                points[filter_id] = None
+                continue
+            if store_history:
+                self._traces[filter_id].append(output[0], output[1], timestamp_ns)
+            points[filter_id] = Point(output[0], output[1])
+
+        return points
+
+    def process_batch(
         self,
-        point: Point,
-        drift_offset: Optional[tuple[float, float]],
-    ) -> Optional[Point]:
-        if drift_offset is None:
-            return None
+        samples: np.ndarray,
+        timestamps_ns: Optional[np.ndarray] = None,
+    ) -> Dict[str, Optional[np.ndarray]]:
+        batch = SampleBatch(samples, timestamps_ns)
+        return {
+            filter_id: stream.process_batch(batch)
+            for filter_id, stream in self._filters.items()
+        }
+
+    def trace(self, filter_id: str) -> Optional[TraceBuffer]:
+        return self._traces.get(filter_id)
 
-        offset_x, offset_y = drift_offset
-        return Point(point.x - offset_x, point.y - offset_y)
+    @property
+    def traces(self) -> Dict[str, TraceBuffer]:
+        return self._traces
+
+    @property
+    def filters(self) -> Dict[str, Filter]:
+        return self._filters
 
     def change_window(self, delta: int) -> None:
         self._window_size = max(self._min_window, self._window_size + delta)
+        self._set_param("window_size", self._window_size)
 
     def change_alpha(self, delta: float) -> None:
         self._alpha = self._clamp(self._alpha + delta, self._min_alpha, self._max_alpha)
+        self._set_param("alpha", self._alpha)
+
+    def change_cutoff(self, delta: float) -> None:
+        self._cutoff_hz = self._clamp(
+            self._cutoff_hz + delta, self._min_cutoff_hz, self._max_cutoff_hz
+        )
+        self._set_param("cutoff_hz", self._cutoff_hz)
 
     def clear_history(self) -> None:
-        self.raw_trace.clear()
-        self.moving_average_trace.clear()
-        self.exp_trace.clear()
-        self._sample_buffer.clear()
-        self._exp_point = None
-        self.drift_corrected_trace.clear()
+        for trace in self._traces.values():
+            trace.clear()
+        for stream in self._filters.values():
+            stream.reset()
+        self._last_timestamp_ns = None
 
     def reset(self) -> None:
         self._window_size = self._default_window_size
         self._alpha = self._default_alpha
+        self._cutoff_hz = self._default_cutoff_hz
+        self._set_param("window_size", self._window_size)
+        self._set_param("alpha", self._alpha)
+        self._set_param("cutoff_hz", self._cutoff_hz)
         self.clear_history()
 
+    def _set_param(self, name: str, value: float) -> None:
+        for stream in self._filters.values():
+            if name in stream.params:
+                stream.set_param(name, value)
+
     @property
     def window_size(self) -> int:
         return self._window_size
@@ -157,6 +272,18 @@ class InputSmoother:
     def alpha(self) -> float:
         return self._alpha
 
+    @property
+    def cutoff_hz(self) -> float:
+        return self._cutoff_hz
+
+    @property
+    def sample_rate_hz(self) -> float:
+        return self._sample_rate_hz
+
+    @property
+    def last_timestamp_ns(self) -> Optional[int]:
+        return self._last_timestamp_ns
+
     @staticmethod
     def _clamp(value: float, min_value: float, max_value: float) -> float:
         return max(min_value, min(value, max_value))
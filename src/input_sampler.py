@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+import pygame
+
+
+Sample = Tuple[float, float, int]
+
+
+class InputSampler:
+    def __init__(
+        self,
+        rate_hz: float,
+        max_pending: int,
+        read_position: Optional[Callable[[], Tuple[float, float]]] = None,
+    ):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz deve ser > 0")
+        self.rate_hz = rate_hz
+        self._read_position = read_position or pygame.mouse.get_pos
+        self._queue: Deque[Sample] = deque(maxlen=max_pending)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="input-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def drain(self) -> List[Sample]:
+        queue = self._queue
+        return [queue.popleft() for _ in range(len(queue))]
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        period = 1.0 / self.rate_hz
+        next_deadline = time.perf_counter()
+        append = self._queue.append
+        last_position = None
+
+        # pygame.mouse.get_pos só muda quando a thread principal bombeia
+        # eventos; leituras repetidas seriam duplicatas, não amostras novas.
+        while not self._stop.is_set():
+            position = self._read_position()
+            if position != last_position:
+                last_position = position
+                append((position[0], position[1], time.perf_counter_ns()))
+
+            next_deadline += period
+            delay = next_deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_deadline = time.perf_counter()
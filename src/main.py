@@ -1,37 +1,62 @@
 import sys
 import time
+from typing import Dict, Optional
 
 import pygame
 
-from config import (
+from .config import (
     ALPHA_MAX,
     ALPHA_MIN,
+    BUTTERWORTH_CUTOFF_HZ,
+    CUTOFF_MAX_HZ,
+    CUTOFF_MIN_HZ,
     DEFAULT_HISTORY_ENABLED,
     DEFAULT_IIR_ALPHA,
     DEFAULT_MOVING_AVERAGE_WINDOW,
+    FILTER_BANK_SAMPLE_RATE_HZ,
     FPS,
+    INPUT_MODE,
+    INPUT_QUEUE_MAX,
+    INPUT_SAMPLE_RATE_HZ,
     MAX_BUFFER,
     MOVING_AVERAGE_MIN,
     PARAM_CHANGE_INDICATOR_DURATION,
     TREMOR_ENABLED,
     TREMOR_INTENSITY,
     TREMOR_FREQUENCY,
+    TREMOR_NOISE_BLOCK_SIZE,
+    TREMOR_SEED,
+    ZOOM_SMOOTH_FACTOR,
     DRIFT_ENABLED,
     DRIFT_PIXELS_PER_SECOND,
     DRIFT_DIRECTION_DEG,
-    DRIFT_CORRECTION_WINDOW,
+    DRIFT_CORRECTION_WINDOW_S,
+    EXPORT_MAX_WORKERS,
+    EXPORT_OUTPUT_DIR,
+    EXPORT_STATUS_DURATION,
+    SESSION_BUFFER_RECORDS,
+    SESSION_OUTPUT_DIR,
+    PROFILE_OUTPUT_DIR,
+    PROFILE_STATUS_INTERVAL_MS,
+    DEFAULT_PROFILER_ENABLED,
 )
-from input_device import InputSmoother
-from tremor_simulator import DriftSimulator, TremorSimulator
-from tremor_modal import TremorModal
-from ui import (
+from .input_device import InputSmoother, Point
+from .input_sampler import InputSampler
+from .plot_export import PlotExporter
+from .profiler import NULL_PROFILER, Profiler
+from .quality import FilterQualityTracker
+from .session import SessionWriter, session_header, session_path
+from .trace_layers import TraceLayerRenderer
+from .tremor_simulator import DriftSimulator, TremorSimulator
+from .tremor_modal import TremorModal
+from .ui import (
+    HudTextCache,
     build_font,
     create_window,
     handle_events,
     render_frame,
-    generate_3d_visualization,
 )
-from ui_state import (
+from .ui_state import (
     MetricsTracker,
     ParamChangeIndicator,
     ViewTransform,
@@ -39,6 +64,9 @@ from ui_state import (
 )
 
 
+PROFILE_STAGES = ("events", "input", "samples", "render")
+
+
 def reset_app_state(
     smoother: InputSmoother,
     view_transform: ViewTransform,
@@ -66,11 +94,85 @@ def reset_app_state(
     return DEFAULT_HISTORY_ENABLED
 
 
+def process_samples(
+    samples: list[tuple[float, float, int]],
+    smoother: InputSmoother,
+    tremor_sim: TremorSimulator,
+    drift_sim: DriftSimulator,
+    history_enabled: bool,
+    recorder: Optional[SessionWriter] = None,
+    quality: Optional[FilterQualityTracker] = None,
+    profiler: Profiler = NULL_PROFILER,
+) -> Dict[str, Optional[Point]]:
+    for raw_x, raw_y, timestamp_ns in samples:
+        start_ns = profiler.begin()
+        tremor_x, tremor_y = tremor_sim.apply_tremor(raw_x, raw_y, timestamp_ns)
+        mouse_x, mouse_y = drift_sim.apply_drift(tremor_x, tremor_y, timestamp_ns)
+        profiler.end("samples.simulation", start_ns)
+        if recorder is not None:
+            drift_x, drift_y = drift_sim.get_offset()
+            recorder.append(
+                timestamp_ns,
+                raw_x,
+                raw_y,
+                mouse_x,
+                mouse_y,
+                tremor_x - raw_x,
+                tremor_y - raw_y,
+                drift_x,
+                drift_y,
+            )
+        start_ns = profiler.begin()
+        points = smoother.add_sample(
+            mouse_x,
+            mouse_y,
+            store_history=history_enabled,
+            timestamp_ns=timestamp_ns,
+        )
+        profiler.end("samples.filters", start_ns)
+        if quality is not None:
+            start_ns = profiler.begin()
+            quality.update(timestamp_ns, (raw_x, raw_y), (mouse_x, mouse_y), points)
+            profiler.end("samples.quality", start_ns)
+    return points
+
+
+def recording_status(recorder: Optional[SessionWriter]) -> Optional[str]:
+    if recorder is None:
+        return None
+    return f"Gravando sessão: {recorder.count} amostras"
+
+
+def toggle_profiler(profiler: Profiler) -> None:
+    if profiler.toggle():
+        return
+    json_path, csv_path = profiler.export(PROFILE_OUTPUT_DIR)
+    print(f"Perfil exportado: {json_path}, {csv_path}")
+
+
+def timestamp_positions(
+    positions: list[tuple[int, int]],
+    start_ns: int,
+    end_ns: int,
+) -> list[tuple[float, float, int]]:
+    span_ns = end_ns - start_ns
+    count = len(positions)
+    return [
+        (x, y, start_ns + span_ns * (index + 1) // count)
+        for index, (x, y) in enumerate(positions)
+    ]
+
+
 def main() -> None:
     pygame.init()
     screen, fullscreen = create_window()
     clock = pygame.time.Clock()
     font = build_font()
+    profiler = Profiler(
+        1000.0 / FPS,
+        DEFAULT_PROFILER_ENABLED,
+        PROFILE_STATUS_INTERVAL_MS,
+    )
 
     smoother = InputSmoother(
         buffer_size=MAX_BUFFER,
@@ -79,13 +181,20 @@ def main() -> None:
         min_window=MOVING_AVERAGE_MIN,
         min_alpha=ALPHA_MIN,
         max_alpha=ALPHA_MAX,
-        drift_window=DRIFT_CORRECTION_WINDOW,
+        drift_window_s=DRIFT_CORRECTION_WINDOW_S,
+        cutoff_hz=BUTTERWORTH_CUTOFF_HZ,
+        min_cutoff_hz=CUTOFF_MIN_HZ,
+        max_cutoff_hz=CUTOFF_MAX_HZ,
+        sample_rate_hz=FILTER_BANK_SAMPLE_RATE_HZ,
+        profiler=profiler,
     )
 
     tremor_sim = TremorSimulator(
         enabled=TREMOR_ENABLED,
         intensity=TREMOR_INTENSITY,
         frequency=TREMOR_FREQUENCY,
+        seed=TREMOR_SEED,
+        noise_block_size=TREMOR_NOISE_BLOCK_SIZE,
     )
 
     drift_sim = DriftSimulator(
@@ -101,15 +210,33 @@ def main() -> None:
     visibility = VisibilityState()
     metrics = MetricsTracker()
     param_indicator = ParamChangeIndicator()
+    hud_cache = HudTextCache()
+    trace_layers = TraceLayerRenderer()
+    exporter = PlotExporter(
+        EXPORT_OUTPUT_DIR,
+        EXPORT_MAX_WORKERS,
+        EXPORT_STATUS_DURATION,
+    )
+
+    input_sampler = None
+    if INPUT_MODE == "thread":
+        input_sampler = InputSampler(INPUT_SAMPLE_RATE_HZ, INPUT_QUEUE_MAX)
+        input_sampler.start()
+
+    recorder: Optional[SessionWriter] = None
 
     running = True
-    last_time = time.time()
+    last_time_ns = time.perf_counter_ns()
     
     while running:
-        frame_start = time.time()
-        dt_ms = int((frame_start - last_time) * 1000)
-        last_time = frame_start
+        frame_start_ns = time.perf_counter_ns()
+        dt_ms = (frame_start_ns - last_time_ns) // 1_000_000
+        previous_frame_ns = last_time_ns
+        last_time_ns = frame_start_ns
+        motion_positions = None
+        generate_3d = False
 
+        events_start_ns = profiler.begin()
         if tremor_modal.active:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -125,6 +252,8 @@ def main() -> None:
                     if tremor_modal.slider_dragging:
                         tremor_modal.handle_mouse(event.pos, 0, True)
         else:
+            if INPUT_MODE == "events":
+                motion_positions = []
             (
                 running,
                 history_enabled,
@@ -132,6 +261,8 @@ def main() -> None:
                 generate_3d,
                 modal_to_open,
                 reset_requested,
+                record_toggled,
+                profile_toggled,
             ) = handle_events(
                 smoother,
                 history_enabled,
@@ -139,6 +270,7 @@ def main() -> None:
                 visibility,
                 param_indicator,
                 fullscreen,
+                motion_positions,
             )
 
             if modal_to_open:
@@ -147,6 +279,27 @@ def main() -> None:
             if not running:
                 break
 
+            if record_toggled:
+                if recorder is None:
+                    recorder = SessionWriter(
+                        session_path(SESSION_OUTPUT_DIR),
+                        session_header(
+                            smoother,
+                            tremor_sim,
+                            drift_sim,
+                            INPUT_MODE,
+                            smoother.sample_rate_hz,
+                        ),
+                        SESSION_BUFFER_RECORDS,
+                    )
+                else:
+                    recorder.close()
+                    print(f"Sessão gravada: {recorder.path} ({recorder.count} amostras)")
+                    recorder = None
+
+            if profile_toggled:
+                toggle_profiler(profiler)
+
             if reset_requested:
                 history_enabled = reset_app_state(
                     smoother,
@@ -157,42 +310,56 @@ def main() -> None:
                     tremor_sim,
                     drift_sim,
                 )
+        profiler.end("events", events_start_ns)
 
         is_currently_fullscreen = bool(screen.get_flags() & pygame.FULLSCREEN)
         if fullscreen != is_currently_fullscreen:
             screen, fullscreen = create_window(fullscreen)
+            trace_layers.invalidate()
 
         if generate_3d:
-            generate_3d_visualization(smoother)
+            exporter.submit(smoother)
+        exporter.poll()
 
         param_indicator.update(dt_ms)
+        view_transform.update_smooth(ZOOM_SMOOTH_FACTOR)
 
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        mouse_x, mouse_y = tremor_sim.apply_tremor(mouse_x, mouse_y)
-        mouse_x, mouse_y = drift_sim.apply_drift(mouse_x, mouse_y)
-        drift_offset = drift_sim.get_offset()
-        
-        raw_point, ma_point, exp_point, drift_point = smoother.add_sample(
-            mouse_x,
-            mouse_y,
-            store_history=history_enabled,
-            drift_offset=drift_offset,
+        input_start_ns = profiler.begin()
+        samples = input_sampler.drain() if input_sampler else []
+        if motion_positions:
+            samples = timestamp_positions(
+                motion_positions, previous_frame_ns, frame_start_ns
+            )
+        if not samples:
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            samples = [(mouse_x, mouse_y, frame_start_ns)]
+        profiler.end("input", input_start_ns)
+
+        samples_start_ns = profiler.begin()
+        points_by_filter = process_samples(
+            samples,
+            smoother,
+            tremor_sim,
+            drift_sim,
+            history_enabled,
+            recorder,
+            metrics.quality if visibility.quality_panel else None,
+            profiler,
         )
+        profiler.end("samples", samples_start_ns)
 
         current_fps = clock.get_fps()
         if current_fps > 0:
             metrics.add_fps(current_fps)
         metrics.add_latency(dt_ms)
 
+        render_start_ns = profiler.begin()
         render_frame(
             screen,
             font,
             smoother,
             history_enabled,
-            raw_point,
-            ma_point,
-            exp_point,
-            drift_point,
+            points_by_filter,
             view_transform,
             visibility,
             metrics,
@@ -201,10 +368,33 @@ def main() -> None:
             tremor_sim,
             drift_sim,
             tremor_modal,
+            [
+                line
+                for line in (
+                    exporter.status_line(),
+                    recording_status(recorder),
+                    profiler.status_line("frame", PROFILE_STAGES),
+                )
+                if line
+            ],
+            hud_cache,
+            trace_layers,
+            profiler,
         )
+        profiler.end("render", render_start_ns)
+        if profiler.enabled:
+            profiler.record("frame", time.perf_counter_ns() - frame_start_ns)
 
-        clock.tick(FPS)
+        with profiler.span("tick"):
+            clock.tick(FPS)
 
+    if input_sampler:
+        input_sampler.stop()
+    if recorder is not None:
+        recorder.close()
+    if profiler.enabled:
+        toggle_profiler(profiler)
+    exporter.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -1,35 +1,63 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
-from filter_metadata import FILTERS
-from input_device import InputSmoother
+from .config import (
+    DENSITY_BANDWIDTH,
+    DENSITY_BINS_PER_SIGMA,
+    DENSITY_GRID_SIZE,
+    DENSITY_MAX_BINS,
+)
+from .filter_metadata import FILTERS, FilterDescriptor
+from .input_device import InputSmoother
 
 
-def generate_3d_plot(smoother: InputSmoother, output_path: Optional[str] = None) -> None:
-    raw_points = list(smoother.raw_trace)
+TraceArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
-    if not raw_points:
+
+@dataclass(frozen=True)
+class TraceSnapshot:
+    window_size: int
+    alpha: float
+    traces: Dict[str, TraceArrays]
+    descriptors: Tuple[FilterDescriptor, ...] = ()
+
+    @classmethod
+    def from_smoother(cls, smoother: InputSmoother) -> "TraceSnapshot":
+        traces: Dict[str, TraceArrays] = {}
+        for descriptor in FILTERS:
+            trace = smoother.trace(descriptor.id)
+            if trace is None:
+                continue
+            traces[descriptor.id] = (trace.xs.copy(), trace.ys.copy(), trace.ts.copy())
+        return cls(smoother.window_size, smoother.alpha, traces, tuple(FILTERS))
+
+    def sample_count(self, filter_id: str = "raw") -> int:
+        arrays = self.traces.get(filter_id)
+        return len(arrays[0]) if arrays is not None else 0
+
+
+def generate_3d_plot(snapshot: TraceSnapshot, output_path: Optional[str] = None) -> None:
+    if not snapshot.sample_count():
         print("Nenhum dado disponível para plotar.")
         return
 
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
 
-    time_steps = np.arange(len(raw_points))
+    start_ns = int(snapshot.traces["raw"][2][0])
 
-    for descriptor in FILTERS:
-        trace = getattr(smoother, descriptor.trace_attr, None)
-        if trace is None:
+    for descriptor in snapshot.descriptors:
+        arrays = snapshot.traces.get(descriptor.id)
+        if arrays is None:
             continue
-        points = list(trace)
-        if not points:
+        xs, ys, ts = arrays
+        if not len(xs):
             continue
 
-        xs = [p.x for p in points]
-        ys = [p.y for p in points]
-        zs = time_steps[: len(xs)]
+        zs = (ts - start_ns) * 1e-9
 
         ax.plot(
             xs,
@@ -43,9 +71,9 @@ def generate_3d_plot(smoother: InputSmoother, output_path: Optional[str] = None)
 
     ax.set_xlabel('X Position', fontsize=10)
     ax.set_ylabel('Y Position', fontsize=10)
-    ax.set_zlabel('Time (samples)', fontsize=10)
+    ax.set_zlabel('Time (s)', fontsize=10)
     ax.set_title('3D Visualization of Input Smoothing\n'
-                 f'Window Size: {smoother.window_size}, Alpha: {smoother.alpha:.2f}',
+                 f'Window Size: {snapshot.window_size}, Alpha: {snapshot.alpha:.2f}',
                  fontsize=12, fontweight='bold')
     ax.legend(loc='upper left')
 
@@ -62,24 +90,25 @@ def generate_3d_plot(smoother: InputSmoother, output_path: Optional[str] = None)
     plt.close()
 
 
-def generate_3d_surface_map(smoother: InputSmoother, output_path: Optional[str] = None) -> None:
-    raw_points = list(smoother.raw_trace)
-
-    if not raw_points or len(raw_points) < 10:
+def generate_3d_surface_map(snapshot: TraceSnapshot, output_path: Optional[str] = None) -> None:
+    if snapshot.sample_count() < 10:
         print("Dados insuficientes para gerar mapa de superfície.")
         return
 
     fig = plt.figure(figsize=(16, 12))
 
     cols = 2
-    rows = (len(FILTERS) + cols - 1) // cols
+    rows = (len(snapshot.descriptors) + cols - 1) // cols
 
-    for index, descriptor in enumerate(FILTERS, start=1):
+    for index, descriptor in enumerate(snapshot.descriptors, start=1):
         ax = fig.add_subplot(rows, cols, index, projection="3d")
-        trace = getattr(smoother, descriptor.trace_attr, None)
-        points = list(trace) if trace is not None else []
+        arrays = snapshot.traces.get(descriptor.id)
+        if arrays is not None:
+            xs, ys, _ = arrays
+        else:
+            xs, ys = np.empty(0), np.empty(0)
         title = f"{descriptor.name} Density Map"
-        _plot_density_map(ax, points, title, descriptor.density_cmap)
+        _plot_density_map(ax, xs, ys, title, descriptor.density_cmap)
 
     plt.tight_layout()
 
@@ -92,15 +121,30 @@ def generate_3d_surface_map(smoother: InputSmoother, output_path: Optional[str]
     plt.close()
 
 
-def _plot_density_map(ax, points, title, colormap):
-    if not points:
-        return
-    
-    x_coords = [p.x for p in points]
-    y_coords = [p.y for p in points]
-    
-    x_min, x_max = min(x_coords), max(x_coords)
-    y_min, y_max = min(y_coords), max(y_coords)
+def render_snapshot(kind: str, snapshot: TraceSnapshot, output_path: str) -> str:
+    plt.switch_backend("Agg")
+    renderers = {
+        "plot": generate_3d_plot,
+        "map": generate_3d_surface_map,
+    }
+    renderers[kind](snapshot, output_path)
+    return output_path
+
+
+def compute_density(
+    x_coords: np.ndarray,
+    y_coords: np.ndarray,
+    grid_size: int = DENSITY_GRID_SIZE,
+    bandwidth: Union[str, float] = DENSITY_BANDWIDTH,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if grid_size < 2:
+        raise ValueError("grid_size deve ser >= 2")
+
+    x_coords = np.asarray(x_coords, dtype=np.float64)
+    y_coords = np.asarray(y_coords, dtype=np.float64)
+
+    x_min, x_max = float(x_coords.min()), float(x_coords.max())
+    y_min, y_max = float(y_coords.min()), float(y_coords.max())
     
     x_range = x_max - x_min
     y_range = y_max - y_min
@@ -108,20 +152,69 @@ def _plot_density_map(ax, points, title, colormap):
     x_max += x_range * 0.1
     y_min -= y_range * 0.1
     y_max += y_range * 0.1
-    
-    grid_size = 30
+
+    sigma = _select_bandwidth(x_coords, y_coords, x_range, y_range, bandwidth)
+    if x_max <= x_min:
+        x_min, x_max = x_min - sigma, x_max + sigma
+    if y_max <= y_min:
+        y_min, y_max = y_min - sigma, y_max + sigma
+
+    x_bins = _density_bins(x_max - x_min, sigma, grid_size)
+    y_bins = _density_bins(y_max - y_min, sigma, grid_size)
+    counts, x_edges, y_edges = np.histogram2d(
+        x_coords,
+        y_coords,
+        bins=(x_bins, y_bins),
+        range=((x_min, x_max), (y_min, y_max)),
+    )
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+
     x_grid = np.linspace(x_min, x_max, grid_size)
     y_grid = np.linspace(y_min, y_max, grid_size)
-    X, Y = np.meshgrid(x_grid, y_grid)
-    
-    Z = np.zeros_like(X)
-    for px, py in zip(x_coords, y_coords):
-        dist_sq = (X - px)**2 + (Y - py)**2
-        sigma = min(x_range, y_range) / 10
-        Z += np.exp(-dist_sq / (2 * sigma**2))
-    
+    kernel_x = np.exp(-((x_grid[:, None] - x_centers[None, :]) ** 2) / (2 * sigma**2))
+    kernel_y = np.exp(-((y_grid[:, None] - y_centers[None, :]) ** 2) / (2 * sigma**2))
+
+    Z = kernel_y @ counts.T @ kernel_x.T
     if Z.max() > 0:
         Z = Z / Z.max()
+
+    X, Y = np.meshgrid(x_grid, y_grid)
+    return X, Y, Z
+
+
+def _select_bandwidth(
+    x_coords: np.ndarray,
+    y_coords: np.ndarray,
+    x_range: float,
+    y_range: float,
+    bandwidth: Union[str, float],
+) -> float:
+    if bandwidth == "range":
+        sigma = min(x_range, y_range) / 10
+    elif bandwidth == "scott":
+        spread = (float(np.std(x_coords)) + float(np.std(y_coords))) / 2
+        sigma = spread * len(x_coords) ** (-1 / 6)
+    elif isinstance(bandwidth, (int, float)):
+        sigma = float(bandwidth)
+    else:
+        raise ValueError(f"bandwidth desconhecido: {bandwidth}")
+
+    if sigma <= 0:
+        sigma = max(x_range, y_range) / 10 or 1.0
+    return sigma
+
+
+def _density_bins(span: float, sigma: float, grid_size: int) -> int:
+    per_sigma = int(np.ceil(DENSITY_BINS_PER_SIGMA * span / sigma))
+    return int(min(DENSITY_MAX_BINS, max(grid_size, per_sigma)))
+
+
+def _plot_density_map(ax, x_coords, y_coords, title, colormap):
+    if not len(x_coords):
+        return
+
+    X, Y, Z = compute_density(x_coords, y_coords)
     
     surf = ax.plot_surface(X, Y, Z, cmap=colormap, alpha=0.7, linewidth=0, antialiased=True)
     ax.set_xlabel('X Position')
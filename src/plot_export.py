@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .input_device import InputSmoother
+from .plot_3d import TraceSnapshot, render_snapshot
+
+
+@dataclass
+class ExportJob:
+    output_dir: str
+    started_at: float
+    futures: List[Future] = field(default_factory=list)
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for future in self.futures if future.done())
+
+    @property
+    def done(self) -> bool:
+        return self.completed == len(self.futures)
+
+
+class PlotExporter:
+    KINDS = ("plot", "map")
+
+    def __init__(
+        self,
+        output_dir: str,
+        max_workers: int,
+        status_duration_ms: int,
+    ):
+        self.output_dir = output_dir
+        self.max_workers = max(1, max_workers)
+        self.status_duration_ms = status_duration_ms
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: List[ExportJob] = []
+        self._last_finished: Optional[ExportJob] = None
+
+    def submit(self, smoother: InputSmoother) -> ExportJob:
+        snapshot = TraceSnapshot.from_smoother(smoother)
+        timestamp = int(time.time())
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        job = ExportJob(output_dir=self.output_dir, started_at=time.monotonic())
+        executor = self._ensure_executor()
+        for kind in self.KINDS:
+            path = os.path.join(self.output_dir, f"{kind}_3d_{timestamp}.png")
+            job.futures.append(executor.submit(render_snapshot, kind, snapshot, path))
+
+        self._jobs.append(job)
+        return job
+
+    def poll(self) -> None:
+        pending = []
+        for job in self._jobs:
+            if not job.done:
+                pending.append(job)
+                continue
+
+            job.finished_at = time.monotonic()
+            errors = [str(f.exception()) for f in job.futures if f.exception()]
+            if errors:
+                job.error = errors[0]
+                print(f"Erro ao gerar gráficos 3D: {job.error}")
+            else:
+                print(f"Gráficos 3D gerados em: {job.output_dir}/")
+            self._last_finished = job
+
+        self._jobs = pending
+
+    def status_line(self) -> Optional[str]:
+        if self._jobs:
+            job = self._jobs[0]
+            elapsed = time.monotonic() - job.started_at
+            total = sum(len(j.futures) for j in self._jobs)
+            completed = sum(j.completed for j in self._jobs)
+            return f"Exportando 3D: {completed}/{total} ({elapsed:.1f}s)"
+
+        job = self._last_finished
+        if job is None or job.finished_at is None:
+            return None
+        if (time.monotonic() - job.finished_at) * 1000 > self.status_duration_ms:
+            return None
+        if job.error:
+            return f"Erro ao exportar 3D: {job.error}"
+        return f"Gráficos 3D salvos em: {job.output_dir}/"
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._jobs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+        self.poll()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
@@ -0,0 +1,238 @@
+import csv
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+SUB_BUCKET_BITS = 7
+MAX_SHIFT = 30
+
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+_BUCKETS = (MAX_SHIFT + 2) * _HALF
+_MAX_VALUE_NS = (1 << (MAX_SHIFT + SUB_BUCKET_BITS)) - 1
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+CSV_FIELDS = (
+    "span", "count", "min_us", "mean_us", "p50_us", "p90_us", "p99_us", "p99.9_us",
+    "max_us", "total_ms", "over_budget",
+)
+
+
+class SpanHistogram:
+    def __init__(self) -> None:
+        self._counts = [0] * _BUCKETS
+        self.reset()
+
+    def reset(self) -> None:
+        self._counts[:] = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        value = min(max(duration_ns, 0), _MAX_VALUE_NS)
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift < 0:
+            shift = 0
+        self._counts[(shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)] += 1
+
+        if self.count == 0 or value < self.min_ns:
+            self.min_ns = value
+        if value > self.max_ns:
+            self.max_ns = value
+        self.count += 1
+        self.total_ns += value
+
+    def percentile(self, percentile: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = max(1, round(self.count * percentile / 100.0))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                low, high = _bucket_bounds(index)
+                return min(max((low + high) / 2.0, self.min_ns), self.max_ns)
+        return float(self.max_ns)
+
+    def count_above(self, threshold_ns: int) -> int:
+        if self.count == 0 or threshold_ns >= self.max_ns:
+            return 0
+        if threshold_ns < self.min_ns:
+            return self.count
+        above = 0.0
+        for index, count in enumerate(self._counts):
+            if not count:
+                continue
+            low, high = _bucket_bounds(index)
+            if low > threshold_ns:
+                above += count
+            elif high > threshold_ns:
+                # Bucket que contém o limite: parte proporcional, como se os
+                # valores fossem uniformes dentro dele.
+                above += count * (high - threshold_ns - 1) / (high - low)
+        return round(above)
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        return [
+            (_bucket_bounds(index)[1], count)
+            for index, count in enumerate(self._counts)
+            if count
+        ]
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    shift = max(0, (index >> (SUB_BUCKET_BITS - 1)) - 1)
+    sub = index - (shift << (SUB_BUCKET_BITS - 1))
+    return sub << shift, (sub + 1) << shift
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = self._profiler.begin()
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.end(self._name, self._start)
+
+
+class Profiler:
+    def __init__(
+        self,
+        budget_ms: float,
+        enabled: bool = False,
+        status_interval_ms: float = 250.0,
+    ):
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self._status_interval_ns = round(status_interval_ms * 1e6)
+        self._status: Optional[str] = None
+        self._status_t_ns = 0
+        self._histograms: Dict[str, SpanHistogram] = {}
+        self._started_at: Optional[float] = time.time() if enabled else None
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+            self._started_at = time.time()
+        return self.enabled
+
+    def reset(self) -> None:
+        for histogram in self._histograms.values():
+            histogram.reset()
+        self._status = None
+
+    def begin(self) -> int:
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def end(self, name: str, start_ns: int) -> None:
+        if start_ns and self.enabled:
+            self.record(name, time.perf_counter_ns() - start_ns)
+
+    def record(self, name: str, duration_ns: int) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = SpanHistogram()
+        histogram.record(duration_ns)
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def histogram(self, name: str) -> Optional[SpanHistogram]:
+        return self._histograms.get(name)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        budget_ns = round(self.budget_ms * 1e6)
+        summary = {}
+        for name in sorted(self._histograms):
+            histogram = self._histograms[name]
+            if histogram.count == 0:
+                continue
+            row = {
+                "count": histogram.count,
+                "min_us": round(histogram.min_ns / 1e3, 3),
+                "mean_us": round(histogram.mean_ns / 1e3, 3),
+            }
+            for percentile in PERCENTILES:
+                row[f"p{percentile:g}_us"] = round(histogram.percentile(percentile) / 1e3, 3)
+            row["max_us"] = round(histogram.max_ns / 1e3, 3)
+            row["total_ms"] = round(histogram.total_ns / 1e6, 3)
+            row["over_budget"] = histogram.count_above(budget_ns)
+            summary[name] = row
+        return summary
+
+    def status_line(self, total: str, stages: Sequence[str]) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now_ns = time.perf_counter_ns()
+        if self._status is not None and now_ns - self._status_t_ns < self._status_interval_ns:
+            return self._status
+
+        histogram = self._histograms.get(total)
+        if histogram is None or histogram.count == 0:
+            return "Perfil: ON"
+
+        line = (
+            f"Perfil: {total} p50/p99 {histogram.percentile(50.0) / 1e6:.1f}/"
+            f"{histogram.percentile(99.0) / 1e6:.1f}ms, "
+            f"{histogram.count_above(round(self.budget_ms * 1e6))} acima de "
+            f"{self.budget_ms:.1f}ms"
+        )
+        worst = max(
+            (
+                (self._histograms[name].percentile(99.0), name)
+                for name in stages
+                if name in self._histograms and self._histograms[name].count
+            ),
+            default=None,
+        )
+        if worst is not None:
+            line += f"; pior etapa {worst[1]} p99 {worst[0] / 1e6:.1f}ms"
+        self._status = line
+        self._status_t_ns = now_ns
+        return line
+
+    def export(self, directory: str) -> Tuple[str, str]:
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        json_path = os.path.join(directory, f"profile_{stamp}.json")
+        csv_path = os.path.join(directory, f"profile_{stamp}.csv")
+        summary = self.summary()
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "started_unix": self._started_at,
+                    "exported_unix": time.time(),
+                    "budget_ms": self.budget_ms,
+                    "spans": {
+                        name: dict(row, histogram_ns=self._histograms[name].buckets())
+                        for name, row in summary.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for name, row in summary.items():
+                writer.writerow([name] + [row[field] for field in CSV_FIELDS[1:]])
+        return json_path, csv_path
+
+
+NULL_PROFILER = Profiler(budget_ms=0.0)
@@ -0,0 +1,315 @@
+import math
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .filter_design import butterworth_highpass_sos, butterworth_sos
+from .filters import SampleRateEstimator, sos_filter_batch
+from .input_device import Point
+
+
+LAG_HIGHPASS_HZ = 0.2
+LAG_SETTLE_S = 2.0
+MIN_LAG_SPEED = 5.0
+
+Biquad = Tuple[float, float, float, float, float]
+
+
+def rms_error_px(reference: np.ndarray, filtered: np.ndarray) -> float:
+    if len(filtered) == 0:
+        return 0.0
+    error = filtered - reference
+    return math.sqrt(float(np.mean(np.sum(error * error, axis=1))))
+
+
+def max_error_px(reference: np.ndarray, filtered: np.ndarray) -> float:
+    if len(filtered) == 0:
+        return 0.0
+    return float(np.hypot(*(filtered - reference).T).max())
+
+
+def jitter_px(
+    reference: np.ndarray,
+    filtered: np.ndarray,
+    sample_rate_hz: float,
+    highpass_hz: float,
+) -> float:
+    if len(filtered) < 3:
+        return 0.0
+    residual = _highpass(filtered - reference, highpass_hz, sample_rate_hz)
+    return math.sqrt(float(np.mean(np.sum(residual * residual, axis=1))))
+
+
+def lag_ms(reference: np.ndarray, filtered: np.ndarray, sample_rate_hz: float) -> float:
+    if len(filtered) < 3:
+        return 0.0
+    velocity = _highpass(
+        np.diff(reference, axis=0) * sample_rate_hz, LAG_HIGHPASS_HZ, sample_rate_hz
+    )
+    error = _highpass((filtered - reference)[1:], LAG_HIGHPASS_HZ, sample_rate_hz)
+    settle = min(round(LAG_SETTLE_S * sample_rate_hz), len(velocity) // 2)
+    velocity, error = velocity[settle:], error[settle:]
+    energy = float(np.sum(velocity * velocity))
+    if energy <= MIN_LAG_SPEED ** 2 * len(velocity):
+        return 0.0
+    return -1e3 * float(np.sum(error * velocity)) / energy
+
+
+def sample_period_ms(timestamps_ns: np.ndarray, fallback_rate_hz: float) -> float:
+    if len(timestamps_ns) < 2:
+        return 1000.0 / fallback_rate_hz
+    period_ns = float(np.median(np.diff(np.asarray(timestamps_ns, dtype=np.int64))))
+    return period_ns / 1e6 if period_ns > 0 else 1000.0 / fallback_rate_hz
+
+
+def _highpass(values: np.ndarray, cutoff_hz: float, sample_rate_hz: float) -> np.ndarray:
+    sos = butterworth_highpass_sos(min(cutoff_hz, 0.45 * sample_rate_hz), sample_rate_hz)
+    return sos_filter_batch(values - values[0], sos)
+
+
+class QualityMetrics(NamedTuple):
+    jitter_px: float
+    lag_ms: float
+    overshoot_px: float
+    tremor_db: float
+
+
+class _RowQuality:
+    __slots__ = (
+        "jitter_state", "lag_state", "band_state", "jitter_energy", "lag_energy",
+        "band_energy", "error_level", "error_trend", "overshoot",
+    )
+
+    def __init__(self, error: Tuple[float, float]):
+        self.jitter_state = [0.0] * 4
+        self.lag_state = [0.0] * 4
+        self.band_state = [0.0] * 8
+        self.jitter_energy = 0.0
+        self.lag_energy = 0.0
+        self.band_energy = 0.0
+        self.error_level = list(error)
+        self.error_trend = [0.0, 0.0]
+        self.overshoot = 0.0
+
+
+class FilterQualityTracker:
+    DIRECTION_TIME_S = 0.05
+    MIN_DIRECTION_SPEED = 1e-3
+
+    def __init__(
+        self,
+        filter_ids: Sequence[str],
+        sample_rate_hz: float,
+        window_s: float,
+        jitter_highpass_hz: float,
+        tremor_band_hz: Tuple[float, float],
+        summary_interval_ms: float,
+    ):
+        if sample_rate_hz <= 0.0:
+            raise ValueError("sample_rate_hz deve ser > 0")
+        if window_s <= 0.0:
+            raise ValueError("window_s deve ser > 0")
+
+        self._filter_ids = tuple(filter_ids)
+        self._window_s = window_s
+        self._jitter_highpass_hz = jitter_highpass_hz
+        self._tremor_band_hz = tremor_band_hz
+        self._summary_interval_ns = round(summary_interval_ms * 1e6)
+        self._rate = SampleRateEstimator(sample_rate_hz)
+        self._configure(sample_rate_hz)
+        self.reset()
+
+    def reset(self) -> None:
+        self._rate.reset()
+        self._count = 0
+        self._last_t_ns: Optional[int] = None
+        self._period_s = 1.0 / self._rate.design_hz
+        self._weight = 0.0
+        self._reference = (0.0, 0.0)
+        self._velocity = (0.0, 0.0)
+        self._direction = (0.0, 0.0)
+        self._velocity_state = [0.0] * 4
+        self._velocity_energy = 0.0
+        self._rows: List[_RowQuality] = []
+        self._summary: Dict[str, QualityMetrics] = {}
+        self._summary_t_ns: Optional[int] = None
+
+    def update(
+        self,
+        t_ns: int,
+        reference: Tuple[float, float],
+        sample: Tuple[float, float],
+        points: Mapping[str, Optional[Point]],
+    ) -> None:
+        outputs = [sample]
+        for filter_id in self._filter_ids:
+            point = points.get(filter_id)
+            outputs.append(reference if point is None else (point.x, point.y))
+
+        if self._rate.update(t_ns):
+            self._configure(self._rate.design_hz)
+        if self._last_t_ns is not None and t_ns > self._last_t_ns:
+            dt_s = (t_ns - self._last_t_ns) * 1e-9
+            self._period_s += 0.05 * (dt_s - self._period_s)
+        else:
+            dt_s = self._period_s
+        self._last_t_ns = t_ns
+
+        reference_x, reference_y = reference
+        if self._count == 0:
+            self._reference = reference
+            self._rows = [
+                self._seed_row(output, (output[0] - reference_x, output[1] - reference_y))
+                for output in outputs
+            ]
+        self._count += 1
+
+        decay = math.exp(-dt_s / self._window_s)
+        gain = 1.0 - decay
+        self._weight = decay * self._weight + gain
+
+        previous_x, previous_y = self._reference
+        self._reference = reference
+        velocity_x = (reference_x - previous_x) / dt_s
+        velocity_y = (reference_y - previous_y) / dt_s
+
+        lag_biquad = self._lag_biquad
+        state = self._velocity_state
+        if self._count == 2:
+            _seed_highpass(lag_biquad, state, (velocity_x, velocity_y))
+        slow_vx = _biquad_step(lag_biquad, state, 0, velocity_x)
+        slow_vy = _biquad_step(lag_biquad, state, 2, velocity_y)
+        self._velocity_energy = decay * self._velocity_energy + gain * (
+            slow_vx * slow_vx + slow_vy * slow_vy
+        )
+
+        direction_gain = 1.0 - math.exp(-dt_s / self.DIRECTION_TIME_S)
+        smooth_x, smooth_y = self._velocity
+        smooth_x += direction_gain * (velocity_x - smooth_x)
+        smooth_y += direction_gain * (velocity_y - smooth_y)
+        self._velocity = (smooth_x, smooth_y)
+        speed = math.hypot(smooth_x, smooth_y)
+        if speed > self.MIN_DIRECTION_SPEED:
+            self._direction = (smooth_x / speed, smooth_y / speed)
+        direction_x, direction_y = self._direction
+
+        level_gain = 1.0 - decay * decay
+        trend_gain = gain * gain / dt_s
+        jitter_biquad = self._jitter_biquad
+        band_biquads = self._band_biquads
+
+        for row, (output_x, output_y) in zip(self._rows, outputs):
+            error_x = output_x - reference_x
+            error_y = output_y - reference_y
+
+            state = row.jitter_state
+            high_x = _biquad_step(jitter_biquad, state, 0, error_x)
+            high_y = _biquad_step(jitter_biquad, state, 2, error_y)
+            row.jitter_energy = decay * row.jitter_energy + gain * (
+                high_x * high_x + high_y * high_y
+            )
+
+            # Atraso puro: erro ≈ -atraso * velocidade. O passa-altas tira o
+            # drift (rampa) dos dois lados sem mudar a razão entre eles.
+            state = row.lag_state
+            slow_x = _biquad_step(lag_biquad, state, 0, error_x)
+            slow_y = _biquad_step(lag_biquad, state, 2, error_y)
+            row.lag_energy = decay * row.lag_energy + gain * (
+                slow_x * slow_vx + slow_y * slow_vy
+            )
+
+            if band_biquads is not None:
+                highpass, lowpass = band_biquads
+                state = row.band_state
+                band_x = _biquad_step(lowpass, state, 4, _biquad_step(highpass, state, 0, output_x))
+                band_y = _biquad_step(lowpass, state, 6, _biquad_step(highpass, state, 2, output_y))
+                row.band_energy = decay * row.band_energy + gain * (
+                    band_x * band_x + band_y * band_y
+                )
+
+            level, trend = row.error_level, row.error_trend
+            predicted_x = level[0] + trend[0] * dt_s
+            predicted_y = level[1] + trend[1] * dt_s
+            innovation_x = error_x - predicted_x
+            innovation_y = error_y - predicted_y
+            level[0] = predicted_x + level_gain * innovation_x
+            level[1] = predicted_y + level_gain * innovation_y
+            trend[0] += trend_gain * innovation_x
+            trend[1] += trend_gain * innovation_y
+            forward = innovation_x * direction_x + innovation_y * direction_y
+            row.overshoot = max(decay * row.overshoot, forward)
+
+    def summary(self) -> Dict[str, QualityMetrics]:
+        if self._count < 3:
+            return {}
+        if (
+            self._summary_t_ns is not None
+            and self._last_t_ns - self._summary_t_ns < self._summary_interval_ns
+        ):
+            return self._summary
+
+        weight = self._weight
+        velocity_energy = self._velocity_energy
+        lag_defined = velocity_energy > MIN_LAG_SPEED ** 2 * weight
+        input_power = self._rows[0].band_energy
+
+        summary = {}
+        for row, filter_id in zip(self._rows[1:], self._filter_ids):
+            if self._band_biquads is None or input_power <= 0.0 or row.band_energy <= 0.0:
+                tremor_db = 0.0
+            else:
+                tremor_db = 10.0 * math.log10(row.band_energy / input_power)
+            summary[filter_id] = QualityMetrics(
+                jitter_px=math.sqrt(row.jitter_energy / weight),
+                lag_ms=-1e3 * row.lag_energy / velocity_energy if lag_defined else 0.0,
+                overshoot_px=row.overshoot,
+                tremor_db=tremor_db,
+            )
+        self._summary = summary
+        self._summary_t_ns = self._last_t_ns
+        return summary
+
+    def _configure(self, sample_rate_hz: float) -> None:
+        self._jitter_biquad = _biquad(butterworth_highpass_sos(
+            min(self._jitter_highpass_hz, 0.45 * sample_rate_hz), sample_rate_hz
+        ))
+        self._lag_biquad = _biquad(butterworth_highpass_sos(LAG_HIGHPASS_HZ, sample_rate_hz))
+
+        low_hz, high_hz = self._tremor_band_hz
+        if high_hz < sample_rate_hz / 2.0:
+            self._band_biquads: Optional[Tuple[Biquad, Biquad]] = (
+                _biquad(butterworth_highpass_sos(low_hz, sample_rate_hz)),
+                _biquad(butterworth_sos(2, high_hz, sample_rate_hz)),
+            )
+        else:
+            self._band_biquads = None
+
+    def _seed_row(
+        self, output: Tuple[float, float], error: Tuple[float, float]
+    ) -> _RowQuality:
+        row = _RowQuality(error)
+        _seed_highpass(self._jitter_biquad, row.jitter_state, error)
+        _seed_highpass(self._lag_biquad, row.lag_state, error)
+        if self._band_biquads is not None:
+            _seed_highpass(self._band_biquads[0], row.band_state, output)
+        return row
+
+
+def _biquad(sos: np.ndarray) -> Biquad:
+    b0, b1, b2, _, a1, a2 = sos[0].tolist()
+    return b0, b1, b2, a1, a2
+
+
+def _biquad_step(biquad: Biquad, state: List[float], offset: int, x: float) -> float:
+    b0, b1, b2, a1, a2 = biquad
+    y = b0 * x + state[offset]
+    state[offset] = b1 * x - a1 * y + state[offset + 1]
+    state[offset + 1] = b2 * x - a2 * y
+    return y
+
+
+def _seed_highpass(biquad: Biquad, state: List[float], values: Tuple[float, float]) -> None:
+    b0, _, b2, _, _ = biquad
+    for axis, value in enumerate(values):
+        state[2 * axis] = -b0 * value
+        state[2 * axis + 1] = b2 * value
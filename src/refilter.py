@@ -0,0 +1,237 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import (
+    ALPHA_MAX,
+    ALPHA_MIN,
+    BUTTERWORTH_CUTOFF_HZ,
+    CUTOFF_MAX_HZ,
+    CUTOFF_MIN_HZ,
+    DEFAULT_IIR_ALPHA,
+    DEFAULT_MOVING_AVERAGE_WINDOW,
+    DRIFT_CORRECTION_WINDOW_S,
+    FILTER_BANK_SAMPLE_RATE_HZ,
+    MAX_BUFFER,
+    MOVING_AVERAGE_MIN,
+    QUALITY_JITTER_HIGHPASS_HZ,
+)
+from .filter_registry import FILTER_SPECS
+from .input_device import InputSmoother
+from .quality import jitter_px, lag_ms, max_error_px, rms_error_px, sample_period_ms
+from .session import SESSION_SUFFIX, load_session
+
+
+@dataclass(frozen=True)
+class RefilterSettings:
+    window_size: int
+    alpha: float
+    cutoff_hz: float
+    drift_window_s: float
+
+    def build_smoother(self, sample_rate_hz: float) -> InputSmoother:
+        return InputSmoother(
+            buffer_size=MAX_BUFFER,
+            window_size=self.window_size,
+            alpha=self.alpha,
+            min_window=MOVING_AVERAGE_MIN,
+            min_alpha=ALPHA_MIN,
+            max_alpha=ALPHA_MAX,
+            drift_window_s=self.drift_window_s,
+            cutoff_hz=self.cutoff_hz,
+            min_cutoff_hz=CUTOFF_MIN_HZ,
+            max_cutoff_hz=CUTOFF_MAX_HZ,
+            sample_rate_hz=sample_rate_hz,
+        )
+
+
+@dataclass
+class FilterMetrics:
+    rms_error_px: float
+    max_error_px: float
+    jitter_px: float
+    lag_ms: float
+
+
+@dataclass
+class SessionSummary:
+    session: str
+    output: str
+    samples: int
+    duration_s: float
+    sample_rate_hz: float
+    elapsed_ms: float
+    metrics: Dict[str, FilterMetrics]
+
+
+def filter_metrics(
+    reference: np.ndarray,
+    filtered: np.ndarray,
+    period_ms: float,
+) -> FilterMetrics:
+    sample_rate_hz = 1000.0 / period_ms
+    return FilterMetrics(
+        rms_error_px=rms_error_px(reference, filtered),
+        max_error_px=max_error_px(reference, filtered),
+        jitter_px=jitter_px(
+            reference, filtered, sample_rate_hz, QUALITY_JITTER_HIGHPASS_HZ
+        ),
+        lag_ms=lag_ms(reference, filtered, sample_rate_hz),
+    )
+
+
+def refilter_session(
+    path: str,
+    output_dir: str,
+    settings: RefilterSettings,
+) -> SessionSummary:
+    start_ns = time.perf_counter_ns()
+    session = load_session(path)
+    samples = session.samples()
+    reference = session.raw
+    timestamps = np.array(session.timestamps)
+    header_rate_hz = float(session.header.get("sample_rate_hz") or FILTER_BANK_SAMPLE_RATE_HZ)
+    period_ms = sample_period_ms(timestamps, header_rate_hz)
+    sample_rate_hz = 1000.0 / period_ms
+    outputs = session.filter_batch(settings.build_smoother(sample_rate_hz))
+
+    series = {
+        filter_id: filtered for filter_id, filtered in outputs.items()
+        if filtered is not None
+    }
+    name = os.path.splitext(os.path.basename(path))[0]
+    output_path = os.path.join(output_dir, f"{name}.npz")
+    np.savez(
+        output_path,
+        t_ns=timestamps,
+        input=samples,
+        reference=reference,
+        **series,
+    )
+
+    duration_s = (timestamps[-1] - timestamps[0]) * 1e-9 if len(timestamps) > 1 else 0.0
+    return SessionSummary(
+        session=path,
+        output=output_path,
+        samples=len(session),
+        duration_s=duration_s,
+        sample_rate_hz=sample_rate_hz,
+        elapsed_ms=(time.perf_counter_ns() - start_ns) / 1e6,
+        metrics={
+            filter_id: filter_metrics(reference, filtered, period_ms)
+            for filter_id, filtered in series.items()
+        },
+    )
+
+
+def find_sessions(directory: str) -> List[str]:
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(SESSION_SUFFIX)
+    )
+
+
+def refilter_sessions(
+    paths: Sequence[str],
+    output_dir: str,
+    settings: RefilterSettings,
+    max_workers: Optional[int] = None,
+) -> List[SessionSummary]:
+    os.makedirs(output_dir, exist_ok=True)
+    summaries: List[SessionSummary] = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = {
+            executor.submit(refilter_session, path, output_dir, settings): path
+            for path in paths
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                summaries.append(future.result())
+            except Exception as exc:
+                print(f"Erro ao refiltrar {path}: {exc}")
+                continue
+            print(f"[{done}/{len(paths)}] {path}")
+    summaries.sort(key=lambda summary: summary.session)
+    return summaries
+
+
+def format_table(summaries: Sequence[SessionSummary]) -> str:
+    header = (
+        f"{'filter':<12} {'sessions':>8} {'rms err px':>11} "
+        f"{'p95 rms err':>12} {'max err px':>11} {'jitter px':>10} {'lag ms':>8}"
+    )
+    rows = [header, "-" * len(header)]
+    for spec in FILTER_SPECS:
+        metrics = [
+            summary.metrics[spec.id]
+            for summary in summaries
+            if spec.id in summary.metrics
+        ]
+        if not metrics:
+            continue
+        rms_errors = [m.rms_error_px for m in metrics]
+        rows.append(
+            f"{spec.id:<12} {len(metrics):>8} {np.mean(rms_errors):>11.2f} "
+            f"{np.percentile(rms_errors, 95):>12.2f} "
+            f"{max(m.max_error_px for m in metrics):>11.2f} "
+            f"{np.mean([m.jitter_px for m in metrics]):>10.3f} "
+            f"{np.mean([m.lag_ms for m in metrics]):>8.1f}"
+        )
+    return "\n".join(rows)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refiltra sessões gravadas em paralelo, sem janela.",
+    )
+    parser.add_argument("sessions", help="pasta com arquivos de sessão (.pds)")
+    parser.add_argument("--output", default="refiltered")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=DEFAULT_MOVING_AVERAGE_WINDOW)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_IIR_ALPHA)
+    parser.add_argument("--cutoff", type=float, default=BUTTERWORTH_CUTOFF_HZ)
+    parser.add_argument("--drift-window", type=float, default=DRIFT_CORRECTION_WINDOW_S)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    paths = find_sessions(args.sessions)
+    if not paths:
+        print(f"Nenhuma sessão encontrada em: {args.sessions}")
+        return
+
+    settings = RefilterSettings(args.window, args.alpha, args.cutoff, args.drift_window)
+    start = time.perf_counter()
+    summaries = refilter_sessions(paths, args.output, settings, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(summaries))
+    summary_path = os.path.join(args.output, "summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"settings": asdict(settings), "sessions": [asdict(s) for s in summaries]},
+            f,
+            indent=2,
+        )
+    print(
+        f"{len(summaries)}/{len(paths)} sessões refiltradas em {elapsed:.1f}s; "
+        f"resultados em: {args.output}/"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .filters import SampleRateEstimator
+from .input_device import InputSmoother
+from .tremor_simulator import DriftSimulator, TremorSimulator
+
+
+SESSION_MAGIC = b"PDSSESS\0"
+SESSION_VERSION = 2
+SESSION_SUFFIX = ".pds"
+
+_PREAMBLE = struct.Struct("<8sHI")
+_ALIGNMENT = 8
+_HEADER_RESERVE = 64
+_MAX_GAP_NS = round(SampleRateEstimator.MAX_GAP_S * 1e9)
+
+RECORD_DTYPE = np.dtype([
+    ("t_ns", "<i8"),
+    ("raw_x", "<f8"),
+    ("raw_y", "<f8"),
+    ("input_x", "<f8"),
+    ("input_y", "<f8"),
+    ("tremor_x", "<f8"),
+    ("tremor_y", "<f8"),
+    ("drift_x", "<f8"),
+    ("drift_y", "<f8"),
+])
+
+
+def session_header(
+    smoother: InputSmoother,
+    tremor_sim: TremorSimulator,
+    drift_sim: DriftSimulator,
+    input_mode: str,
+    sample_rate_hz: float,
+) -> Dict[str, Any]:
+    return {
+        "created_unix": time.time(),
+        "input_mode": input_mode,
+        "sample_rate_hz": sample_rate_hz,
+        "window_size": smoother.window_size,
+        "alpha": smoother.alpha,
+        "cutoff_hz": smoother.cutoff_hz,
+        "filters": {
+            filter_id: stream.params for filter_id, stream in smoother.filters.items()
+        },
+        "tremor": {
+            "enabled": tremor_sim.enabled,
+            "intensity": tremor_sim.intensity,
+            "frequency": tremor_sim.frequency,
+            "seed": tremor_sim.seed,
+        },
+        "drift": {
+            "enabled": drift_sim.enabled,
+            "pixels_per_second": drift_sim.pixels_per_second,
+            "direction_deg": drift_sim.direction_deg,
+        },
+    }
+
+
+class SessionWriter:
+    def __init__(self, path: str, header: Dict[str, Any], buffer_records: int = 4096):
+        if buffer_records <= 0:
+            raise ValueError("buffer_records deve ser > 0")
+
+        self.path = path
+        self.header = dict(header, record_dtype=RECORD_DTYPE.descr)
+        self._buffer = np.zeros(buffer_records, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._written = 0
+        self._last_t_ns: Optional[int] = None
+        self._interval_count = 0
+        self._interval_total_ns = 0
+        self._header_size = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def append(
+        self,
+        t_ns: int,
+        raw_x: float,
+        raw_y: float,
+        input_x: float,
+        input_y: float,
+        tremor_x: float,
+        tremor_y: float,
+        drift_x: float,
+        drift_y: float,
+    ) -> None:
+        self._buffer[self._pending] = (
+            t_ns, raw_x, raw_y, input_x, input_y, tremor_x, tremor_y, drift_x, drift_y
+        )
+        self._pending += 1
+        if self._last_t_ns is not None and 0 < t_ns - self._last_t_ns <= _MAX_GAP_NS:
+            self._interval_count += 1
+            self._interval_total_ns += t_ns - self._last_t_ns
+        self._last_t_ns = t_ns
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._written += self._pending
+            self._pending = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        if self._interval_count:
+            self.header["sample_rate_hz"] = (
+                self._interval_count * 1e9 / self._interval_total_ns
+            )
+            self._file.seek(0)
+            self._write_header()
+        self._file.close()
+
+    @property
+    def count(self) -> int:
+        return self._written + self._pending
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def _write_header(self) -> None:
+        payload = json.dumps(self.header).encode("utf-8")
+        if not self._header_size:
+            used = _PREAMBLE.size + len(payload) + _HEADER_RESERVE
+            self._header_size = len(payload) + _HEADER_RESERVE + (-used % _ALIGNMENT)
+        elif len(payload) > self._header_size:
+            return
+        payload += b" " * (self._header_size - len(payload))
+        self._file.write(_PREAMBLE.pack(SESSION_MAGIC, SESSION_VERSION, len(payload)))
+        self._file.write(payload)
+
+    def __enter__(self) -> "SessionWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class Session:
+    path: str
+    header: Dict[str, Any]
+    records: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.records["t_ns"]
+
+    @property
+    def raw(self) -> np.ndarray:
+        return _columns(self.records, "raw_x", "raw_y")
+
+    @property
+    def tremor(self) -> np.ndarray:
+        return _columns(self.records, "tremor_x", "tremor_y")
+
+    @property
+    def drift(self) -> np.ndarray:
+        return _columns(self.records, "drift_x", "drift_y")
+
+    def samples(self) -> np.ndarray:
+        return _columns(self.records, "input_x", "input_y")
+
+    def filter_batch(self, smoother: InputSmoother) -> Dict[str, Optional[np.ndarray]]:
+        return smoother.process_batch(self.samples(), self.timestamps)
+
+    def replay(self, smoother: InputSmoother, store_history: bool = True) -> None:
+        samples = self.samples().tolist()
+        for (x, y), t_ns in zip(samples, self.timestamps.tolist()):
+            smoother.add_sample(x, y, store_history=store_history, timestamp_ns=t_ns)
+
+
+def load_session(path: str) -> Session:
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"sessão truncada: {path}")
+        magic, version, header_size = _PREAMBLE.unpack(preamble)
+        if magic != SESSION_MAGIC:
+            raise ValueError(f"arquivo não é uma sessão gravada: {path}")
+        if version != SESSION_VERSION:
+            raise ValueError(f"versão de sessão não suportada: {version}")
+        header = json.loads(f.read(header_size).decode("utf-8"))
+
+    offset = _PREAMBLE.size + header_size
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+    if count <= 0:
+        records = np.zeros(0, dtype=RECORD_DTYPE)
+    else:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=offset, shape=(count,))
+    return Session(path, header, records)
+
+
+def session_path(directory: str) -> str:
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(directory, f"session_{stamp}{SESSION_SUFFIX}")
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"session_{stamp}_{suffix}{SESSION_SUFFIX}")
+        suffix += 1
+    return path
+
+
+def _columns(records: np.ndarray, x_field: str, y_field: str) -> np.ndarray:
+    return np.column_stack((records[x_field], records[y_field])).astype(np.float64)
@@ -0,0 +1,560 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import (
+    BUTTERWORTH_CUTOFF_HZ,
+    DEFAULT_IIR_ALPHA,
+    DEFAULT_MOVING_AVERAGE_WINDOW,
+    DRIFT_CORRECTION_WINDOW_S,
+    DRIFT_DIRECTION_DEG,
+    DRIFT_PIXELS_PER_SECOND,
+    FILTER_BANK_SAMPLE_RATE_HZ,
+    MAX_BUFFER,
+    QUALITY_JITTER_HIGHPASS_HZ,
+    TREMOR_FREQUENCY,
+    TREMOR_INTENSITY,
+)
+from .filter_registry import FILTER_SPECS_BY_ID
+from .filters import Filter, FilterSettings, SampleBatch
+from .quality import jitter_px, lag_ms, rms_error_px, sample_period_ms
+from .refilter import find_sessions
+from .session import load_session
+from .trajectories import TRAJECTORIES
+from .tremor_simulator import DriftSimulator, TremorSimulator
+
+
+DEFAULT_SPACE: Dict[str, Dict[str, str]] = {
+    "ma": {"window_size": "2:40:2"},
+    "exp": {"alpha": "0.05:0.8:0.05"},
+    "one_euro": {"min_cutoff": "0.25,0.5,1,2,4", "beta": "0,0.001,0.003,0.007,0.02,0.05"},
+    "kalman": {"process_noise": "1e4,1e5,1e6,1e7", "measurement_noise": "4,9,25,64,144"},
+    "butterworth": {"cutoff_hz": "1:12:1", "order": "2,3,4"},
+    "savgol": {"window_length": "7:31:4", "polyorder": "2,3"},
+}
+
+Candidate = Tuple[str, Tuple[Tuple[str, float], ...]]
+
+SURROGATE_POOL = 512
+SURROGATE_LENGTH_SCALE = 0.25
+SURROGATE_NOISE = 1e-4
+CHEBYSHEV_RHO = 0.05
+
+
+@dataclass(frozen=True)
+class ParamRange:
+    filter_id: str
+    name: str
+    values: Tuple[float, ...] = ()
+    low: float = 0.0
+    high: float = 0.0
+    integer: bool = False
+
+    def grid(self) -> Tuple[float, ...]:
+        if not self.values:
+            raise ValueError(
+                f"{self.filter_id}.{self.name}: informe valores ou um passo para a grade"
+            )
+        return self.values
+
+    def sample(self, rng: np.random.Generator) -> float:
+        if self.values:
+            return self.values[int(rng.integers(len(self.values)))]
+        if self.integer:
+            return float(rng.integers(int(self.low), int(self.high) + 1))
+        return float(rng.uniform(self.low, self.high))
+
+    def encode(self, value: float) -> float:
+        if self.values:
+            return self.values.index(value) / max(1, len(self.values) - 1)
+        if self.high <= self.low:
+            return 0.0
+        return (value - self.low) / (self.high - self.low)
+
+
+@dataclass(frozen=True)
+class SharedInputs:
+    name: str
+    total: int
+    bounds: Tuple[Tuple[int, int], ...]
+    periods_ms: Tuple[float, ...]
+
+
+@dataclass
+class SweepResult:
+    filter_id: str
+    params: Dict[str, float]
+    jitter_px: float
+    lag_ms: float
+    rms_error_px: float
+    front: int = 0
+
+
+def parse_range(spec: str) -> ParamRange:
+    key, sep, values = spec.partition("=")
+    filter_id, dot, name = key.partition(".")
+    if not sep or not dot or not values:
+        raise argparse.ArgumentTypeError(f"parâmetro inválido: {spec} (use filtro.nome=valores)")
+    if filter_id not in FILTER_SPECS_BY_ID:
+        raise argparse.ArgumentTypeError(f"filtro desconhecido: {filter_id}")
+    if name not in build_filter((filter_id, ()), FILTER_BANK_SAMPLE_RATE_HZ).params:
+        raise argparse.ArgumentTypeError(f"parâmetro desconhecido: {filter_id}.{name}")
+
+    integer = not any(c in values for c in ".eE")
+    if ":" not in values:
+        items = tuple(float(item) for item in values.split(",") if item)
+        return ParamRange(filter_id, name, items, integer=integer)
+
+    bounds = [float(item) for item in values.split(":")]
+    if len(bounds) == 2:
+        return ParamRange(filter_id, name, low=bounds[0], high=bounds[1], integer=integer)
+    if len(bounds) != 3 or bounds[2] <= 0:
+        raise argparse.ArgumentTypeError(f"intervalo inválido: {values} (use min:max[:passo])")
+    low, high, step = bounds
+    items = tuple(float(v) for v in np.arange(low, high + step / 2, step).round(10))
+    return ParamRange(filter_id, name, items, low, high, integer)
+
+
+def default_ranges() -> List[ParamRange]:
+    return [
+        parse_range(f"{filter_id}.{name}={values}")
+        for filter_id, params in DEFAULT_SPACE.items()
+        for name, values in params.items()
+    ]
+
+
+def grid_candidates(ranges: Sequence[ParamRange]) -> List[Candidate]:
+    candidates = []
+    for filter_id, group in _by_filter(ranges).items():
+        names = [r.name for r in group]
+        for values in itertools.product(*(r.grid() for r in group)):
+            candidates.append((filter_id, tuple(zip(names, values))))
+    return candidates
+
+
+def random_candidates(
+    ranges: Sequence[ParamRange],
+    trials: int,
+    rng: np.random.Generator,
+) -> List[Candidate]:
+    candidates = []
+    for filter_id, group in _by_filter(ranges).items():
+        seen = set()
+        for _ in range(trials):
+            params = tuple((r.name, r.sample(rng)) for r in group)
+            if params not in seen:
+                seen.add(params)
+                candidates.append((filter_id, params))
+    return candidates
+
+
+def _by_filter(ranges: Sequence[ParamRange]) -> Dict[str, List[ParamRange]]:
+    groups: Dict[str, List[ParamRange]] = {}
+    for param_range in ranges:
+        groups.setdefault(param_range.filter_id, []).append(param_range)
+    return groups
+
+
+def simulate_input(
+    trajectory: np.ndarray,
+    sample_rate_hz: float,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    tremor_sim = TremorSimulator(True, TREMOR_INTENSITY, TREMOR_FREQUENCY, seed=seed)
+    drift_sim = DriftSimulator(True, DRIFT_PIXELS_PER_SECOND, DRIFT_DIRECTION_DEG)
+    period_ns = 1e9 / sample_rate_hz
+    timestamps = np.round(np.arange(len(trajectory)) * period_ns).astype(np.int64)
+    samples = np.empty_like(trajectory)
+    for i, ((x, y), t_ns) in enumerate(zip(trajectory.tolist(), timestamps.tolist())):
+        x, y = tremor_sim.apply_tremor(x, y, t_ns)
+        samples[i] = drift_sim.apply_drift(x, y, t_ns)
+    return samples, timestamps
+
+
+def synthetic_inputs(
+    trajectories: Sequence[str],
+    count: int,
+    seeds: Sequence[int],
+    sample_rate_hz: float,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    inputs = []
+    for name, seed in itertools.product(trajectories, seeds):
+        reference = TRAJECTORIES[name](count, np.random.default_rng(seed))
+        samples, timestamps = simulate_input(reference, sample_rate_hz, seed)
+        inputs.append((samples, reference, timestamps))
+    return inputs
+
+
+def session_inputs(directory: str) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    inputs = []
+    for path in find_sessions(directory):
+        session = load_session(path)
+        if len(session) >= 3:
+            inputs.append((session.samples(), session.raw, np.array(session.timestamps)))
+    return inputs
+
+
+def share_inputs(
+    inputs: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+) -> Tuple[SharedMemory, SharedInputs]:
+    total = sum(len(samples) for samples, _, _ in inputs)
+    memory = SharedMemory(create=True, size=max(1, total * 5 * 8))
+    values, stamps = _views(memory, total)
+
+    bounds = []
+    start = 0
+    for samples, reference, timestamps in inputs:
+        end = start + len(samples)
+        values[start:end, :2] = samples
+        values[start:end, 2:] = reference
+        stamps[start:end] = timestamps
+        bounds.append((start, end))
+        start = end
+
+    periods = tuple(
+        sample_period_ms(timestamps, FILTER_BANK_SAMPLE_RATE_HZ) for _, _, timestamps in inputs
+    )
+    return memory, SharedInputs(memory.name, total, tuple(bounds), periods)
+
+
+def _views(memory: SharedMemory, total: int) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.ndarray((total, 4), dtype=np.float64, buffer=memory.buf)
+    stamps = np.ndarray((total,), dtype=np.int64, buffer=memory.buf, offset=values.nbytes)
+    return values, stamps
+
+
+_worker_memory: Optional[SharedMemory] = None
+_worker_inputs: List[Tuple[np.ndarray, np.ndarray, np.ndarray, float]] = []
+
+
+def _attach_inputs(shared: SharedInputs) -> None:
+    global _worker_memory, _worker_inputs
+    _worker_memory = SharedMemory(name=shared.name)
+    values, stamps = _views(_worker_memory, shared.total)
+    _worker_inputs = [
+        (values[start:end, :2], values[start:end, 2:], stamps[start:end], period_ms)
+        for (start, end), period_ms in zip(shared.bounds, shared.periods_ms)
+    ]
+
+
+def build_filter(candidate: Candidate, sample_rate_hz: float) -> Filter:
+    filter_id, params = candidate
+    settings = FilterSettings(
+        MAX_BUFFER,
+        DEFAULT_MOVING_AVERAGE_WINDOW,
+        DEFAULT_IIR_ALPHA,
+        DRIFT_CORRECTION_WINDOW_S,
+        BUTTERWORTH_CUTOFF_HZ,
+        sample_rate_hz,
+    )
+    stream = FILTER_SPECS_BY_ID[filter_id].factory(settings)
+    for name, value in params:
+        stream.set_param(name, value)
+    return stream
+
+
+def evaluate_candidate(candidate: Candidate) -> Optional[SweepResult]:
+    jitters, lags, errors = [], [], []
+    for samples, reference, timestamps, period_ms in _worker_inputs:
+        sample_rate_hz = 1000.0 / period_ms
+        try:
+            stream = build_filter(candidate, sample_rate_hz)
+        except (KeyError, ValueError):
+            return None
+        filtered = stream.process_batch(SampleBatch(samples, timestamps))
+        if filtered is None:
+            continue
+        jitters.append(jitter_px(
+            reference, filtered, sample_rate_hz, QUALITY_JITTER_HIGHPASS_HZ
+        ))
+        lags.append(lag_ms(reference, filtered, sample_rate_hz))
+        errors.append(rms_error_px(reference, filtered))
+    if not jitters:
+        return None
+
+    filter_id, params = candidate
+    return SweepResult(
+        filter_id=filter_id,
+        params=dict(params),
+        jitter_px=float(np.mean(jitters)),
+        lag_ms=float(np.mean(lags)),
+        rms_error_px=float(np.mean(errors)),
+    )
+
+
+@contextmanager
+def _evaluation_pool(
+    inputs: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    max_workers: Optional[int],
+) -> Iterator[ProcessPoolExecutor]:
+    memory, shared = share_inputs(inputs)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach_inputs,
+            initargs=(shared,),
+        ) as executor:
+            yield executor
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _evaluate(
+    executor: ProcessPoolExecutor,
+    candidates: Sequence[Candidate],
+    workers: int,
+) -> List[Optional[SweepResult]]:
+    chunksize = max(1, len(candidates) // (workers * 4))
+    return list(executor.map(evaluate_candidate, candidates, chunksize=chunksize))
+
+
+def run_sweep(
+    candidates: Sequence[Candidate],
+    inputs: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    max_workers: Optional[int] = None,
+) -> List[SweepResult]:
+    workers = max_workers or os.cpu_count() or 1
+    with _evaluation_pool(inputs, max_workers) as executor:
+        results = _evaluate(executor, candidates, workers)
+    return rank_results([result for result in results if result is not None])
+
+
+def run_surrogate_search(
+    ranges: Sequence[ParamRange],
+    trials: int,
+    inputs: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    rng: np.random.Generator,
+    max_workers: Optional[int] = None,
+) -> Tuple[List[SweepResult], int]:
+    workers = max_workers or os.cpu_count() or 1
+    groups = _by_filter(ranges)
+    batch = max(1, workers // len(groups))
+    seen: Dict[str, set] = {filter_id: set() for filter_id in groups}
+    history: Dict[str, List[Tuple[np.ndarray, SweepResult]]] = {
+        filter_id: [] for filter_id in groups
+    }
+
+    def propose(filter_id: str, count: int) -> List[Candidate]:
+        group = groups[filter_id]
+        pool = [tuple((r.name, r.sample(rng)) for r in group) for _ in range(SURROGATE_POOL)]
+        pool = list(dict.fromkeys(p for p in pool if p not in seen[filter_id]))
+        observed = history[filter_id]
+        if len(observed) >= 2 and pool:
+            encoded = np.array([[r.encode(v) for r, (_, v) in zip(group, p)] for p in pool])
+            scores = _acquisition(observed, encoded, count, rng)
+            pool = [pool[index] for index in np.argsort(scores)[::-1]]
+        chosen = pool[:count]
+        seen[filter_id].update(chosen)
+        return [(filter_id, params) for params in chosen]
+
+    evaluated = 0
+    with _evaluation_pool(inputs, max_workers) as executor:
+        initial = max(2, trials // 4)
+        candidates = [
+            candidate
+            for filter_id in groups
+            for candidate in propose(filter_id, min(initial, trials))
+        ]
+        while candidates:
+            evaluated += len(candidates)
+            for (filter_id, params), result in zip(
+                candidates, _evaluate(executor, candidates, workers)
+            ):
+                if result is not None:
+                    point = np.array([r.encode(v) for r, (_, v) in zip(groups[filter_id], params)])
+                    history[filter_id].append((point, result))
+            candidates = [
+                candidate
+                for filter_id in groups
+                for candidate in propose(
+                    filter_id, min(batch, trials - len(seen[filter_id]))
+                )
+            ]
+
+    results = [result for observed in history.values() for _, result in observed]
+    return rank_results(results), evaluated
+
+
+def _acquisition(
+    observed: Sequence[Tuple[np.ndarray, SweepResult]],
+    pool: np.ndarray,
+    count: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    points = np.array([point for point, _ in observed])
+    objectives = np.array([(r.jitter_px, abs(r.lag_ms)) for _, r in observed])
+    span = objectives.max(axis=0) - objectives.min(axis=0)
+    objectives = (objectives - objectives.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+    # ParEGO: um peso aleatório por proposta escalariza jitter x atraso, e o
+    # processo gaussiano sobre essa escalarização dá a melhoria esperada.
+    best = np.full(len(pool), -np.inf)
+    for _ in range(count):
+        weight = rng.uniform()
+        weighted = objectives * (weight, 1.0 - weight)
+        target = weighted.max(axis=1) + CHEBYSHEV_RHO * weighted.sum(axis=1)
+        mean, std = _gp_posterior(points, target, pool)
+        best = np.maximum(best, _expected_improvement(mean, std, target.min()))
+    return best
+
+
+def _gp_posterior(
+    points: np.ndarray,
+    target: np.ndarray,
+    pool: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    offset, scale = target.mean(), target.std() or 1.0
+    normalized = (target - offset) / scale
+    kernel = _rbf(points, points) + SURROGATE_NOISE * np.eye(len(points))
+    cross = _rbf(pool, points)
+    factor = np.linalg.cholesky(kernel)
+    weights = np.linalg.solve(factor.T, np.linalg.solve(factor, normalized))
+    projected = np.linalg.solve(factor, cross.T)
+    variance = np.maximum(1.0 - np.sum(projected * projected, axis=0), 1e-12)
+    return offset + scale * (cross @ weights), scale * np.sqrt(variance)
+
+
+def _rbf(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    distance = np.sum((a[:, None, :] - b[None, :, :]) ** 2, axis=2)
+    return np.exp(-0.5 * distance / SURROGATE_LENGTH_SCALE ** 2)
+
+
+def _expected_improvement(mean: np.ndarray, std: np.ndarray, best: float) -> np.ndarray:
+    z = (best - mean) / std
+    cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+    return (best - mean) * cdf + std * pdf
+
+
+def pareto_fronts(objectives: np.ndarray) -> np.ndarray:
+    fronts = np.zeros(len(objectives), dtype=int)
+    remaining = np.arange(len(objectives))
+    front = 0
+    while remaining.size:
+        points = objectives[remaining]
+        no_worse = np.all(points[:, None, :] >= points[None, :, :], axis=2)
+        better = np.any(points[:, None, :] > points[None, :, :], axis=2)
+        dominated = np.any(no_worse & better, axis=1)
+        fronts[remaining[~dominated]] = front
+        remaining = remaining[dominated]
+        front += 1
+    return fronts
+
+
+def rank_results(results: List[SweepResult]) -> List[SweepResult]:
+    if not results:
+        return results
+    objectives = np.array([(r.jitter_px, abs(r.lag_ms)) for r in results])
+    for result, front in zip(results, pareto_fronts(objectives).tolist()):
+        result.front = front
+    return sorted(results, key=lambda r: (r.front, r.jitter_px, abs(r.lag_ms)))
+
+
+def format_table(results: Sequence[SweepResult]) -> str:
+    header = (
+        f"{'front':>5} {'filter':<12} {'params':<40} "
+        f"{'jitter px':>10} {'lag ms':>8} {'rms err px':>11}"
+    )
+    rows = [header, "-" * len(header)]
+    for r in results:
+        params = " ".join(f"{name}={value:g}" for name, value in r.params.items())
+        rows.append(
+            f"{r.front:>5} {r.filter_id:<12} {params:<40} "
+            f"{r.jitter_px:>10.3f} {r.lag_ms:>8.1f} {r.rms_error_px:>11.2f}"
+        )
+    return "\n".join(rows)
+
+
+def _str_list(value: str) -> List[str]:
+    items = [item for item in value.split(",") if item]
+    unknown = [item for item in items if item not in TRAJECTORIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"trajetória desconhecida: {', '.join(unknown)}")
+    return items
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Varredura paralela de parâmetros dos filtros (jitter x atraso).",
+    )
+    parser.add_argument(
+        "--param",
+        dest="ranges",
+        type=parse_range,
+        action="append",
+        help="filtro.parâmetro=v1,v2,... ou min:max[:passo] (repetível)",
+    )
+    parser.add_argument("--search", choices=("grid", "random", "surrogate"), default="grid")
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--sessions", default=None, help="usa sessões gravadas como entrada")
+    parser.add_argument("--trajectories", type=_str_list, default=list(TRAJECTORIES))
+    parser.add_argument("--samples", type=int, default=3000)
+    parser.add_argument("--seeds", type=_int_list, default=[0])
+    parser.add_argument("--sample-rate", type=float, default=FILTER_BANK_SAMPLE_RATE_HZ)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--json", dest="json_path", default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    ranges = args.ranges or default_ranges()
+    rng = np.random.default_rng(args.seeds[0])
+    candidates: List[Candidate] = []
+    if args.search == "grid":
+        try:
+            candidates = grid_candidates(ranges)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            return
+    elif args.search == "random":
+        candidates = random_candidates(ranges, args.trials, rng)
+
+    if args.sessions:
+        inputs = session_inputs(args.sessions)
+    else:
+        inputs = synthetic_inputs(args.trajectories, args.samples, args.seeds, args.sample_rate)
+    if not inputs:
+        print("Nenhuma entrada para avaliar.")
+        return
+
+    start = time.perf_counter()
+    if args.search == "surrogate":
+        results, evaluated = run_surrogate_search(
+            ranges, args.trials, inputs, rng, args.workers
+        )
+    else:
+        results, evaluated = run_sweep(candidates, inputs, args.workers), len(candidates)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(results[:args.top] if args.top > 0 else results))
+    print(
+        f"{len(results)}/{evaluated} combinações avaliadas em {len(inputs)} "
+        f"entrada(s) em {elapsed:.1f}s"
+    )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"Resultados salvos em: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
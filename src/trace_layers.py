@@ -0,0 +1,300 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from .config import BACKGROUND_COLOR, TRACE_LOD_ENABLED, TRACE_REBUILD_EVICTED_FRACTION
+from .filter_metadata import FILTERS, FilterDescriptor
+from .input_device import InputSmoother, TraceBuffer
+from .trace_lod import TraceLod
+from .ui_state import ViewTransform, VisibilityState
+
+
+@dataclass
+class TraceLayer:
+    surface: pygame.Surface
+    generation: int
+    first_drawn: int
+    drawn_upto: int
+    view_key: Tuple[float, float, float]
+
+
+class TraceLayerRenderer:
+    def __init__(self) -> None:
+        self._layers: Dict[str, TraceLayer] = {}
+        self._lods: Dict[str, TraceLod] = {}
+        self._visible: Dict[str, bool] = {}
+        self._history_enabled: Optional[bool] = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._view_key: Optional[Tuple[float, float, float]] = None
+        self._previous_markers: List[pygame.Rect] = []
+        self._previous_hud: Optional[pygame.Surface] = None
+        self._previous_hud_rect: Optional[pygame.Rect] = None
+        self._overlay_was_active = False
+        self._force_full = True
+        self.rebuilds = 0
+
+    def sync(
+        self,
+        screen: pygame.Surface,
+        smoother: InputSmoother,
+        transform: ViewTransform,
+        visibility: VisibilityState,
+        history_enabled: bool,
+    ) -> List[pygame.Rect]:
+        size = screen.get_size()
+        if size != self._size:
+            self._layers.clear()
+            self._size = size
+            self._force_full = True
+
+        # Enquanto zoom ou pan mudam a cada quadro, as camadas antigas são
+        # reescaladas na composição; o redesenho só acontece quando a vista para.
+        view_key = transform.key()
+        moving = view_key != self._view_key
+        if moving:
+            self._view_key = view_key
+            self._force_full = True
+
+        if history_enabled != self._history_enabled:
+            self._history_enabled = history_enabled
+            self._force_full = True
+
+        dirty: List[pygame.Rect] = []
+        for descriptor in FILTERS:
+            visible = visibility.is_visible(descriptor.id)
+            if visible != self._visible.get(descriptor.id):
+                self._visible[descriptor.id] = visible
+                self._force_full = True
+            if not visible or not history_enabled:
+                continue
+
+            trace = smoother.trace(descriptor.id)
+            if trace is None:
+                continue
+
+            layer = self._layers.get(descriptor.id)
+            if (
+                layer is None
+                or self._is_stale(layer, trace)
+                or (layer.view_key != view_key and not moving)
+            ):
+                self._rebuild(descriptor, trace, transform, size)
+                self._force_full = True
+                continue
+
+            if layer.view_key != view_key:
+                zoom, pan_x, pan_y = layer.view_key
+                self._append_segments(
+                    descriptor, layer, trace, ViewTransform(zoom, zoom, pan_x, pan_y)
+                )
+                continue
+
+            rect = self._append_segments(descriptor, layer, trace, transform)
+            if rect is not None:
+                dirty.append(rect)
+
+        return dirty
+
+    def compose(self, screen: pygame.Surface, area: Optional[pygame.Rect] = None) -> None:
+        screen.fill(BACKGROUND_COLOR, area)
+        if not self._history_enabled:
+            return
+        for descriptor in FILTERS:
+            if not self._visible.get(descriptor.id):
+                continue
+            layer = self._layers.get(descriptor.id)
+            if layer is None:
+                continue
+            if layer.view_key != self._view_key:
+                _blit_rescaled(screen, layer.surface, layer.view_key, self._view_key)
+            elif area is None:
+                screen.blit(layer.surface, (0, 0))
+            else:
+                screen.blit(layer.surface, area.topleft, area)
+
+    def needs_full_redraw(self, overlay_active: bool) -> bool:
+        return self._force_full or overlay_active or self._overlay_was_active
+
+    def redraw_regions(
+        self,
+        segments: List[pygame.Rect],
+        markers: List[pygame.Rect],
+        hud: pygame.Surface,
+        hud_rect: pygame.Rect,
+    ) -> List[pygame.Rect]:
+        regions = self._previous_markers + markers + segments
+        if hud is not self._previous_hud:
+            regions.append(hud_rect)
+            if self._previous_hud_rect is not None:
+                regions.append(self._previous_hud_rect)
+        return regions
+
+    def finish_frame(
+        self,
+        markers: List[pygame.Rect],
+        hud: pygame.Surface,
+        hud_rect: pygame.Rect,
+        overlay_active: bool,
+    ) -> None:
+        self._previous_markers = markers
+        self._previous_hud = hud
+        self._previous_hud_rect = hud_rect
+        self._overlay_was_active = overlay_active
+        self._force_full = False
+
+    def invalidate(self) -> None:
+        self._layers.clear()
+        self._force_full = True
+
+    def _is_stale(self, layer: TraceLayer, trace: TraceBuffer) -> bool:
+        if layer.generation != trace.generation:
+            return True
+        evicted = trace.first_index - layer.first_drawn
+        return evicted > trace.capacity * TRACE_REBUILD_EVICTED_FRACTION
+
+    def _rebuild(
+        self,
+        descriptor: FilterDescriptor,
+        trace: TraceBuffer,
+        transform: ViewTransform,
+        size: Tuple[int, int],
+    ) -> TraceLayer:
+        layer = self._layers.get(descriptor.id)
+        if layer is not None and layer.surface.get_size() == size:
+            surface = layer.surface
+        else:
+            surface = pygame.Surface(size).convert()
+        surface.fill(BACKGROUND_COLOR)
+        surface.set_colorkey(BACKGROUND_COLOR)
+
+        if TRACE_LOD_ENABLED:
+            lod = self._lods.setdefault(descriptor.id, TraceLod())
+            sx, sy = lod.points(trace, transform)
+            draw_screen_polyline(surface, descriptor.color, sx, sy, descriptor.line_width)
+        else:
+            xs, ys = trace.as_arrays()
+            draw_polyline(
+                surface, descriptor.color, xs, ys, transform, descriptor.line_width
+            )
+
+        layer = TraceLayer(
+            surface=surface,
+            generation=trace.generation,
+            first_drawn=trace.first_index,
+            drawn_upto=trace.appended,
+            view_key=transform.key(),
+        )
+        self._layers[descriptor.id] = layer
+        self.rebuilds += 1
+        return layer
+
+    def _append_segments(
+        self,
+        descriptor: FilterDescriptor,
+        layer: TraceLayer,
+        trace: TraceBuffer,
+        transform: ViewTransform,
+    ) -> Optional[pygame.Rect]:
+        if trace.appended == layer.drawn_upto:
+            return None
+
+        xs, ys = trace.arrays_since(layer.drawn_upto - 1)
+        layer.drawn_upto = trace.appended
+        return draw_polyline(
+            layer.surface,
+            descriptor.color,
+            xs,
+            ys,
+            transform,
+            descriptor.line_width,
+        )
+
+
+def _blit_rescaled(
+    screen: pygame.Surface,
+    surface: pygame.Surface,
+    drawn_key: Tuple[float, float, float],
+    view_key: Tuple[float, float, float],
+) -> None:
+    drawn_zoom, drawn_x, drawn_y = drawn_key
+    zoom, pan_x, pan_y = view_key
+    scale = zoom / drawn_zoom
+    origin_x = pan_x - drawn_x * scale
+    origin_y = pan_y - drawn_y * scale
+
+    # Só a parte da camada que cai na tela é escalada.
+    width, height = screen.get_size()
+    left = max(0, math.floor(-origin_x / scale))
+    top = max(0, math.floor(-origin_y / scale))
+    right = min(surface.get_width(), math.ceil((width - origin_x) / scale))
+    bottom = min(surface.get_height(), math.ceil((height - origin_y) / scale))
+    if right <= left or bottom <= top:
+        return
+
+    source = surface.subsurface((left, top, right - left, bottom - top))
+    x0 = round(origin_x + left * scale)
+    y0 = round(origin_y + top * scale)
+    size = (
+        max(1, round(origin_x + right * scale) - x0),
+        max(1, round(origin_y + bottom * scale) - y0),
+    )
+    scaled = pygame.transform.scale(source, size)
+    scaled.set_colorkey(BACKGROUND_COLOR)
+    screen.blit(scaled, (x0, y0))
+
+
+def visible_runs(
+    sx: np.ndarray,
+    sy: np.ndarray,
+    viewport: pygame.Rect,
+    margin: int,
+) -> List[np.ndarray]:
+    if len(sx) < 2:
+        return []
+
+    x0, x1 = sx[:-1], sx[1:]
+    y0, y1 = sy[:-1], sy[1:]
+    visible = (
+        (np.minimum(x0, x1) <= viewport.right + margin)
+        & (np.maximum(x0, x1) >= viewport.left - margin)
+        & (np.minimum(y0, y1) <= viewport.bottom + margin)
+        & (np.maximum(y0, y1) >= viewport.top - margin)
+    )
+    if visible.all():
+        return [np.column_stack((sx, sy))]
+
+    edges = np.diff(np.concatenate(([0], visible.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    points = np.column_stack((sx, sy))
+    return [points[start:end + 1] for start, end in zip(starts, ends)]
+
+
+def draw_polyline(
+    surface: pygame.Surface,
+    color: Tuple[int, int, int],
+    xs: np.ndarray,
+    ys: np.ndarray,
+    transform: ViewTransform,
+    width: int,
+) -> Optional[pygame.Rect]:
+    if not transform.is_identity:
+        xs, ys = transform.apply_arrays(xs, ys)
+    return draw_screen_polyline(surface, color, xs, ys, width)
+
+
+def draw_screen_polyline(
+    surface: pygame.Surface,
+    color: Tuple[int, int, int],
+    sx: np.ndarray,
+    sy: np.ndarray,
+    width: int,
+) -> Optional[pygame.Rect]:
+    dirty: Optional[pygame.Rect] = None
+    for run in visible_runs(sx, sy, surface.get_rect(), width):
+        rect = pygame.draw.lines(surface, color, False, run, width)
+        dirty = rect if dirty is None else dirty.union(rect)
+    return dirty
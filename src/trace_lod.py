@@ -0,0 +1,59 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .input_device import TraceBuffer
+from .ui_state import ViewTransform
+
+
+def cell_keep_mask(sx: np.ndarray, sy: np.ndarray) -> np.ndarray:
+    # Fica cada amostra que entra numa célula de pixel ainda não visitada, com
+    # a vizinha de antes e a de depois, para o traço chegar e sair dela; os
+    # trechos que só revisitam células já desenhadas caem. As pontas ficam.
+    keep = np.zeros(len(sx), dtype=bool)
+    if not len(sx):
+        return keep
+
+    cells = (np.floor(sx).astype(np.int64) << 32) ^ (
+        np.floor(sy).astype(np.int64) & 0xFFFFFFFF
+    )
+    first = np.zeros(len(sx), dtype=bool)
+    first[np.unique(cells, return_index=True)[1]] = True
+    keep |= first
+    keep[1:] |= first[:-1]
+    keep[:-1] |= first[1:]
+    keep[0] = keep[-1] = True
+    return keep
+
+
+def decimate_to_pixels(sx: np.ndarray, sy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Onde amostras caem, a polilinha é interrompida com NaN em vez de ligar
+    # pontos distantes; o recorte em visible_runs já trata NaN como quebra.
+    kept = np.flatnonzero(cell_keep_mask(sx, sy))
+    breaks = np.flatnonzero(np.diff(kept) > 1) + 1
+    return np.insert(sx[kept], breaks, np.nan), np.insert(sy[kept], breaks, np.nan)
+
+
+class TraceLod:
+    def __init__(self) -> None:
+        self._key: Optional[tuple] = None
+        self._sx = np.empty(0)
+        self._sy = np.empty(0)
+
+    def points(
+        self,
+        trace: TraceBuffer,
+        transform: ViewTransform,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Recalculado só quando o traço ou a vista mudam. A deduplicação é
+        # global, então não dá para reaproveitar o resultado após descartes
+        # no início do buffer: uma célula pode ter ficado só com amostras antigas.
+        key = (trace.generation, transform.key(), trace.first_index, trace.appended)
+        if key != self._key:
+            self._key = key
+            sx, sy = transform.apply_arrays(*trace.as_arrays())
+            self._sx, self._sy = decimate_to_pixels(sx, sy)
+        return self._sx, self._sy
+
+    def __len__(self) -> int:
+        return len(self._sx)
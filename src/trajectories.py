@@ -0,0 +1,61 @@
+import math
+from typing import Callable, Dict
+
+import numpy as np
+
+from .config import WINDOW_HEIGHT, WINDOW_WIDTH
+
+
+def line_trajectory(count: int, rng: np.random.Generator) -> np.ndarray:
+    t = np.linspace(0.0, 1.0, count)
+    start = np.array([WINDOW_WIDTH * 0.1, WINDOW_HEIGHT * 0.2])
+    end = np.array([WINDOW_WIDTH * 0.9, WINDOW_HEIGHT * 0.8])
+    return start + (end - start) * t[:, None]
+
+
+def circle_trajectory(count: int, rng: np.random.Generator) -> np.ndarray:
+    angles = np.linspace(0.0, 4.0 * math.pi, count)
+    radius = min(WINDOW_WIDTH, WINDOW_HEIGHT) * 0.35
+    return np.column_stack((
+        WINDOW_WIDTH / 2 + radius * np.cos(angles),
+        WINDOW_HEIGHT / 2 + radius * np.sin(angles),
+    ))
+
+
+def random_walk_trajectory(count: int, rng: np.random.Generator) -> np.ndarray:
+    steps = rng.normal(0.0, 4.0, size=(count, 2))
+    steps[0] = (WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)
+    walk = np.cumsum(steps, axis=0)
+    walk[:, 0] = np.clip(walk[:, 0], 0, WINDOW_WIDTH - 1)
+    walk[:, 1] = np.clip(walk[:, 1], 0, WINDOW_HEIGHT - 1)
+    return walk
+
+
+def hold_trajectory(count: int, rng: np.random.Generator) -> np.ndarray:
+    points = np.empty((count, 2))
+    current = np.array([WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2])
+    reach = np.linspace(0.0, 1.0, max(2, count // 20))
+    profile = 10 * reach**3 - 15 * reach**4 + 6 * reach**5
+    index = 0
+    while index < count:
+        rest = int(rng.integers(count // 10, count // 4 + 1))
+        points[index:index + rest] = current
+        index += rest
+        if index >= count:
+            break
+
+        target = current + rng.normal(0.0, 120.0, size=2)
+        target = np.clip(target, 0, (WINDOW_WIDTH - 1, WINDOW_HEIGHT - 1))
+        move = current + (target - current) * profile[:, None]
+        points[index:index + len(move)] = move[:count - index]
+        index += len(move)
+        current = target
+    return points
+
+
+TRAJECTORIES: Dict[str, Callable[[int, np.random.Generator], np.ndarray]] = {
+    "line": line_trajectory,
+    "circle": circle_trajectory,
+    "random_walk": random_walk_trajectory,
+    "hold": hold_trajectory,
+}
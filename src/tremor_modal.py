@@ -4,7 +4,7 @@ import time
 
 import pygame
 
-from tremor_simulator import DriftSimulator, TremorSimulator
+from .tremor_simulator import DriftSimulator, TremorSimulator
 
 
 @dataclass(frozen=True)
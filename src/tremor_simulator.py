@@ -1,36 +1,74 @@
 import math
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
+from .filters import exp_smoothing_batch
+
 
 class TremorSimulator:
+    NOISE_SMOOTHING = 0.3
+
     def __init__(
         self,
         enabled: bool = False,
         intensity: float = 5.0,
         frequency: float = 10.0,
+        seed: Optional[int] = None,
+        noise_block_size: int = 4096,
+        start_time_ns: Optional[int] = None,
     ):
+        if noise_block_size <= 0:
+            raise ValueError("noise_block_size deve ser > 0")
         self.enabled = enabled
         self.intensity = intensity
         self.frequency = frequency
-        self.start_time = time.time()
+        # Sem origem explícita, a fase parte do primeiro timestamp recebido.
+        self.start_time_ns = start_time_ns
+        self._noise_block_size = noise_block_size
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
         self._last_noise_x = 0.0
         self._last_noise_y = 0.0
-        
-    def apply_tremor(self, x: float, y: float) -> Tuple[float, float]:
+        self._noise_block = np.empty((0, 2))
+        self._noise_x: list[float] = []
+        self._noise_y: list[float] = []
+        self._noise_index = 0
+
+    def apply_tremor(
+        self,
+        x: float,
+        y: float,
+        timestamp_ns: Optional[int] = None,
+    ) -> Tuple[float, float]:
         if not self.enabled:
             return x, y
         
-        t = time.time() - self.start_time
-        sin_x = math.sin(2 * math.pi * self.frequency * t) * (self.intensity * 0.3)
-        sin_y = math.cos(2 * math.pi * self.frequency * t * 1.1) * (self.intensity * 0.3)
-        
-        noise_x = np.random.normal(0, self.intensity * 0.7)
-        noise_y = np.random.normal(0, self.intensity * 0.7)
+        now_ns = time.perf_counter_ns() if timestamp_ns is None else timestamp_ns
+        if self.start_time_ns is None:
+            self.start_time_ns = now_ns
+        t = (now_ns - self.start_time_ns) * 1e-9
+        phase = 2 * math.pi * self.frequency * t
+        amplitude = self.intensity * 0.3
+        sin_x = math.sin(phase) * amplitude
+        sin_y = math.cos(phase * 1.1) * amplitude
+
+        if self._noise_index >= len(self._noise_block):
+            self._refill_noise()
+        if not self._noise_x:
+            self._noise_x = self._noise_block[:, 0].tolist()
+            self._noise_y = self._noise_block[:, 1].tolist()
+        index = self._noise_index
+        self._noise_index = index + 1
+        sigma = self.intensity * 0.7
+        noise_x = self._noise_x[index] * sigma
+        noise_y = self._noise_y[index] * sigma
         
-        alpha = 0.3
+        alpha = self.NOISE_SMOOTHING
         self._last_noise_x = alpha * noise_x + (1 - alpha) * self._last_noise_x
         self._last_noise_y = alpha * noise_y + (1 - alpha) * self._last_noise_y
         
@@ -38,11 +76,77 @@ class TremorSimulator:
         tremor_y = sin_y + self._last_noise_y
         
         return x + tremor_x, y + tremor_y
-    
+
+    def apply_tremor_array(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        ts = np.asarray(ts, dtype=np.int64)
+        if not (xs.shape == ys.shape == ts.shape) or xs.ndim != 1:
+            raise ValueError("xs, ys e ts devem ser vetores 1D do mesmo tamanho")
+        if not self.enabled:
+            return xs.copy(), ys.copy()
+
+        if not len(ts):
+            return xs.copy(), ys.copy()
+        if self.start_time_ns is None:
+            self.start_time_ns = int(ts[0])
+        t = (ts - self.start_time_ns) * 1e-9
+        phase = 2 * math.pi * self.frequency * t
+        amplitude = self.intensity * 0.3
+        sin_x = np.sin(phase) * amplitude
+        sin_y = np.cos(phase * 1.1) * amplitude
+
+        sigma = self.intensity * 0.7
+        noise = self._take_noise(len(xs)) * sigma
+        smoothed, (self._last_noise_x, self._last_noise_y) = self._smooth_noise(
+            noise, (self._last_noise_x, self._last_noise_y)
+        )
+
+        # Mesma associação do caminho escalar: x + (senoide + ruído).
+        return xs + (sin_x + smoothed[:, 0]), ys + (sin_y + smoothed[:, 1])
+
+    def _refill_noise(self) -> None:
+        block = self._rng.standard_normal((self._noise_block_size, 2))
+        self._noise_block = block
+        # As listas do caminho escalar só são montadas quando ele as usa.
+        self._noise_x = []
+        self._noise_y = []
+        self._noise_index = 0
+
+    def _take_noise(self, count: int) -> np.ndarray:
+        noise = np.empty((count, 2))
+        filled = 0
+        while filled < count:
+            if self._noise_index >= len(self._noise_block):
+                self._refill_noise()
+            start = self._noise_index
+            take = min(count - filled, len(self._noise_block) - start)
+            noise[filled:filled + take] = self._noise_block[start:start + take]
+            self._noise_index = start + take
+            filled += take
+        return noise
+
+    def _smooth_noise(
+        self,
+        noise: np.ndarray,
+        last: Tuple[float, float],
+    ) -> Tuple[np.ndarray, Tuple[float, float]]:
+        if not len(noise):
+            return noise, last
+        # O estado anterior entra como primeira amostra: a saída do EMA em
+        # lote começa nele, e o resto segue a mesma recorrência do caminho escalar.
+        smoothed = exp_smoothing_batch(np.vstack((last, noise)), self.NOISE_SMOOTHING)[1:]
+        return smoothed, (float(smoothed[-1, 0]), float(smoothed[-1, 1]))
+
     def set_enabled(self, enabled: bool) -> None:
         self.enabled = enabled
         if enabled:
-            self.start_time = time.time()
+            self.start_time_ns = None
     
     def set_intensity(self, intensity: float) -> None:
         self.intensity = max(0.0, intensity)
@@ -62,24 +166,29 @@ class DriftSimulator:
         self.pixels_per_second = max(0.0, pixels_per_second)
         self.direction_deg = direction_deg
         self._direction_rad = math.radians(direction_deg)
-        self._last_update: float | None = None
+        self._last_update_ns: int | None = None
         self._offset_x = 0.0
         self._offset_y = 0.0
 
-    def apply_drift(self, x: float, y: float) -> Tuple[float, float]:
+    def apply_drift(
+        self,
+        x: float,
+        y: float,
+        timestamp_ns: Optional[int] = None,
+    ) -> Tuple[float, float]:
         if not self.enabled or self.pixels_per_second <= 0.0:
             self._reset_clock()
             self._offset_x = 0.0
             self._offset_y = 0.0
             return x, y
 
-        now = time.time()
-        if self._last_update is None:
-            self._last_update = now
+        now_ns = time.perf_counter_ns() if timestamp_ns is None else timestamp_ns
+        if self._last_update_ns is None:
+            self._last_update_ns = now_ns
             return x + self._offset_x, y + self._offset_y
 
-        elapsed = now - self._last_update
-        self._last_update = now
+        elapsed = (now_ns - self._last_update_ns) * 1e-9
+        self._last_update_ns = now_ns
 
         drift_x = math.cos(self._direction_rad) * self.pixels_per_second * elapsed
         drift_y = math.sin(self._direction_rad) * self.pixels_per_second * elapsed
@@ -113,4 +222,4 @@ class DriftSimulator:
         self._reset_clock()
 
     def _reset_clock(self) -> None:
-        self._last_update = None
+        self._last_update_ns = None
@@ -1,38 +1,95 @@
-from typing import Callable, Dict, Optional, Tuple
-import time
-import os
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import pygame
 
-from config import (
+from .config import (
     ALPHA_STEP,
+    CUTOFF_STEP_HZ,
     BACKGROUND_COLOR,
     HUD_FONT,
     HUD_FONT_SIZE,
     HUD_LINE_HEIGHT,
+    HUD_VISIBILITY_PER_LINE,
     HUD_MARGIN_X,
     HUD_MARGIN_Y,
     HUD_TEXT_COLOR,
     MARKER_RADIUS,
+    PAN_SENSITIVITY,
     PARAM_CHANGE_COLOR,
     PARAM_CHANGE_INDICATOR_DURATION,
     TITLE,
+    TRACE_LOD_ENABLED,
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
+    ZOOM_STEP,
+    ZOOM_TO_MOUSE,
 )
-from filter_metadata import FILTERS, KEY_TO_FILTER_ID
-from input_device import InputSmoother, Point
-from ui_state import (
+from .filter_metadata import FILTERS, KEY_TO_FILTER_ID
+from .input_device import InputSmoother, Point
+from .profiler import NULL_PROFILER, Profiler
+from .quality import QualityMetrics
+from .trace_layers import TraceLayerRenderer, draw_screen_polyline
+from .trace_lod import decimate_to_pixels
+from .ui_state import (
     MetricsTracker,
     ParamChangeIndicator,
     ViewTransform,
     VisibilityState,
 )
-from plot_3d import generate_3d_plot, generate_3d_surface_map
 
 
 
 
+class HudTextCache:
+    def __init__(self) -> None:
+        self._font: Optional[pygame.font.Font] = None
+        self._lines: Tuple[str, ...] = ()
+        self._line_surfaces: Dict[str, pygame.Surface] = {}
+        self._surface: Optional[pygame.Surface] = None
+        self.renders = 0
+
+    def get(self, font: pygame.font.Font, lines: List[str]) -> pygame.Surface:
+        key = tuple(lines)
+        if self._surface is not None and font is self._font and key == self._lines:
+            return self._surface
+
+        if font is not self._font:
+            self._line_surfaces = {}
+            self._font = font
+
+        line_surfaces: Dict[str, pygame.Surface] = {}
+        for line in key:
+            if not line or line in line_surfaces:
+                continue
+            surf = self._line_surfaces.get(line)
+            if surf is None:
+                surf = font.render(line, True, HUD_TEXT_COLOR)
+                self.renders += 1
+            line_surfaces[line] = surf
+
+        width = max((surf.get_width() for surf in line_surfaces.values()), default=0)
+        height = HUD_LINE_HEIGHT * len(key)
+        surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        y = 0
+        for line in key:
+            if line:
+                surface.blit(line_surfaces[line], (0, y))
+            y += HUD_LINE_HEIGHT
+        surface.set_alpha(255, pygame.RLEACCEL)
+
+        self._line_surfaces = line_surfaces
+        self._lines = key
+        self._surface = surface
+        return surface
+
+    def clear(self) -> None:
+        self._font = None
+        self._lines = ()
+        self._line_surfaces = {}
+        self._surface = None
+
+
 def create_window(fullscreen: bool = False) -> Tuple[pygame.Surface, bool]:
     pygame.display.set_caption(TITLE)
     if fullscreen:
@@ -54,22 +111,47 @@ def handle_events(
     visibility: VisibilityState,
     param_indicator: ParamChangeIndicator,
     fullscreen: bool,
-) -> Tuple[bool, bool, bool, bool, Optional[str], bool]:
+    motion_positions: Optional[List[Tuple[int, int]]] = None,
+) -> Tuple[bool, bool, bool, bool, Optional[str], bool, bool, bool]:
     reset_requested = False
+    record_toggled = False
+    profile_toggled = False
     for event in pygame.event.get():
+        if event.type == pygame.MOUSEMOTION:
+            if motion_positions is not None:
+                motion_positions.append(event.pos)
+            if event.buttons[1]:
+                dx, dy = event.rel
+                view_transform.pan_by(
+                    dx * PAN_SENSITIVITY,
+                    dy * PAN_SENSITIVITY,
+                    pygame.display.get_surface().get_size(),
+                )
+            continue
+
+        if event.type == pygame.MOUSEWHEEL:
+            view_transform.zoom_by(event.y, ZOOM_STEP, _zoom_anchor())
+            continue
+
         if event.type == pygame.QUIT:
-            return False, history_enabled, fullscreen, False, None, reset_requested
+            return False, history_enabled, fullscreen, False, None, reset_requested, record_toggled, profile_toggled
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                return False, history_enabled, fullscreen, False, None, reset_requested
+                return False, history_enabled, fullscreen, False, None, reset_requested, record_toggled, profile_toggled
             if event.key == pygame.K_SPACE and (event.mod & pygame.KMOD_CTRL):
-                return True, history_enabled, fullscreen, False, "tremor", reset_requested
+                return True, history_enabled, fullscreen, False, "tremor", reset_requested, record_toggled, profile_toggled
             if event.key == pygame.K_d and (event.mod & pygame.KMOD_CTRL):
-                return True, history_enabled, fullscreen, False, "drift", reset_requested
+                return True, history_enabled, fullscreen, False, "drift", reset_requested, record_toggled, profile_toggled
             if event.key == pygame.K_r:
                 reset_requested = True
                 continue
+            if event.key == pygame.K_s:
+                record_toggled = not record_toggled
+                continue
+            if event.key == pygame.K_p:
+                profile_toggled = not profile_toggled
+                continue
             result = _handle_key(
                 event.key, smoother, history_enabled, view_transform,
                 visibility, param_indicator, fullscreen
@@ -77,10 +159,16 @@ def handle_events(
             if result is not None:
                 history_enabled, fullscreen, generate_3d = result
                 if generate_3d:
-                    return True, history_enabled, fullscreen, True, None, reset_requested
+                    return True, history_enabled, fullscreen, True, None, reset_requested, record_toggled, profile_toggled
+
+
+    return True, history_enabled, fullscreen, False, None, reset_requested, record_toggled, profile_toggled
 
 
-    return True, history_enabled, fullscreen, False, None, reset_requested
+def _zoom_anchor() -> Tuple[int, int]:
+    if ZOOM_TO_MOUSE:
+        return pygame.mouse.get_pos()
+    return pygame.display.get_surface().get_rect().center
 
 
 def _handle_key(
@@ -97,6 +185,8 @@ def _handle_key(
         pygame.K_DOWN: lambda sm: sm.change_window(-1),
         pygame.K_RIGHT: lambda sm: sm.change_alpha(ALPHA_STEP),
         pygame.K_LEFT: lambda sm: sm.change_alpha(-ALPHA_STEP),
+        pygame.K_PAGEUP: lambda sm: sm.change_cutoff(CUTOFF_STEP_HZ),
+        pygame.K_PAGEDOWN: lambda sm: sm.change_cutoff(-CUTOFF_STEP_HZ),
     }
 
     action = key_actions.get(key)
@@ -116,6 +206,10 @@ def _handle_key(
         visibility.set_visible(filter_id, not current)
         return None
 
+    if key == pygame.K_q:
+        visibility.toggle_quality_panel()
+        return None
+
     if key == pygame.K_F11:
         return (history_enabled, not fullscreen, False)
 
@@ -136,16 +230,18 @@ def _draw_traces(
         if not visibility.is_visible(descriptor.id):
             continue
 
-        trace = getattr(smoother, descriptor.trace_attr, None)
+        trace = smoother.trace(descriptor.id)
         if trace is None or len(trace) <= 1:
             continue
 
-        points = trace.as_int_tuples()
-        pygame.draw.lines(
+        sx, sy = transform.apply_arrays(*trace.as_arrays())
+        if TRACE_LOD_ENABLED:
+            sx, sy = decimate_to_pixels(sx, sy)
+        draw_screen_polyline(
             screen,
             descriptor.color,
-            False,
-            points,
+            sx,
+            sy,
             descriptor.line_width,
         )
 
@@ -155,15 +251,42 @@ def _draw_markers(
     points_by_filter: Dict[str, Optional[Point]],
     transform: ViewTransform,
     visibility: VisibilityState,
-) -> None:
+) -> List[pygame.Rect]:
+    rects = []
+    for descriptor in FILTERS:
+        if not visibility.is_visible(descriptor.id):
+            continue
+        point = points_by_filter.get(descriptor.id)
+        if point is None:
+            continue
+        x, y = _marker_position(point, transform)
+        rects.append(
+            pygame.draw.circle(screen, descriptor.cursor_color, (x, y), MARKER_RADIUS)
+        )
+    return rects
+
+
+def _marker_position(point: Point, transform: ViewTransform) -> Tuple[int, int]:
+    x, y = transform.apply(point.x, point.y)
+    return int(x), int(y)
+
+
+def _marker_rects(
+    points_by_filter: Dict[str, Optional[Point]],
+    transform: ViewTransform,
+    visibility: VisibilityState,
+) -> List[pygame.Rect]:
+    size = 2 * MARKER_RADIUS + 1
+    rects = []
     for descriptor in FILTERS:
         if not visibility.is_visible(descriptor.id):
             continue
         point = points_by_filter.get(descriptor.id)
         if point is None:
             continue
-        x, y = point.as_int_tuple()
-        pygame.draw.circle(screen, descriptor.cursor_color, (x, y), MARKER_RADIUS)
+        x, y = _marker_position(point, transform)
+        rects.append(pygame.Rect(x - MARKER_RADIUS, y - MARKER_RADIUS, size, size))
+    return rects
 
 
 
@@ -187,20 +310,19 @@ def _draw_param_change_indicator(
         screen.blit(text_surf, text_rect)
 
 
-def _draw_hud(
-    screen: pygame.Surface,
-    font: pygame.font.Font,
+def _hud_lines(
     smoother: InputSmoother,
     history_enabled: bool,
     visibility: VisibilityState,
-    transform: ViewTransform,
-    fullscreen: bool,
     tremor_sim,
     drift_sim,
-) -> None:
+    status_lines: Sequence[str],
+    quality: Optional[Dict[str, QualityMetrics]] = None,
+) -> List[str]:
     lines = [
         f"N (moving_average): {smoother.window_size}",
         f"IIR alpha (exp.smooth): {smoother.alpha:.2f}",
+        f"Corte Butterworth: {smoother.cutoff_hz:.1f}Hz",
         f"Histórico (H): {'ON' if history_enabled else 'OFF'}",
         f"Tremor: {'ON' if tremor_sim.enabled else 'OFF'} "
         f"(Int: {tremor_sim.intensity:.1f}, Freq: {tremor_sim.frequency:.1f}Hz)",
@@ -209,13 +331,44 @@ def _draw_hud(
         f"Visibilidade:",
     ]
 
-    for descriptor in FILTERS:
-        visible = visibility.is_visible(descriptor.id)
-        status = "ON" if visible else "OFF"
-        lines.append(
-            f"  {descriptor.name} ({descriptor.key_hint}): {status}"
+    notch = smoother.filters.get("notch")
+    if notch is not None:
+        estimate_x, estimate_y = notch.estimate_hz
+        lines.insert(5, f"Tremor estimado: {estimate_x:.1f}Hz / {estimate_y:.1f}Hz")
+
+    drift = smoother.filters.get("drift")
+    if drift is not None:
+        velocity_x, velocity_y = drift.velocity
+        lines.insert(
+            len(lines) - 1,
+            f"Drift estimado: {math.hypot(velocity_x, velocity_y):.1f}px/s "
+            f"(Dir: {math.degrees(math.atan2(velocity_y, velocity_x)) % 360:.0f}°)",
         )
 
+    for status in status_lines:
+        lines.insert(len(lines) - 1, status)
+
+    entries = [
+        f"{descriptor.name} ({descriptor.key_hint}): "
+        f"{'ON' if visibility.is_visible(descriptor.id) else 'OFF'}"
+        for descriptor in FILTERS
+    ]
+    for start in range(0, len(entries), HUD_VISIBILITY_PER_LINE):
+        lines.append("  " + "  ".join(entries[start:start + HUD_VISIBILITY_PER_LINE]))
+
+    if quality is not None:
+        lines.extend(["", "Qualidade (jitter px | atraso ms | overshoot px | tremor dB):"])
+        for descriptor in FILTERS:
+            metrics = quality.get(descriptor.id)
+            if metrics is None or not visibility.is_visible(descriptor.id):
+                continue
+            lines.append(
+                f"  {descriptor.name:<14} {metrics.jitter_px:6.2f} | {metrics.lag_ms:6.1f} | "
+                f"{metrics.overshoot_px:6.1f} | {metrics.tremor_db:6.1f}"
+            )
+        lines.append("  Q -> voltar aos controles")
+        return lines
+
     toggle_keys = ", ".join(f.key_hint for f in FILTERS)
 
     lines.extend(
@@ -224,16 +377,40 @@ def _draw_hud(
             "Controles:",
             "  UP / DOWN    -> aumenta/diminui N",
             "  RIGHT / LEFT -> aumenta/diminui IIR alpha",
+            "  PGUP / PGDN  -> aumenta/diminui corte Butterworth",
             "  H            -> liga/desliga histórico",
             f"  {toggle_keys:<12} -> toggle visibilidade",
             "  R            -> reset global (filtros, histórico, tremor e drift)",
+            "  RODA / MEIO  -> zoom / pan (arrastar)",
             "  F11          -> tela cheia",
             "  G            -> gerar gráfico 3D",
+            "  S            -> iniciar/parar gravação da sessão",
+            "  Q            -> métricas de qualidade dos filtros",
             "  CTRL+SPACE   -> configurar tremor",
             "  CTRL+D       -> configurar drift",
             "  ESC          -> sair",
         ]
     )
+    return lines
+
+
+def _draw_hud(
+    screen: pygame.Surface,
+    font: pygame.font.Font,
+    smoother: InputSmoother,
+    history_enabled: bool,
+    visibility: VisibilityState,
+    transform: ViewTransform,
+    fullscreen: bool,
+    tremor_sim,
+    drift_sim,
+    status_lines: Sequence[str] = (),
+    quality: Optional[Dict[str, QualityMetrics]] = None,
+) -> None:
+    lines = _hud_lines(
+        smoother, history_enabled, visibility, tremor_sim, drift_sim, status_lines,
+        quality,
+    )
 
     x, y = HUD_MARGIN_X, HUD_MARGIN_Y
     for line in lines:
@@ -248,10 +425,7 @@ def render_frame(
     font: pygame.font.Font,
     smoother: InputSmoother,
     history_enabled: bool,
-    raw_point: Point,
-    ma_point: Optional[Point],
-    exp_point: Point,
-    drift_point: Optional[Point],
+    points_by_filter: Dict[str, Optional[Point]],
     transform: ViewTransform,
     visibility: VisibilityState,
     metrics: MetricsTracker,
@@ -260,40 +434,106 @@ def render_frame(
     tremor_sim,
     drift_sim,
     tremor_modal=None,
+    status_lines: Sequence[str] = (),
+    hud_cache: Optional[HudTextCache] = None,
+    trace_layers: Optional[TraceLayerRenderer] = None,
+    profiler: Optional[Profiler] = None,
 ) -> None:
-    screen.fill(BACKGROUND_COLOR)
-    
-    if history_enabled:
-        _draw_traces(screen, smoother, transform, visibility)
-
-    points_by_filter: Dict[str, Optional[Point]] = {
-        "raw": raw_point,
-        "ma": ma_point,
-        "exp": exp_point,
-        "drift": drift_point,
-    }
+    if profiler is None:
+        profiler = NULL_PROFILER
+    quality = metrics.quality.summary() if visibility.quality_panel else None
+    if trace_layers is not None:
+        _render_incremental(
+            screen, font, smoother, history_enabled, points_by_filter,
+            transform, visibility, param_indicator, tremor_sim, drift_sim,
+            tremor_modal, status_lines, hud_cache or HudTextCache(), trace_layers,
+            quality, profiler,
+        )
+        return
+
+    with profiler.span("render.traces"):
+        screen.fill(BACKGROUND_COLOR)
+
+        if history_enabled:
+            _draw_traces(screen, smoother, transform, visibility)
 
-    _draw_markers(screen, points_by_filter, transform, visibility)
-    _draw_hud(screen, font, smoother, history_enabled, visibility, transform, fullscreen, tremor_sim, drift_sim)
-    _draw_param_change_indicator(screen, font, param_indicator)
-    
-    if tremor_modal:
-        tremor_modal.render(screen)
-    
-    pygame.display.flip()
-
-
-def generate_3d_visualization(smoother: InputSmoother) -> None:
-    timestamp = int(time.time())
-    output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    plot_path = os.path.join(output_dir, f"plot_3d_{timestamp}.png")
-    map_path = os.path.join(output_dir, f"map_3d_{timestamp}.png")
-    
-    try:
-        generate_3d_plot(smoother, plot_path)
-        generate_3d_surface_map(smoother, map_path)
-        print(f"Gráficos 3D gerados em: {output_dir}/")
-    except Exception as e:
-        print(f"Erro ao gerar gráficos 3D: {e}")
+        _draw_markers(screen, points_by_filter, transform, visibility)
+
+    with profiler.span("render.hud"):
+        if hud_cache is not None:
+            lines = _hud_lines(
+                smoother, history_enabled, visibility, tremor_sim, drift_sim, status_lines,
+                quality,
+            )
+            screen.blit(hud_cache.get(font, lines), (HUD_MARGIN_X, HUD_MARGIN_Y))
+        else:
+            _draw_hud(
+                screen, font, smoother, history_enabled, visibility, transform,
+                fullscreen, tremor_sim, drift_sim, status_lines, quality,
+            )
+        _draw_param_change_indicator(screen, font, param_indicator)
+
+        if tremor_modal:
+            tremor_modal.render(screen)
+
+    with profiler.span("render.flip"):
+        pygame.display.flip()
+
+
+def _render_incremental(
+    screen: pygame.Surface,
+    font: pygame.font.Font,
+    smoother: InputSmoother,
+    history_enabled: bool,
+    points_by_filter: Dict[str, Optional[Point]],
+    transform: ViewTransform,
+    visibility: VisibilityState,
+    param_indicator: ParamChangeIndicator,
+    tremor_sim,
+    drift_sim,
+    tremor_modal,
+    status_lines: Sequence[str],
+    hud_cache: HudTextCache,
+    trace_layers: TraceLayerRenderer,
+    quality: Optional[Dict[str, QualityMetrics]] = None,
+    profiler: Profiler = NULL_PROFILER,
+) -> None:
+    with profiler.span("render.sync"):
+        segments = trace_layers.sync(
+            screen, smoother, transform, visibility, history_enabled
+        )
+    with profiler.span("render.hud"):
+        lines = _hud_lines(
+            smoother, history_enabled, visibility, tremor_sim, drift_sim, status_lines,
+            quality,
+        )
+        hud = hud_cache.get(font, lines)
+    hud_rect = hud.get_rect(topleft=(HUD_MARGIN_X, HUD_MARGIN_Y))
+    overlay_active = param_indicator.active or bool(tremor_modal and tremor_modal.active)
+
+    if trace_layers.needs_full_redraw(overlay_active):
+        with profiler.span("render.traces"):
+            trace_layers.compose(screen)
+            markers = _draw_markers(screen, points_by_filter, transform, visibility)
+            screen.blit(hud, hud_rect)
+            _draw_param_change_indicator(screen, font, param_indicator)
+            if tremor_modal:
+                tremor_modal.render(screen)
+        with profiler.span("render.flip"):
+            pygame.display.flip()
+        trace_layers.finish_frame(markers, hud, hud_rect, overlay_active)
+        return
+
+    with profiler.span("render.traces"):
+        markers = _marker_rects(points_by_filter, transform, visibility)
+        regions = trace_layers.redraw_regions(segments, markers, hud, hud_rect)
+        for region in regions:
+            screen.set_clip(region)
+            trace_layers.compose(screen, region)
+            _draw_markers(screen, points_by_filter, transform, visibility)
+            screen.blit(hud, hud_rect)
+        screen.set_clip(None)
+
+    with profiler.span("render.flip"):
+        pygame.display.update(regions)
+    trace_layers.finish_frame(markers, hud, hud_rect, overlay_active)
@@ -2,13 +2,23 @@ from dataclasses import dataclass
 from collections import deque
 from typing import Deque, Dict
 
-from config import (
+import numpy as np
+
+from .config import (
+    DEFAULT_QUALITY_VISIBLE,
+    FILTER_BANK_SAMPLE_RATE_HZ,
     ZOOM_DEFAULT,
     ZOOM_MIN,
     ZOOM_MAX,
     METRICS_HISTORY_SIZE,
+    PAN_LIMIT_ENABLED,
+    QUALITY_JITTER_HIGHPASS_HZ,
+    QUALITY_SUMMARY_INTERVAL_MS,
+    QUALITY_TREMOR_BAND_HZ,
+    QUALITY_WINDOW_S,
 )
-from filter_metadata import FILTERS
+from .filter_metadata import FILTERS
+from .quality import FilterQualityTracker
 
 
 @dataclass
@@ -17,21 +27,64 @@ class ViewTransform:
     target_zoom: float = ZOOM_DEFAULT
     pan_x: float = 0.0
     pan_y: float = 0.0
+    anchor_x: float = 0.0
+    anchor_y: float = 0.0
 
     def apply(self, x: float, y: float) -> tuple[float, float]:
         return (x * self.zoom + self.pan_x, y * self.zoom + self.pan_y)
 
+    def apply_arrays(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return xs * self.zoom + self.pan_x, ys * self.zoom + self.pan_y
+
+    def key(self) -> tuple[float, float, float]:
+        return (self.zoom, self.pan_x, self.pan_y)
+
+    @property
+    def is_identity(self) -> bool:
+        return self.zoom == 1.0 and self.pan_x == 0.0 and self.pan_y == 0.0
+
     def reset(self) -> None:
         self.zoom = ZOOM_DEFAULT
         self.target_zoom = ZOOM_DEFAULT
         self.pan_x = 0.0
         self.pan_y = 0.0
+        self.anchor_x = 0.0
+        self.anchor_y = 0.0
+
+    def zoom_by(self, steps: float, step: float, anchor: tuple[float, float]) -> None:
+        target = self.target_zoom * (1.0 + step) ** steps
+        self.target_zoom = max(ZOOM_MIN, min(target, ZOOM_MAX))
+        self.anchor_x, self.anchor_y = anchor
+
+    def pan_by(self, dx: float, dy: float, viewport: tuple[int, int]) -> None:
+        self.pan_x += dx
+        self.pan_y += dy
+        if PAN_LIMIT_ENABLED:
+            width, height = viewport
+            self.pan_x = _clamp_pan(self.pan_x, self.zoom, width)
+            self.pan_y = _clamp_pan(self.pan_y, self.zoom, height)
 
     def update_smooth(self, factor: float) -> None:
+        previous = self.zoom
         diff = self.target_zoom - self.zoom
         self.zoom += diff * factor
         if abs(diff) < 0.001:
             self.zoom = self.target_zoom
+        if self.zoom != previous:
+            scale = self.zoom / previous
+            self.pan_x = self.anchor_x - (self.anchor_x - self.pan_x) * scale
+            self.pan_y = self.anchor_y - (self.anchor_y - self.pan_y) * scale
+
+
+def _clamp_pan(pan: float, zoom: float, size: int) -> float:
+    # Ampliado, a área de desenho continua cobrindo a tela; reduzido, continua
+    # inteira dentro dela.
+    low, high = sorted((0.0, size - size * zoom))
+    return min(max(pan, low), high)
 
 
 class VisibilityState:
@@ -39,6 +92,7 @@ class VisibilityState:
         self._filters: Dict[str, bool] = {
             f.id: f.visibility_default for f in FILTERS
         }
+        self.quality_panel = DEFAULT_QUALITY_VISIBLE
 
     def is_visible(self, filter_id: str) -> bool:
         return self._filters.get(filter_id, True)
@@ -46,20 +100,37 @@ class VisibilityState:
     def set_visible(self, filter_id: str, visible: bool) -> None:
         self._filters[filter_id] = visible
 
+    def toggle_quality_panel(self) -> None:
+        self.quality_panel = not self.quality_panel
+
     def reset(self) -> None:
         self._filters = {
             f.id: f.visibility_default for f in FILTERS
         }
+        self.quality_panel = DEFAULT_QUALITY_VISIBLE
 
 
 @dataclass
 class MetricsTracker:
     fps_history: Deque[float]
     latency_history: Deque[float]
+    quality: FilterQualityTracker
 
-    def __init__(self, history_size: int = METRICS_HISTORY_SIZE):
+    def __init__(
+        self,
+        history_size: int = METRICS_HISTORY_SIZE,
+        sample_rate_hz: float = FILTER_BANK_SAMPLE_RATE_HZ,
+    ):
         self.fps_history = deque(maxlen=history_size)
         self.latency_history = deque(maxlen=history_size)
+        self.quality = FilterQualityTracker(
+            [f.id for f in FILTERS],
+            sample_rate_hz,
+            QUALITY_WINDOW_S,
+            QUALITY_JITTER_HIGHPASS_HZ,
+            QUALITY_TREMOR_BAND_HZ,
+            QUALITY_SUMMARY_INTERVAL_MS,
+        )
 
     def add_fps(self, fps: float) -> None:
         self.fps_history.append(fps)
@@ -80,6 +151,7 @@ class MetricsTracker:
     def reset(self) -> None:
         self.fps_history.clear()
         self.latency_history.clear()
+        self.quality.reset()
 
 
 @dataclass